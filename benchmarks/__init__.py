@@ -0,0 +1,17 @@
+"""
+Dashboard Benchmarks
+====================
+Synthetic incidents at any scale and a headless timing suite of the
+dashboard computations, with comparison against a stored baseline:
+
+    python -m benchmarks [--rows 50k 1M 10M] [--baseline benchmarks/baseline.json]
+"""
+
+from benchmarks.synthetic import generate_incidents
+from benchmarks.suite import run_suite, compare_results
+
+__all__ = [
+    'generate_incidents',
+    'run_suite',
+    'compare_results',
+]
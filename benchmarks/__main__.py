@@ -0,0 +1,111 @@
+"""
+Command-line entry point of the benchmark suite.
+
+Usage: python -m benchmarks [--rows N ...] [--repeat N] [--seed N] [--output PATH]
+                            [--baseline PATH] [--save-baseline] [--threshold RATIO]
+                            [--backend {pandas,sqlite}]
+
+Sizes accept k / M suffixes (50k, 1M, 10M). The 10M run needs about 8 GB of RAM.
+Exits with status 1 when a timing regresses against the baseline.
+"""
+
+import os
+import sys
+import json
+import argparse
+import warnings
+
+from benchmarks.suite import BACKENDS, REGRESSION_THRESHOLD, environment, run_suite, compare_results
+
+DEFAULT_SIZES = ['50k', '1M']
+RESULTS_FILE = os.path.join('benchmarks', 'results.json')
+BASELINE_FILE = os.path.join('benchmarks', 'baseline.json')
+
+
+def print_section(title):
+    """Print a formatted section title"""
+    print("\n" + "=" * 70)
+    print(f"  {title}")
+    print("=" * 70)
+
+
+def parse_size(text):
+    """'50k' → 50000, '1M' → 1000000"""
+    multipliers = {'k': 1_000, 'm': 1_000_000}
+    suffix = text[-1].lower()
+    if suffix in multipliers:
+        return int(float(text[:-1]) * multipliers[suffix])
+    return int(text)
+
+
+def print_comparison(comparison):
+    """Table of the timings that changed, then a one-line summary"""
+    changed = [row for row in comparison if row['status'] in ('regression', 'faster')]
+    if changed:
+        print(f"  {'Rows':>10}  {'Computation':<42}{'Base (ms)':>11}{'Now (ms)':>11}{'Ratio':>8}")
+        for row in sorted(changed, key=lambda r: (r['rows'], -r['ratio'])):
+            flag = '🔴' if row['status'] == 'regression' else '🟢'
+            print(f"{flag} {row['rows']:>10,}  {row['computation']:<42}{row['baseline'] * 1000:>11.2f}"
+                  f"{row['current'] * 1000:>11.2f}{row['ratio']:>7.2f}x")
+    counts = {status: sum(row['status'] == status for row in comparison)
+              for status in ('regression', 'faster', 'ok', 'new')}
+    print(f"\n  {counts['regression']} regression(s), {counts['faster']} faster, "
+          f"{counts['ok']} unchanged, {counts['new']} not in the baseline")
+    return counts['regression']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description="Time the dashboard computations on synthetic data and compare with a baseline"
+    )
+    parser.add_argument('--rows', nargs='+', default=DEFAULT_SIZES,
+                        help="dataset sizes, e.g. 50k 1M 10M (default: 50k 1M)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="runs per computation, best time kept (default: 3)")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="random seed of the synthetic data (default: 0)")
+    parser.add_argument('--output', default=RESULTS_FILE,
+                        help=f"results JSON (default: {RESULTS_FILE})")
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help=f"baseline JSON to compare with (default: {BASELINE_FILE})")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store these results as the new baseline instead of comparing")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help=f"slow-down ratio flagged as a regression (default: {REGRESSION_THRESHOLD})")
+    parser.add_argument('--backend', choices=BACKENDS, default='pandas',
+                        help="chart counts from the in-memory cube or the SQLite database (default: pandas)")
+    args = parser.parse_args(argv)
+    # As in the dashboard: pandas deprecation notices would drown the timings
+    warnings.filterwarnings('ignore', category=FutureWarning)
+
+    results = {'environment': environment(), 'runs': {}}
+    for size in [parse_size(text) for text in args.rows]:
+        print_section(f"⏱️  DASHBOARD BENCHMARK - {size:,} ROWS ({args.backend})")
+        results['runs'][str(size)] = run_suite(size, seed=args.seed, repeat=args.repeat, backend=args.backend)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📝 Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ No baseline at {args.baseline} - run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print_section(f"📊 COMPARISON WITH {args.baseline}")
+    print(f"  Baseline: {baseline['environment']['created']} "
+          f"(python {baseline['environment']['python']}, pandas {baseline['environment']['pandas']})")
+    regressions = print_comparison(compare_results(results, baseline, threshold=args.threshold))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""
+Dashboard Benchmark Suite
+=========================
+Times the dashboard computations headlessly, outside Streamlit, on a
+synthetic dataset: snapshot load, partitioned layout (write, and read of
+the latest year only), index and cube builds, then for the default view
+and a typical filtered view the filter mask, the KPIs, every chart count
+and groupby of tabs 1-6, the correlation matrix, the OLS trendlines and
+the exports. As in the dashboard, the KPIs and the correlation matrix are
+merged from the per-cell moments of ``MomentCube``, and the victim-age
+statistics from the per-cell age histogram of the count cube. The
+pipeline's precomputed default view (``GlobalView``) is timed as a build
+step. With the SQLite backend, the chart counts and the KPIs are indexed
+queries on a database built from the same data.
+
+Results are plain dicts (saved as JSON) and can be compared against a
+stored baseline to catch regressions before a deploy.
+"""
+
+import os
+import sys
+import time
+import platform
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_incidents
+from dashboard.storage import load_transformed
+from dashboard.partitions import PartitionManifest, write_partitions
+from dashboard.filters import FilterIndex, FILTER_COLUMNS
+from dashboard.cube import CountCube
+from dashboard.moments import MomentCube
+from dashboard.spatial import SpatialGrid, ZOOM_LEVELS
+from dashboard.rollups import DailyRollup
+from dashboard.global_view import GlobalView
+from dashboard.sql_backend import SqlBackend, build_database
+from dashboard.aggregations import (CORR_VARS, TIME_GRANULARITIES, by_frequency, compute_area_stats,
+                                    compute_time_series, compute_area_weapon, compute_area_data)
+from dashboard.regression import fit_ols
+from dashboard.histograms import histogram_stats
+from dashboard.export import export_rows
+
+# Count-cube queries behind the charts of tabs 1-6 (name, axes)
+CHART_COUNTS = [
+    ('tab1.category', 'crime_category'),
+    ('tab1.crime_type', 'Crm Cd Desc'),
+    ('tab1.severity', 'crime_severity'),
+    ('tab1.category_severity', ('crime_category', 'crime_severity')),
+    ('tab2.area', 'AREA NAME'),
+    ('tab3.day', 'day_name'),
+    ('tab3.month', 'month'),
+    ('tab3.hour', 'hour'),
+    ('tab3.time_period', 'time_period'),
+    ('tab3.day_hour', ('day_name', 'hour')),
+    ('tab4.age_group', 'victim_age_group'),
+    ('tab4.age', 'Vict Age'),
+    ('tab4.sex', 'Vict Sex'),
+    ('tab4.category_age', ('crime_category', 'victim_age_group')),
+    ('tab5.weapon', 'weapon_involved'),
+    ('tab5.weapon_category', 'weapon_category'),
+    ('tab5.category_weapon', ('crime_category', 'weapon_involved')),
+    ('tab6.year_category', ('year', 'crime_category')),
+    ('tab6.year_month', ('year', 'month')),
+]
+
+# Count backends: the in-memory cube or the SQLite database built by the pipeline
+BACKENDS = ['pandas', 'sqlite']
+
+# The Excel export writes cell by cell: only timed on selections up to this size
+EXCEL_MAX_BENCH_ROWS = 25_000
+
+# A timing is a regression when slower than baseline × threshold by more than MIN_DELTA seconds
+REGRESSION_THRESHOLD = 1.25
+MIN_DELTA = 0.005
+
+
+def time_call(func, repeat):
+    """Return the best wall time over `repeat` runs and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def scenario_criteria(filter_index):
+    """
+    Filter states timed by the suite.
+
+    Returns:
+    --------
+    dict
+        {'default': everything selected,
+         'filtered': last two years, top 5 areas, top 3 categories}
+    """
+    default = {col: filter_index.values(col) for col in FILTER_COLUMNS}
+    top_areas = filter_index.value_counts('AREA NAME').sort_values(ascending=False).head(5).index.tolist()
+    top_categories = filter_index.value_counts('crime_category').sort_values(ascending=False).head(3).index.tolist()
+    filtered = {
+        **default,
+        'year': default['year'][-2:],
+        'AREA NAME': top_areas,
+        'crime_category': top_categories
+    }
+    return {'default': default, 'filtered': filtered}
+
+
+def scenario_computations(df, count_cube, moment_cube, spatial_grid, daily_rollup, criteria, selection):
+    """
+    (name, callable) of every computation the dashboard runs for one filter state.
+
+    The row-level computations receive the filtered rows extracted once, as
+    in the dashboard.
+    """
+    rows = selection.rows
+    area_counts = by_frequency(count_cube.counts(criteria, 'AREA NAME'))
+    top_areas = area_counts.head(10).index
+    positions = None if selection.is_identity else selection.positions
+    mask = None if selection.is_identity else selection.mask
+
+    # SQLite backend: the KPIs are one aggregate query, as in the dashboard
+    sql_kpis = isinstance(count_cube, SqlBackend)
+
+    computations = [
+        ('kpis', lambda: count_cube.kpis(criteria) if sql_kpis else moment_cube.moments(criteria).kpis()),
+        ('tab2.area_stats', lambda: compute_area_stats(rows)),
+        ('tab4.age_stats', lambda: histogram_stats(count_cube.counts(criteria, 'Vict Age'))),
+        ('tab5.area_weapon', lambda: compute_area_weapon(rows, top_areas)),
+        ('tab6.correlation', lambda: moment_cube.moments(criteria).corr([v for v in CORR_VARS if v in rows.columns])),
+        ('tab6.area_data', lambda: compute_area_data(rows)),
+        ('tab6.ols_trendlines', lambda: fit_trendlines(compute_area_data(rows))),
+    ]
+    computations += [(f'count.{name}', lambda by=by: count_cube.counts(criteria, by)) for name, by in CHART_COUNTS]
+    # One-letter names ('M', not 'ME' on pandas >= 2.2) keep the baseline keys stable
+    computations += [
+        (f'tab3.time_series.{freq[0]}', lambda label=label: compute_time_series(daily_rollup, criteria, label))
+        for label, (freq, _) in TIME_GRANULARITIES.items()
+    ]
+    computations += [
+        (f'tab2.map_cells.z{zoom}', lambda zoom=zoom: spatial_grid.aggregate(zoom, mask))
+        for zoom in (ZOOM_LEVELS[0], ZOOM_LEVELS[-1])
+    ]
+    computations += [
+        ('export.csv_gzip', lambda: export_rows(df, 'CSV (gzip)', positions)),
+        ('export.parquet', lambda: export_rows(df, 'Parquet', positions)),
+    ]
+    if selection.count <= EXCEL_MAX_BENCH_ROWS:
+        computations.append(('export.excel', lambda: export_rows(df, 'Excel', positions)))
+    return computations
+
+
+def fit_trendlines(area_data):
+    """OLS trendlines and confidence bands of the two tab-6 scatter plots, in one batched fit"""
+    x = [area_data['population'], area_data['median_income']]
+    fit = fit_ols(x, [area_data['crime_rate'], area_data['DR_NO']])
+    grids = np.array([np.linspace(values.min(), values.max(), 50) for values in x])
+    return fit, fit.bands(grids)
+
+
+def run_suite(n_rows, seed=0, repeat=3, verbose=True, backend='pandas'):
+    """
+    Generate a synthetic dataset and time every dashboard computation on it.
+
+    Parameters:
+    -----------
+    n_rows : int
+        Number of synthetic incidents
+    seed : int
+        Random seed of the generator
+    repeat : int
+        Runs per computation (best time kept)
+    verbose : bool
+        Print each timing as it is measured
+    backend : str
+        'pandas' (in-memory count cube) or 'sqlite' (indexed GROUP BY
+        queries, as with DASHBOARD_BACKEND=sqlite); the timings keep the
+        same names so that either can be compared with the baseline
+
+    Returns:
+    --------
+    dict
+        {'rows': n_rows, 'backend': backend, 'timings': {computation: seconds}}
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend} (expected {', '.join(BACKENDS)})")
+    timings = {}
+
+    def measure(name, func, runs=repeat):
+        seconds, result = time_call(func, runs)
+        timings[name] = round(seconds, 6)
+        if verbose:
+            print(f"   {name:45s} {seconds * 1000:10.2f} ms")
+        return result
+
+    df = measure('generate', lambda: generate_incidents(n_rows, seed), runs=1)
+    with tempfile.TemporaryDirectory() as workdir:
+        snapshot_path = os.path.join(workdir, 'Crime_Data_Transformed.feather')
+        df.to_feather(snapshot_path)
+        partitions_path = os.path.join(workdir, 'Crime_Data_Partitioned')
+        measure('build.partitions', lambda: write_partitions(df, partitions_path), runs=1)
+        if backend == 'sqlite':
+            database_path = os.path.join(workdir, 'Crime_Data.sqlite')
+            measure('build.sqlite', lambda: build_database(df, database_path), runs=1)
+        del df
+        # No source CSV: the snapshot is read as is, as in production
+        df = measure('load.snapshot', lambda: load_transformed(os.path.join(workdir, 'missing.csv'), snapshot_path))
+        # Partition pruning: a session limited to the latest year reads one partition
+        manifest = PartitionManifest.load(partitions_path)
+        latest_year = manifest.values('year')[-1:]
+        measure('load.partitions.latest_year', lambda: manifest.read({'year': latest_year}))
+
+        filter_index = measure('build.filter_index', lambda: FilterIndex(df), runs=1)
+        if backend == 'sqlite':
+            count_cube = SqlBackend(database_path)
+        else:
+            count_cube = measure('build.count_cube', lambda: CountCube(df), runs=1)
+        moment_cube = measure('build.moment_cube', lambda: MomentCube(df), runs=1)
+        spatial_grid = measure('build.spatial_grid', lambda: SpatialGrid(df), runs=1)
+        daily_rollup = measure('build.daily_rollup', lambda: DailyRollup(df), runs=1)
+        measure('build.global_view', lambda: GlobalView.build(df), runs=1)
+
+        for scenario, criteria in scenario_criteria(filter_index).items():
+            if verbose:
+                print(f"\n   [{scenario}]")
+            measure(f'{scenario}.filter.select', lambda: filter_index.select(criteria).count)
+            selection = filter_index.select(criteria)
+            measure(f'{scenario}.filter.rows', lambda: filter_index.select(criteria).rows)
+            for name, func in scenario_computations(df, count_cube, moment_cube, spatial_grid, daily_rollup,
+                                                     criteria, selection):
+                measure(f'{scenario}.{name}', func)
+
+        if backend == 'sqlite':
+            count_cube.pool.close()
+
+    return {'rows': n_rows, 'backend': backend, 'timings': timings}
+
+
+def environment():
+    """Machine and library versions recorded with the results"""
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def compare_results(results, baseline, threshold=REGRESSION_THRESHOLD, min_delta=MIN_DELTA):
+    """
+    Compare timings with a baseline run.
+
+    Parameters:
+    -----------
+    results, baseline : dict
+        Suite outputs ({'runs': {rows: {'timings': ...}}})
+    threshold : float
+        Slow-down ratio from which a timing is flagged
+    min_delta : float
+        Smallest slow-down (seconds) flagged, to ignore timer noise
+
+    Returns:
+    --------
+    list of dict
+        One row per timing: rows, computation, baseline, current, ratio, status
+        ('regression', 'faster', 'ok' or 'new')
+    """
+    comparison = []
+    for size, run in results['runs'].items():
+        base_timings = baseline.get('runs', {}).get(size, {}).get('timings', {})
+        for name, seconds in run['timings'].items():
+            base = base_timings.get(name)
+            if base is None:
+                status, ratio = 'new', None
+            else:
+                ratio = seconds / base if base > 0 else float('inf')
+                if seconds > base * threshold and seconds - base > min_delta:
+                    status = 'regression'
+                elif seconds * threshold < base and base - seconds > min_delta:
+                    status = 'faster'
+                else:
+                    status = 'ok'
+            comparison.append({
+                'rows': int(size),
+                'computation': name,
+                'baseline': base,
+                'current': seconds,
+                'ratio': ratio,
+                'status': status
+            })
+    return comparison
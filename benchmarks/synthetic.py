@@ -0,0 +1,239 @@
+"""
+Synthetic Incidents
+===================
+Generates incidents with the columns and types of Crime_Data_Transformed.csv
+at any scale, so the dashboard computations can be timed beyond the 50k
+extract.
+
+Areas and time periods are drawn jointly from Crime_Pivot_Area_Time.csv,
+categories and years jointly from Crime_Pivot_Category_Year.csv, so the
+selectivity of the filters matches the real data. The derived columns are
+computed with the transformer's own rules (time periods, age groups, crime,
+weapon and location categories) and the area demographics.
+
+Text columns are generated as pandas categoricals: at 10M rows, object
+strings would not fit in memory on a laptop.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from crime_pipeline.transformation import AREA_DEMOGRAPHICS, CrimeDataTransformer
+from dashboard.storage import apply_schema
+
+PIVOT_AREA_TIME = os.path.join('data', 'Crime_Pivot_Area_Time.csv')
+PIVOT_CATEGORY_YEAR = os.path.join('data', 'Crime_Pivot_Category_Year.csv')
+
+# Column order of Crime_Data_Transformed.csv
+TRANSFORMED_COLUMNS = [
+    'DR_NO', 'Date Rptd', 'DATE OCC', 'TIME OCC', 'AREA', 'AREA NAME', 'Rpt Dist No', 'Part 1-2',
+    'Crm Cd', 'Crm Cd Desc', 'Mocodes', 'Vict Age', 'Vict Sex', 'Vict Descent', 'Premis Cd',
+    'Premis Desc', 'Weapon Used Cd', 'Weapon Desc', 'Status', 'Status Desc', 'Crm Cd 1', 'LOCATION',
+    'LAT', 'LON', 'year', 'month', 'month_name', 'day_of_week', 'day_name', 'quarter', 'hour',
+    'time_period', 'is_weekend', 'reporting_delay_days', 'crime_severity', 'crime_category',
+    'weapon_involved', 'weapon_category', 'victim_age_group', 'location_type', 'area_crime_frequency',
+    'area_risk_score', 'population', 'median_income', 'area_size_sq_miles', 'total_cases',
+    'crimes_per_1000'
+]
+
+# Hours covered by each time period of the pivot
+PERIOD_HOURS = {
+    'Late Night (00:00-05:59)': (0, 6),
+    'Morning (06:00-11:59)': (6, 12),
+    'Afternoon (12:00-17:59)': (12, 18),
+    'Evening (18:00-23:59)': (18, 24)
+}
+
+# Raw descriptions (code, text) that the transformer maps back to each category
+DESCRIPTIONS = {
+    'Violent Crime': [(624, 'BATTERY - SIMPLE ASSAULT'), (230, 'ASSAULT WITH DEADLY WEAPON, AGGRAVATED ASSAULT'),
+                      (626, 'INTIMATE PARTNER - SIMPLE ASSAULT'), (236, 'INTIMATE PARTNER - AGGRAVATED ASSAULT')],
+    'Property Crime': [(440, 'THEFT PLAIN - PETTY ($950 & UNDER)'), (310, 'BURGLARY'),
+                       (330, 'BURGLARY FROM VEHICLE'), (442, 'SHOPLIFTING - PETTY THEFT ($950 & UNDER)'),
+                       (510, 'VEHICLE - STOLEN'), (210, 'ROBBERY')],
+    'Vehicle-Related': [(647, 'THROWING OBJECT AT MOVING VEHICLE'),
+                        (648, 'SHOTS FIRED AT MOVING VEHICLE, TRAIN OR AIRCRAFT')],
+    'Fraud/Financial': [(651, 'DOCUMENT FORGERY'), (670, 'INSURANCE FRAUD')],
+    'Vandalism': [(740, 'VANDALISM - FELONY ($400 & OVER, ALL CHURCH VANDALISMS)'),
+                  (745, 'VANDALISM - MISDEAMEANOR ($399 OR UNDER)')],
+    'Drug-Related': [(865, 'DRUGS, TO A MINOR')],
+    'Other': [(930, 'CRIMINAL THREATS - NO WEAPON DISPLAYED'), (888, 'TRESPASSING'),
+              (900, 'VIOLATION OF COURT ORDER'), (956, 'LETTERS, LEWD  -  TELEPHONE CALLS, LEWD')]
+}
+
+# Share of Part 1 crimes and of incidents involving a weapon, per category
+PART_1_SHARE = {'Violent Crime': 0.75, 'Property Crime': 0.85}
+WEAPON_SHARE = {'Violent Crime': 0.85, 'Other': 0.35}
+
+WEAPONS = [(400.0, 'STRONG-ARM (HANDS, FIST, FEET OR BODILY FORCE)'), (500.0, 'UNKNOWN WEAPON/OTHER WEAPON'),
+           (511.0, 'VERBAL THREAT'), (102.0, 'HAND GUN'), (200.0, 'KNIFE WITH BLADE 6INCHES OR LESS')]
+WEAPON_WEIGHTS = [0.5, 0.15, 0.15, 0.12, 0.08]
+
+PREMISES = [(101.0, 'STREET'), (501.0, 'SINGLE FAMILY DWELLING'), (502.0, 'MULTI-UNIT DWELLING (APARTMENT, DUPLEX, ETC)'),
+            (108.0, 'PARKING LOT'), (404.0, 'DEPARTMENT STORE'), (102.0, 'SIDEWALK'), (203.0, 'OTHER BUSINESS')]
+PREMISE_WEIGHTS = [0.28, 0.17, 0.16, 0.1, 0.06, 0.08, 0.15]
+
+SEXES = ['M', 'F', 'X', 'H']
+SEX_WEIGHTS = [0.42, 0.4, 0.15, 0.03]
+DESCENTS = ['H', 'W', 'B', 'X', 'O', 'A']
+DESCENT_WEIGHTS = [0.33, 0.22, 0.15, 0.17, 0.09, 0.04]
+STATUSES = [('IC', 'Invest Cont'), ('AO', 'Adult Other'), ('AA', 'Adult Arrest')]
+STATUS_WEIGHTS = [0.78, 0.13, 0.09]
+MOCODES = ['0344', '0416', '1822 0344', '0329 1300', '2000 1813 0416', '1300 0358']
+LOCATIONS = ['100 W 6TH ST', '7TH ST', '5400 WILSHIRE BL', 'VENTURA BL', '1200 S FIGUEROA ST', 'SUNSET BL']
+
+# Coordinates of LA around which the area centres are spread
+LA_CENTER = (34.05, -118.3)
+
+
+def _pivot_probabilities(path):
+    """Joint distribution (row label, column label, probability) of a pivot table"""
+    pivot = pd.read_csv(path, index_col=0)
+    stacked = pivot.stack()
+    stacked = stacked[stacked > 0]
+    return stacked.index.get_level_values(0), stacked.index.get_level_values(1), (stacked / stacked.sum()).to_numpy()
+
+
+def _categorical(values, rng, n_rows, weights=None):
+    """Categorical column drawn from a list of labels"""
+    codes = rng.choice(len(values), size=n_rows, p=weights)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(values))
+
+
+def generate_incidents(n_rows, seed=0, pivot_area_time=PIVOT_AREA_TIME, pivot_category_year=PIVOT_CATEGORY_YEAR):
+    """
+    Synthetic transformed dataset.
+
+    Parameters:
+    -----------
+    n_rows : int
+        Number of incidents
+    seed : int
+        Random seed (the same seed gives the same dataset)
+    pivot_area_time, pivot_category_year : str
+        Pivot tables giving the area × time period and category × year mixes
+
+    Returns:
+    --------
+    pd.DataFrame
+        Columns of Crime_Data_Transformed.csv, typed like the dashboard snapshot
+    """
+    rng = np.random.default_rng(seed)
+
+    # Area × time period, then category × year, drawn from the pivots
+    areas, periods, p_area_period = _pivot_probabilities(pivot_area_time)
+    pick = rng.choice(len(p_area_period), size=n_rows, p=p_area_period)
+    area = pd.Categorical(np.asarray(areas)[pick])
+    period = np.asarray(periods)[pick]
+
+    categories, years, p_category_year = _pivot_probabilities(pivot_category_year)
+    pick = rng.choice(len(p_category_year), size=n_rows, p=p_category_year)
+    category = np.asarray(categories)[pick]
+    year = np.asarray(years).astype(int)[pick]
+
+    # Date and time of occurrence
+    year_start = pd.to_datetime(pd.Series(year).astype(str) + '-01-01').to_numpy()
+    days_in_year = np.where(pd.Series(year_start).dt.is_leap_year, 366, 365)
+    occurred = pd.DatetimeIndex(year_start + (rng.random(n_rows) * days_in_year).astype('timedelta64[D]'))
+    bounds = np.array([PERIOD_HOURS[p] for p in PERIOD_HOURS])
+    period_codes = pd.Categorical(period, categories=list(PERIOD_HOURS)).codes
+    hour = rng.integers(bounds[period_codes, 0], bounds[period_codes, 1])
+    time_occ = hour * 100 + rng.integers(0, 60, n_rows)
+    delay = np.minimum(rng.geometric(0.12, n_rows) - 1, 365 * 2)
+    reported = occurred + pd.to_timedelta(delay, unit='D')
+
+    # Description within the category
+    desc_labels = []
+    desc_codes = np.empty(n_rows, dtype=np.int64)
+    crm_cd = np.empty(n_rows, dtype=np.int64)
+    for cat, pool in DESCRIPTIONS.items():
+        rows = np.flatnonzero(category == cat)
+        if len(rows) == 0:
+            continue
+        picked = rng.integers(0, len(pool), len(rows))
+        desc_codes[rows] = len(desc_labels) + picked
+        crm_cd[rows] = np.array([code for code, _ in pool])[picked]
+        desc_labels.extend(text for _, text in pool)
+    description = pd.Categorical.from_codes(desc_codes, categories=pd.Index(desc_labels))
+
+    part = np.where(rng.random(n_rows) < pd.Series(category).map(PART_1_SHARE).fillna(0.2).to_numpy(), 1, 2)
+
+    # Weapon, victim and premise
+    armed = rng.random(n_rows) < pd.Series(category).map(WEAPON_SHARE).fillna(0.08).to_numpy()
+    weapon_pick = rng.choice(len(WEAPONS), size=n_rows, p=WEAPON_WEIGHTS)
+    weapon_cd = np.where(armed, np.array([code for code, _ in WEAPONS])[weapon_pick], np.nan)
+    weapon_desc = pd.Categorical.from_codes(np.where(armed, weapon_pick, -1),
+                                            categories=pd.Index([text for _, text in WEAPONS]))
+
+    unknown_age = rng.random(n_rows) < 0.2
+    age = np.where(unknown_age, 0, np.clip(rng.normal(39, 16, n_rows).round(), 2, 99)).astype(np.int64)
+
+    premise_pick = rng.choice(len(PREMISES), size=n_rows, p=PREMISE_WEIGHTS)
+    status_pick = rng.choice(len(STATUSES), size=n_rows, p=STATUS_WEIGHTS)
+
+    # Area centres spread around LA, incidents scattered around their centre
+    area_names = list(area.categories)
+    angle = np.linspace(0, 2 * np.pi, len(area_names), endpoint=False)
+    radius = 0.08 + 0.1 * (np.arange(len(area_names)) % 3)
+    centre_lat = LA_CENTER[0] + radius * np.sin(angle)
+    centre_lon = LA_CENTER[1] + radius * np.cos(angle)
+    area_codes = area.codes
+
+    df = pd.DataFrame({
+        'DR_NO': 200_000_000 + np.arange(n_rows, dtype=np.int64),
+        'Date Rptd': reported,
+        'DATE OCC': occurred,
+        'TIME OCC': time_occ,
+        'AREA': area_codes.astype(np.int64) + 1,
+        'AREA NAME': area,
+        'Rpt Dist No': (area_codes + 1) * 100 + rng.integers(0, 99, n_rows),
+        'Part 1-2': part,
+        'Crm Cd': crm_cd,
+        'Crm Cd Desc': description,
+        'Mocodes': _categorical(MOCODES, rng, n_rows),
+        'Vict Age': age,
+        'Vict Sex': _categorical(SEXES, rng, n_rows, SEX_WEIGHTS),
+        'Vict Descent': _categorical(DESCENTS, rng, n_rows, DESCENT_WEIGHTS),
+        'Premis Cd': np.array([code for code, _ in PREMISES])[premise_pick],
+        'Premis Desc': pd.Categorical.from_codes(premise_pick, categories=pd.Index([t for _, t in PREMISES])),
+        'Weapon Used Cd': weapon_cd,
+        'Weapon Desc': weapon_desc,
+        'Status': pd.Categorical.from_codes(status_pick, categories=pd.Index([s for s, _ in STATUSES])),
+        'Status Desc': pd.Categorical.from_codes(status_pick, categories=pd.Index([d for _, d in STATUSES])),
+        'Crm Cd 1': crm_cd.astype(float),
+        'LOCATION': _categorical(LOCATIONS, rng, n_rows),
+        'LAT': centre_lat[area_codes] + rng.normal(0, 0.025, n_rows),
+        'LON': centre_lon[area_codes] + rng.normal(0, 0.03, n_rows)
+    })
+
+    # Derived columns, with the transformer's rules
+    df['year'] = occurred.year.astype(np.int64)
+    df['month'] = occurred.month.astype(np.int64)
+    df['month_name'] = occurred.month_name()
+    df['day_of_week'] = occurred.dayofweek.astype(np.int64)
+    df['day_name'] = occurred.day_name()
+    df['quarter'] = occurred.quarter.astype(np.int64)
+    df['hour'] = hour
+    df['time_period'] = CrimeDataTransformer._bucket_time_period(df['hour'])
+    df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)
+    df['reporting_delay_days'] = delay
+    df['crime_severity'] = df['Part 1-2'].map({1: 'Part 1 - Serious Crime', 2: 'Part 2 - Less Serious Crime'})
+    df['crime_category'] = CrimeDataTransformer._map_distinct(df['Crm Cd Desc'], CrimeDataTransformer._categorize_crime)
+    df['weapon_involved'] = armed.astype(int)
+    df['weapon_category'] = CrimeDataTransformer._map_distinct(df['Weapon Desc'], CrimeDataTransformer._categorize_weapon)
+    df['victim_age_group'] = CrimeDataTransformer._bucket_age(df['Vict Age'])
+    df['location_type'] = CrimeDataTransformer._map_distinct(df['Premis Desc'], CrimeDataTransformer._categorize_location)
+
+    # Area statistics and demographics, as in the transformer
+    area_counts = df['AREA NAME'].value_counts()
+    df['area_crime_frequency'] = df['AREA NAME'].map(area_counts).astype(np.int64)
+    df['area_risk_score'] = (df['area_crime_frequency'] / area_counts.max() * 100).round(2)
+    demographics = AREA_DEMOGRAPHICS.set_index('AREA NAME')
+    for col in ['population', 'median_income', 'area_size_sq_miles']:
+        df[col] = df['AREA NAME'].map(demographics[col]).astype(demographics[col].dtype)
+    df['total_cases'] = df['area_crime_frequency']
+    df['crimes_per_1000'] = (df['total_cases'] / df['population'] * 1000).round(2)
+
+    return apply_schema(df[TRANSFORMED_COLUMNS])
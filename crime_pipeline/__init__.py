@@ -0,0 +1,24 @@
+"""
+Crime Data Pipeline
+===================
+Importable version of the notebook data preparation (cleaning,
+feature engineering, aggregation), runnable headlessly:
+
+    python -m crime_pipeline [--stages clean transform aggregate partition database
+                              global_view]
+"""
+
+from crime_pipeline.cleaning import nettoyer_donnees_crime, nettoyer_donnees_crime_par_blocs
+from crime_pipeline.transformation import AREA_DEMOGRAPHICS, CrimeDataTransformer, build_aggregations
+from crime_pipeline.pipeline import STAGES, CrimeDataPipeline, run_pipeline
+
+__all__ = [
+    'nettoyer_donnees_crime',
+    'nettoyer_donnees_crime_par_blocs',
+    'AREA_DEMOGRAPHICS',
+    'CrimeDataTransformer',
+    'build_aggregations',
+    'STAGES',
+    'CrimeDataPipeline',
+    'run_pipeline',
+]
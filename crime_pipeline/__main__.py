@@ -0,0 +1,75 @@
+"""
+Command-line entry point of the data pipeline.
+
+Usage: python -m crime_pipeline [--stages STAGE ...] [--raw PATH] [--data-dir DIR]
+                                [--incremental] [--chunksize N] [--partition-by-area]
+                                [--quiet] [--json PATH]
+"""
+
+import sys
+import json
+import argparse
+
+from crime_pipeline.pipeline import DATA_DIR, STAGES, CrimeDataPipeline
+
+
+def print_section(title):
+    """Print a formatted section title"""
+    print("\n" + "=" * 70)
+    print(f"  {title}")
+    print("=" * 70)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m crime_pipeline',
+        description="Clean, transform and aggregate the LA crime data without Jupyter"
+    )
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES,
+                        help="stages to run (default: all, in pipeline order)")
+    parser.add_argument('--raw', default=None,
+                        help="raw CSV (default: data/Crime_Data_from_2020_to_Present_50k.csv)")
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help="output directory (default: data)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only transform the records whose DR_NO is not yet in the transformed data")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="clean the raw file in chunks of N rows instead of loading it whole")
+    parser.add_argument('--partition-by-area', action='store_true',
+                        help="split each year of the partitioned dataset by area as well")
+    parser.add_argument('--quiet', action='store_true',
+                        help="only print the stage summary")
+    parser.add_argument('--json', default=None,
+                        help="also write the stage reports to this JSON file")
+    args = parser.parse_args(argv)
+
+    print_section("🚔 CRIME DATA PIPELINE")
+    pipeline = CrimeDataPipeline(data_dir=args.data_dir, raw_path=args.raw, verbose=not args.quiet,
+                                 incremental=args.incremental, chunksize=args.chunksize,
+                                 partition_by_area=args.partition_by_area)
+    try:
+        reports = pipeline.run(args.stages)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    print_section("⏱️  STAGE SUMMARY")
+    print(f"  {'Stage':<12}{'Time (s)':>10}{'Peak (MB)':>12}{'Rows':>12}")
+    for report in reports:
+        print(f"  {report.name:<12}{report.seconds:>10.2f}{report.peak_mb:>12.1f}{report.rows:>12,}")
+    print(f"  {'total':<12}{sum(r.seconds for r in reports):>10.2f}{max(r.peak_mb for r in reports):>12.1f}")
+
+    print("\n📁 Outputs:")
+    for report in reports:
+        for output in report.outputs:
+            print(f"  ✅ {output}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([report.as_dict() for report in reports], f, indent=2)
+        print(f"\n📝 Report written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,392 @@
+"""
+Nettoyage des données brutes
+============================
+Reprise de ``nettoyer_donnees_crime`` (notebooks/data_cleaning.ipynb) :
+valeurs manquantes, doublons, incohérences, renommage en français et
+conversion des types.
+
+``nettoyer_donnees_crime_par_blocs`` applique les mêmes règles à un fichier
+brut lu par blocs, sans jamais le charger en entier (fichiers plus gros que
+la mémoire) :
+
+  - passe 1 : proportion de valeurs manquantes par colonne (colonnes à
+    supprimer) et type de chaque colonne sur l'ensemble du fichier ;
+  - passe 2 : règles ligne à ligne sur chaque bloc, doublons détectés via
+    l'empreinte (hash) des lignes et des ``DR_NO`` déjà vus, écriture du
+    bloc nettoyé à la suite du fichier de sortie.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Colonnes supprimées au-delà de cette proportion de valeurs manquantes
+SEUIL_MANQUANT = 0.70
+
+TAILLE_BLOC = 100_000
+
+COLS_IMPORTANTES = ['DR_NO', 'Date Rptd', 'DATE OCC']
+COLS_TEXTE = ['Weapon Desc', 'Premis Desc', 'Vict Sex', 'Vict Descent', 'Status Desc']
+
+SEXE_MAP = {'M': 'Male', 'F': 'Female', 'X': 'Unknown', 'H': 'Unknown', '-': 'Unknown'}
+ORIGINE_MAP = {
+    'A': 'Other Asian', 'B': 'Black', 'C': 'Chinese', 'D': 'Cambodian',
+    'F': 'Filipino', 'G': 'Guamanian', 'H': 'Hispanic/Latin/Mexican',
+    'I': 'American Indian/Alaskan Native', 'J': 'Japanese', 'K': 'Korean',
+    'L': 'Laotian', 'O': 'Other', 'P': 'Pacific Islander', 'S': 'Samoan',
+    'U': 'Hawaiian', 'V': 'Vietnamese', 'W': 'White', 'X': 'Unknown',
+    'Z': 'Asian Indian', '-': 'Unknown'
+}
+
+NOUVEAUX_NOMS = {
+    'DR_NO': 'numero_rapport', 'Date Rptd': 'date_signalement', 'DATE OCC': 'date_crime',
+    'TIME OCC': 'heure_crime', 'AREA': 'code_zone', 'AREA NAME': 'nom_zone',
+    'Rpt Dist No': 'district', 'Part 1-2': 'partie_crime',
+    'Crm Cd': 'code_crime', 'Crm Cd Desc': 'description_crime',
+    'Mocodes': 'codes_modus', 'Vict Age': 'age_victime',
+    'Vict Sex': 'sexe_victime', 'Vict Descent': 'origine_victime',
+    'Premis Cd': 'code_lieu', 'Premis Desc': 'description_lieu',
+    'Weapon Used Cd': 'code_arme', 'Weapon Desc': 'description_arme',
+    'Status': 'code_statut', 'Status Desc': 'description_statut',
+    'Crm Cd 1': 'code_crime_1', 'Crm Cd 2': 'code_crime_2',
+    'Crm Cd 3': 'code_crime_3', 'Crm Cd 4': 'code_crime_4',
+    'LOCATION': 'localisation', 'Cross Street': 'rue_croisement',
+    'LAT': 'latitude', 'LON': 'longitude'
+}
+
+COLS_DATES = ['date_signalement', 'date_crime']
+COLS_ENTIERS = ['numero_rapport', 'code_zone', 'district', 'partie_crime', 'code_crime', 'age_victime']
+COLS_DECIMAUX = ['latitude', 'longitude', 'code_lieu', 'code_arme',
+                 'code_crime_1', 'code_crime_2', 'code_crime_3', 'code_crime_4']
+COLS_CATEGORIES = ['nom_zone', 'description_crime', 'sexe_victime', 'origine_victime',
+                   'description_lieu', 'description_arme', 'code_statut',
+                   'description_statut', 'localisation']
+NOUVELLES_COLS = ['annee', 'mois', 'jour', 'jour_semaine', 'heure']
+
+
+# -----------------------------
+# Règles de nettoyage
+# -----------------------------
+def colonnes_trop_vides(nb_manquants, nb_lignes, seuil=SEUIL_MANQUANT):
+    """Colonnes dont la proportion de valeurs manquantes dépasse le seuil"""
+    if not nb_lignes:
+        return []
+    return [col for col, n in nb_manquants.items() if n / nb_lignes > seuil]
+
+
+def completer_valeurs(df):
+    """Supprime les lignes sans infos critiques et remplit texte et âge"""
+    df = df.dropna(subset=COLS_IMPORTANTES, how='any')
+
+    #Remplir les colonnes de texte et l'âge
+    valeurs = {col: 'Unknown' for col in COLS_TEXTE if col in df.columns}
+    if 'Vict Age' in df.columns:
+        valeurs['Vict Age'] = 0
+    return df.fillna(valeurs)
+
+
+def corriger_incoherences(df):
+    """Âges non réalistes, sexe, origine et statut standardisés"""
+    #Âges non réalistes
+    if 'Vict Age' in df.columns:
+        df.loc[(df['Vict Age'] < 0) | (df['Vict Age'] > 120), 'Vict Age'] = 0
+
+    #Standardiser le sexe
+    if 'Vict Sex' in df.columns:
+        df['Vict Sex'] = df['Vict Sex'].map(SEXE_MAP).fillna('Unknown')
+
+    #Standardiser l'origine
+    if 'Vict Descent' in df.columns:
+        df['Vict Descent'] = df['Vict Descent'].map(ORIGINE_MAP).fillna('Unknown')
+
+    #Nettoyer Status
+    if 'Status Desc' in df.columns:
+        df['Status Desc'] = df['Status Desc'].str.strip().str.title()
+    return df
+
+
+def convertir_types(df):
+    """Dates, heure HHMM, entiers, décimaux et catégories"""
+    #Dates
+    for col in COLS_DATES:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    #Heure
+    if 'heure_crime' in df.columns:
+        df['heure_crime'] = df['heure_crime'].astype(str).str.zfill(4)
+
+    #Entiers
+    for col in COLS_ENTIERS:
+        if col in df.columns:
+            df[col] = df[col].astype('int32')
+
+    #Décimaux
+    for col in COLS_DECIMAUX:
+        if col in df.columns:
+            df[col] = df[col].astype('float32')
+
+    #Catégories
+    for col in COLS_CATEGORIES:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def creer_colonnes(df):
+    """Année, mois, jour, jour de la semaine et heure du crime"""
+    if 'date_crime' in df.columns:
+        df['annee'] = df['date_crime'].dt.year.astype('int16')
+        df['mois'] = df['date_crime'].dt.month.astype('int8')
+        df['jour'] = df['date_crime'].dt.day.astype('int8')
+        df['jour_semaine'] = df['date_crime'].dt.day_name().astype('category')
+        df['heure'] = pd.to_numeric(df['heure_crime'].str[:2], errors='coerce').astype('int8')
+    return df
+
+
+def nettoyer_donnees_crime(df_brut, afficher=True):
+    """
+    Nettoie le jeu de données brut de la LAPD.
+
+    Parameters:
+    -----------
+    df_brut : pd.DataFrame
+        Données brutes (Crime_Data_from_2020_to_Present)
+    afficher : bool
+        Affiche la progression de chaque étape
+
+    Returns:
+    --------
+    pd.DataFrame
+        Données nettoyées, colonnes renommées en français
+    """
+    if afficher:
+        print("=" * 80)
+        print("NETTOYAGE AUTOMATIQUE DES DONNÉES")
+        print("=" * 80)
+        print(f"Taille initiale : {df_brut.shape}")
+
+    #Faire une copie
+    df = df_brut.copy()
+
+    if afficher:
+        print("\n[1/7] Gestion des valeurs manquantes...")
+
+    #Supprimer colonnes trop vides
+    cols_vides = colonnes_trop_vides(df.isnull().sum(), len(df))
+    df = df.drop(columns=cols_vides)
+
+    #Supprimer lignes avec infos critiques manquantes, remplir le reste
+    df = completer_valeurs(df)
+
+    if afficher:
+        print(f"   ✓ Taille : {df.shape}")
+
+    #Supprimer les doublons
+    if afficher:
+        print("\n[2/7] Suppression des doublons...")
+
+    nb_avant = len(df)
+    df = df.drop_duplicates(keep='first')
+    if 'DR_NO' in df.columns:
+        df = df.drop_duplicates(subset=['DR_NO'], keep='first')
+
+    if afficher:
+        print(f"   ✓ {nb_avant - len(df)} doublons supprimés")
+
+    #Corriger les incohérences
+    if afficher:
+        print("\n[3/7] Correction des incohérences...")
+
+    df = corriger_incoherences(df)
+
+    if afficher:
+        print(f"   ✓ Incohérences corrigées")
+
+    #Renommer les colonnes
+    if afficher:
+        print("\n[4/7] Renommage des colonnes...")
+
+    df = df.rename(columns=NOUVEAUX_NOMS)
+
+    if afficher:
+        print(f"   ✓ Colonnes renommées")
+
+    #Convertir les types
+    if afficher:
+        print("\n[5/7] Conversion des types...")
+
+    df = convertir_types(df)
+
+    if afficher:
+        print(f"   ✓ Types convertis")
+
+    #Création de nouvelles colonnes
+    if afficher:
+        print("\n[6/7] Création de nouvelles colonnes...")
+
+    df = creer_colonnes(df)
+
+    if afficher and 'date_crime' in df.columns:
+        colonnes_existantes = [c for c in NOUVELLES_COLS if c in df.columns]
+        print(f"   ✓ Nouvelles colonnes créées : {colonnes_existantes}")
+
+    #Vérification finale
+    if afficher:
+        print("\n[7/7] Vérification finale...")
+        print(f"   ✓ Taille finale : {df.shape}")
+        print(f"   ✓ Valeurs manquantes restantes : {int(df.isnull().sum().sum()):,}")
+
+    return df
+
+
+# -----------------------------
+# Nettoyage par blocs
+# -----------------------------
+def _type_commun(types):
+    """Type qu'aurait une colonne lue d'un seul bloc, d'après les types par bloc"""
+    types = set(types)
+    if len(types) == 1:
+        return types.pop()
+    if all(pd.api.types.is_numeric_dtype(t) and not pd.api.types.is_bool_dtype(t) for t in types):
+        return np.dtype('float64')
+    return np.dtype('object')
+
+
+def analyser_fichier_brut(chemin_brut, taille_bloc=TAILLE_BLOC):
+    """
+    Passe 1 : valeurs manquantes et types des colonnes du fichier brut.
+
+    Returns:
+    --------
+    tuple
+        (nombre de lignes, valeurs manquantes par colonne, type par colonne)
+    """
+    nb_lignes = 0
+    nb_manquants = None
+    types = {}
+    for bloc in pd.read_csv(chemin_brut, chunksize=taille_bloc):
+        nb_lignes += len(bloc)
+        manquants = bloc.isnull().sum()
+        nb_manquants = manquants if nb_manquants is None else nb_manquants.add(manquants, fill_value=0)
+        for col, dtype in bloc.dtypes.items():
+            types.setdefault(col, []).append(dtype)
+    types = {col: _type_commun(t) for col, t in types.items()}
+    return nb_lignes, nb_manquants, types
+
+
+class EmpreintesVues:
+    """Ensemble trié d'empreintes uint64 (lignes ou DR_NO déjà rencontrés)"""
+
+    def __init__(self):
+        self.valeurs = np.empty(0, dtype=np.uint64)
+
+    def nouvelles(self, empreintes):
+        """Masque des empreintes jamais vues (ni avant, ni plus haut dans le bloc)"""
+        deja_vues = np.isin(empreintes, self.valeurs, assume_unique=False)
+        premiere = ~pd.Series(empreintes).duplicated(keep='first').to_numpy()
+        return ~deja_vues & premiere
+
+    def ajouter(self, empreintes):
+        self.valeurs = np.union1d(self.valeurs, empreintes)
+
+    def __len__(self):
+        return len(self.valeurs)
+
+
+def finaliser_bloc(bloc):
+    """Corrections, noms français, types et colonnes dérivées d'un bloc dédoublonné"""
+    bloc = corriger_incoherences(bloc)
+    bloc = bloc.rename(columns=NOUVEAUX_NOMS)
+    bloc = convertir_types(bloc)
+    return creer_colonnes(bloc)
+
+
+def nettoyer_donnees_crime_par_blocs(chemin_brut, chemin_sortie, taille_bloc=TAILLE_BLOC, afficher=True):
+    """
+    Nettoie un fichier brut par blocs et écrit le résultat au fil de l'eau.
+
+    Même résultat que ``nettoyer_donnees_crime`` sur le fichier entier,
+    avec une mémoire bornée par la taille d'un bloc (plus 16 octets par
+    ligne pour les empreintes des doublons).
+
+    Parameters:
+    -----------
+    chemin_brut : str
+        Fichier CSV brut
+    chemin_sortie : str
+        Fichier CSV nettoyé (remplacé à la fin, sans état intermédiaire visible)
+    taille_bloc : int
+        Nombre de lignes lues par bloc
+    afficher : bool
+        Affiche la progression
+
+    Returns:
+    --------
+    dict
+        Lignes lues, lignes écrites, doublons supprimés, colonnes supprimées
+    """
+    if afficher:
+        print("=" * 80)
+        print("NETTOYAGE PAR BLOCS DES DONNÉES")
+        print("=" * 80)
+        print("\n[1/2] Analyse du fichier brut (valeurs manquantes, types)...")
+
+    nb_lignes, nb_manquants, types = analyser_fichier_brut(chemin_brut, taille_bloc)
+    cols_vides = colonnes_trop_vides(nb_manquants, nb_lignes)
+    cols_gardees = [col for col in types if col not in cols_vides]
+
+    if afficher:
+        print(f"   ✓ {nb_lignes:,} lignes, {len(types)} colonnes")
+        print(f"   ✓ Colonnes supprimées (> {SEUIL_MANQUANT:.0%} manquantes) : {cols_vides}")
+        print("\n[2/2] Nettoyage et écriture bloc par bloc...")
+
+    lignes_vues = EmpreintesVues()
+    dr_no_vus = EmpreintesVues()
+    nb_ecrites = 0
+    nb_doublons = 0
+    chemin_tmp = chemin_sortie + '.tmp'
+    try:
+        lecteur = pd.read_csv(chemin_brut, usecols=cols_gardees, chunksize=taille_bloc,
+                              dtype={col: types[col] for col in cols_gardees})
+        for i, bloc in enumerate(lecteur):
+            bloc = completer_valeurs(bloc)
+            nb_avant = len(bloc)
+
+            #Doublons de lignes complètes, puis de DR_NO
+            empreintes = pd.util.hash_pandas_object(bloc, index=False).to_numpy()
+            garder = lignes_vues.nouvelles(empreintes)
+            lignes_vues.ajouter(empreintes)
+            bloc = bloc[garder]
+            if 'DR_NO' in bloc.columns:
+                dr_no = pd.util.hash_pandas_object(bloc['DR_NO'], index=False).to_numpy()
+                garder = dr_no_vus.nouvelles(dr_no)
+                dr_no_vus.ajouter(dr_no[garder])
+                bloc = bloc[garder]
+            nb_doublons += nb_avant - len(bloc)
+
+            bloc = finaliser_bloc(bloc)
+            bloc.to_csv(chemin_tmp, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+            nb_ecrites += len(bloc)
+            if afficher:
+                print(f"   ✓ Bloc {i + 1} : {nb_ecrites:,} lignes écrites")
+        if not os.path.exists(chemin_tmp):
+            # Aucun bloc lu : fichier vide, avec les colonnes du fichier nettoyé
+            vide = pd.DataFrame({col: pd.Series(dtype=types[col]) for col in cols_gardees})
+            finaliser_bloc(completer_valeurs(vide)).to_csv(chemin_tmp, index=False)
+        os.replace(chemin_tmp, chemin_sortie)
+    finally:
+        if os.path.exists(chemin_tmp):
+            os.remove(chemin_tmp)
+
+    if afficher:
+        print(f"\n   ✓ {nb_doublons:,} doublons supprimés")
+        print(f"   ✓ Taille finale : {nb_ecrites:,} lignes")
+
+    return {
+        'lignes_lues': nb_lignes,
+        'lignes_ecrites': nb_ecrites,
+        'doublons': nb_doublons,
+        'colonnes_supprimees': cols_vides
+    }
@@ -0,0 +1,165 @@
+"""
+Incremental Append Mode
+=======================
+Adds the raw records whose ``DR_NO`` is not yet in the transformed dataset,
+without reprocessing the history:
+
+  - only the new rows go through the feature builders;
+  - the number of crimes per area is kept as running counts in a small
+    state file, so the area statistics (``area_crime_frequency``,
+    ``area_risk_score``, ``total_cases``, ``crimes_per_1000``) are looked up
+    instead of grouped over the whole table;
+  - stored rows are streamed once to refresh those four columns (their
+    values depend on the new totals) and the new rows are appended;
+  - the pivot tables are updated by adding the pivots of the new rows.
+
+The values are the same as a full run over the raw file; only the row
+order (new records come last) and the CSV text of integer columns that
+gain missing values ("12" vs "12.0") may differ.
+"""
+
+import os
+import json
+
+import pandas as pd
+
+from crime_pipeline.transformation import AREA_DEMOGRAPHICS, CrimeDataTransformer, build_aggregations
+
+AREA_COLUMNS = ['area_crime_frequency', 'area_risk_score', 'total_cases', 'crimes_per_1000']
+
+
+def state_path_for(transformed_path):
+    """Running-counts file stored next to the transformed dataset"""
+    return os.path.splitext(transformed_path)[0] + '.state.json'
+
+
+def count_by_area(df):
+    """Crimes per area, counted like the full pipeline (non-null DR_NO)"""
+    return df.groupby('AREA NAME')['DR_NO'].count()
+
+
+def load_area_counts(transformed_path, n_rows=None):
+    """
+    Running crimes per area.
+
+    Rebuilt from the stored dataset when no state file exists yet (e.g. a
+    dataset produced before the incremental mode) or when the state does
+    not match it: if ``n_rows`` (rows of the stored dataset) differs from
+    the count recorded with the state, the dataset was rewritten outside
+    the pipeline (e.g. by the transformation notebook).
+    """
+    path = state_path_for(transformed_path)
+    if os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+        if n_rows is None or state.get('n_rows') == n_rows:
+            return pd.Series(state['area_counts'], dtype='int64')
+    stored = pd.read_csv(transformed_path, usecols=['DR_NO', 'AREA NAME'])
+    return count_by_area(stored).astype('int64')
+
+
+def save_area_counts(transformed_path, area_counts, n_rows):
+    """Persist the running crimes per area"""
+    state = {
+        'area_counts': {area: int(count) for area, count in area_counts.items()},
+        'n_rows': int(n_rows)
+    }
+    with open(state_path_for(transformed_path), 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def area_statistics(area_counts, demographics=AREA_DEMOGRAPHICS):
+    """Area-level columns of the transformed data, from the running counts"""
+    stats = pd.DataFrame({'area_crime_frequency': area_counts})
+    stats['area_risk_score'] = (area_counts / area_counts.max() * 100).round(2)
+    stats['total_cases'] = area_counts
+    if demographics is not None:
+        population = demographics.set_index('AREA NAME')['population'].reindex(stats.index)
+        stats['crimes_per_1000'] = (area_counts / population * 1000).round(2)
+    return stats
+
+
+def append_new_records(raw, transformed_path, demographics=AREA_DEMOGRAPHICS, chunksize=200_000, verbose=True):
+    """
+    Transform the new raw records and merge them into the stored dataset.
+
+    Parameters:
+    -----------
+    raw : pd.DataFrame
+        Raw LAPD export (may overlap the records already processed)
+    transformed_path : str
+        Stored transformed CSV, updated in place
+    demographics : pd.DataFrame, optional
+        Area demographics merged into the new rows
+    chunksize : int
+        Rows per chunk when refreshing the stored rows
+    verbose : bool
+        Print progress
+
+    Returns:
+    --------
+    pd.DataFrame
+        The newly transformed rows (empty if nothing was new)
+    """
+    header = pd.read_csv(transformed_path, nrows=0).columns.tolist()
+    known = pd.read_csv(transformed_path, usecols=['DR_NO'])['DR_NO']
+    new_raw = raw[~raw['DR_NO'].isin(known)]
+    area_counts = load_area_counts(transformed_path, n_rows=len(known))
+    if verbose:
+        print(f"   ✓ {len(new_raw):,} new records ({len(raw) - len(new_raw):,} already processed)")
+    if new_raw.empty:
+        return new_raw
+
+    area_counts = area_counts.add(count_by_area(new_raw), fill_value=0).astype('int64')
+
+    transformer = CrimeDataTransformer(new_raw, demographics)
+    transformer.create_temporal_features()
+    transformer.create_crime_features()
+    transformer.create_demographic_features(area_counts=area_counts)
+    transformer.merge_supplementary_data(area_counts=area_counts)
+    new_rows = transformer.df.reindex(columns=header)
+
+    # Stored rows are kept as text, only their area columns change
+    stats = area_statistics(area_counts, demographics)
+    refreshed = [col for col in AREA_COLUMNS if col in header and col in stats.columns]
+    tmp_path = transformed_path + '.tmp'
+    try:
+        reader = pd.read_csv(transformed_path, dtype=str, keep_default_na=False, chunksize=chunksize)
+        for i, chunk in enumerate(reader):
+            for col in refreshed:
+                chunk[col] = chunk['AREA NAME'].map(stats[col])
+            chunk.to_csv(tmp_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        new_rows.to_csv(tmp_path, mode='a', header=False, index=False)
+        os.replace(tmp_path, transformed_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    save_area_counts(transformed_path, area_counts, len(known) + len(new_rows))
+    if verbose:
+        print(f"   ✓ {len(new_rows):,} rows appended to {transformed_path}")
+    return new_rows
+
+
+def update_aggregations(new_rows, pivot_area_time_path, pivot_category_year_path):
+    """
+    Add the pivots of the new rows to the stored pivot tables.
+
+    Returns:
+    --------
+    tuple
+        (crimes per area × time period, crimes per category × year)
+    """
+    new_area_time, new_category_year = build_aggregations(new_rows)
+
+    stored_area_time = pd.read_csv(pivot_area_time_path, index_col='AREA NAME')
+    stored_category_year = pd.read_csv(pivot_category_year_path, index_col='crime_category')
+    stored_category_year.columns = stored_category_year.columns.astype(new_category_year.columns.dtype)
+
+    pivots = []
+    for stored, new in [(stored_area_time, new_area_time), (stored_category_year, new_category_year)]:
+        combined = stored.add(new, fill_value=0).fillna(0).astype('int64')
+        combined = combined.sort_index().sort_index(axis=1)
+        combined.columns.name = new.columns.name
+        pivots.append(combined)
+    return tuple(pivots)
@@ -0,0 +1,280 @@
+"""
+Headless Data Pipeline
+======================
+Runs the notebook data preparation end to end, without Jupyter:
+
+  clean      raw CSV → Crime_Data_Cleaned.csv            (nettoyer_donnees_crime)
+  transform  raw CSV → Crime_Data_Transformed.csv        (CrimeDataTransformer)
+  aggregate  transformed data → Crime_Pivot_*.csv        (build_aggregations)
+  partition  transformed data → Crime_Data_Partitioned/  (year, optionally area)
+  database   transformed data → Crime_Data.sqlite        (indexed SQLite backend)
+  global_view transformed data → Crime_Global_View.pkl   (dashboard default view)
+
+As in the notebooks, the transformer works from the raw columns: the
+cleaned dataset is a separate, French-named deliverable.
+
+In incremental mode, transform and aggregate only process the raw records
+that are not yet in the transformed dataset (see crime_pipeline.incremental).
+The partitioned layout, the SQLite database and the global view are always
+rebuilt from the whole transformed dataset.
+With a chunk size, the clean stage streams the raw file instead of loading
+it (see nettoyer_donnees_crime_par_blocs).
+
+Each stage reports its wall time and its peak traced memory.
+"""
+
+import io
+import os
+import time
+import contextlib
+import tracemalloc
+
+import pandas as pd
+
+from crime_pipeline.cleaning import nettoyer_donnees_crime, nettoyer_donnees_crime_par_blocs
+from crime_pipeline.transformation import AREA_DEMOGRAPHICS, CrimeDataTransformer, build_aggregations
+from crime_pipeline.incremental import (append_new_records, count_by_area, save_area_counts,
+                                        update_aggregations)
+from dashboard.storage import apply_schema, read_transformed_csv
+from dashboard.global_view import GlobalView
+from dashboard.partitions import write_partitions
+from dashboard.sql_backend import build_database
+
+DATA_DIR = 'data'
+RAW_FILE = 'Crime_Data_from_2020_to_Present_50k.csv'
+CLEANED_FILE = 'Crime_Data_Cleaned.csv'
+TRANSFORMED_FILE = 'Crime_Data_Transformed.csv'
+PIVOT_AREA_TIME_FILE = 'Crime_Pivot_Area_Time.csv'
+PIVOT_CATEGORY_YEAR_FILE = 'Crime_Pivot_Category_Year.csv'
+GLOBAL_VIEW_FILE = 'Crime_Global_View.pkl'
+PARTITIONS_DIR = 'Crime_Data_Partitioned'
+DATABASE_FILE = 'Crime_Data.sqlite'
+
+STAGES = ['clean', 'transform', 'aggregate', 'partition', 'database', 'global_view']
+
+
+class StageReport:
+    """Wall time, peak memory and output size of one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.peak_mb = 0.0
+        self.rows = 0
+        self.outputs = []
+
+    def as_dict(self):
+        return {
+            'stage': self.name,
+            'seconds': round(self.seconds, 3),
+            'peak_mb': round(self.peak_mb, 1),
+            'rows': self.rows,
+            'outputs': self.outputs
+        }
+
+
+class CrimeDataPipeline:
+    """
+    Clean → transform → aggregate, with per-stage timings and peak memory.
+
+    Parameters:
+    -----------
+    data_dir : str
+        Directory holding the raw file and receiving the outputs
+    raw_path : str, optional
+        Raw CSV (defaults to the 50k extract in ``data_dir``)
+    verbose : bool
+        Print the notebook-style progress of each stage
+    incremental : bool
+        Only process the records not yet in the transformed dataset
+        (falls back to a full run when there is no dataset yet)
+    chunksize : int, optional
+        Clean the raw file in chunks of this many rows (bounded memory)
+    partition_by_area : bool
+        Split each year partition by area as well
+    """
+
+    def __init__(self, data_dir=DATA_DIR, raw_path=None, verbose=True, incremental=False, chunksize=None,
+                 partition_by_area=False):
+        self.data_dir = data_dir
+        self.raw_path = raw_path or os.path.join(data_dir, RAW_FILE)
+        self.verbose = verbose
+        self.incremental = incremental
+        self.chunksize = chunksize
+        self.partition_by_area = partition_by_area
+        self.reports = []
+        self._raw = None
+        self._transformed = None
+        self._typed = None
+        self._new_rows = None
+
+    def path(self, filename):
+        return os.path.join(self.data_dir, filename)
+
+    def raw(self):
+        """Raw dataset, read once and shared by the clean and transform stages"""
+        if self._raw is None:
+            if not os.path.exists(self.raw_path):
+                raise FileNotFoundError(f"Raw data not found: {self.raw_path}")
+            self._raw = pd.read_csv(self.raw_path)
+        return self._raw
+
+    def transformed(self):
+        """
+        Transformed dataset with the dashboard's typed schema, built once and
+        shared by the partition, database and global view stages.
+
+        When the transform stage ran in this process its frame is typed in
+        memory (same values as reading the CSV back); otherwise the stored
+        CSV is read.
+        """
+        if self._typed is None:
+            if self._transformed is not None:
+                self._typed = apply_schema(self._transformed.copy()).reset_index(drop=True)
+            else:
+                self._typed = read_transformed_csv(self.path(TRANSFORMED_FILE)).reset_index(drop=True)
+        return self._typed
+
+    def clean(self, report):
+        if self.chunksize:
+            if not os.path.exists(self.raw_path):
+                raise FileNotFoundError(f"Raw data not found: {self.raw_path}")
+            summary = nettoyer_donnees_crime_par_blocs(self.raw_path, self.path(CLEANED_FILE),
+                                                       taille_bloc=self.chunksize, afficher=self.verbose)
+            report.rows = summary['lignes_ecrites']
+            report.outputs.append(self.path(CLEANED_FILE))
+            return
+
+        df_clean = nettoyer_donnees_crime(self.raw(), afficher=self.verbose)
+        df_clean.to_csv(self.path(CLEANED_FILE), index=False)
+        report.rows = len(df_clean)
+        report.outputs.append(self.path(CLEANED_FILE))
+
+    def transform(self, report):
+        if self.incremental and os.path.exists(self.path(TRANSFORMED_FILE)):
+            if self.verbose:
+                print("=" * 80)
+                print("APPENDING NEW RECORDS (INCREMENTAL MODE)")
+                print("=" * 80)
+            self._new_rows = append_new_records(self.raw(), self.path(TRANSFORMED_FILE), AREA_DEMOGRAPHICS,
+                                                verbose=self.verbose)
+            report.rows = len(self._new_rows)
+            report.outputs.append(self.path(TRANSFORMED_FILE))
+            return
+
+        transformer = CrimeDataTransformer(self.raw(), AREA_DEMOGRAPHICS)
+        if self.verbose:
+            print("=" * 80)
+            print("EXECUTING AUTOMATED TRANSFORMATION PIPELINE")
+            print("=" * 80)
+        transformer.create_temporal_features()
+        transformer.create_crime_features()
+        transformer.create_demographic_features()
+        transformer.merge_supplementary_data()
+
+        self._transformed = transformer.df
+        self._transformed.to_csv(self.path(TRANSFORMED_FILE), index=False)
+        # Running counts for later incremental runs
+        save_area_counts(self.path(TRANSFORMED_FILE), count_by_area(self._transformed), len(self._transformed))
+        report.rows = len(self._transformed)
+        report.outputs.append(self.path(TRANSFORMED_FILE))
+
+    def aggregate(self, report):
+        pivot_paths = [self.path(PIVOT_AREA_TIME_FILE), self.path(PIVOT_CATEGORY_YEAR_FILE)]
+        if self._new_rows is not None and all(os.path.exists(p) for p in pivot_paths):
+            report.rows = len(self._new_rows)
+            if self._new_rows.empty:
+                return
+            pivot_area_time, pivot_category_year = update_aggregations(self._new_rows, *pivot_paths)
+            pivot_area_time.to_csv(pivot_paths[0])
+            pivot_category_year.to_csv(pivot_paths[1])
+            report.outputs.extend(pivot_paths)
+            return
+
+        df = self._transformed
+        if df is None:
+            df = pd.read_csv(self.path(TRANSFORMED_FILE), usecols=['DR_NO', 'AREA NAME', 'time_period',
+                                                                     'crime_category', 'year'])
+        pivot_area_time, pivot_category_year = build_aggregations(df)
+        pivot_area_time.to_csv(self.path(PIVOT_AREA_TIME_FILE))
+        pivot_category_year.to_csv(self.path(PIVOT_CATEGORY_YEAR_FILE))
+        report.rows = len(df)
+        report.outputs.extend([self.path(PIVOT_AREA_TIME_FILE), self.path(PIVOT_CATEGORY_YEAR_FILE)])
+
+    def partition(self, report):
+        # Same typed schema as the dashboard snapshot
+        df = self.transformed()
+        if self.verbose:
+            print("=" * 80)
+            print("WRITING THE PARTITIONED DATASET")
+            print("=" * 80)
+        manifest = write_partitions(df, self.path(PARTITIONS_DIR), by_area=self.partition_by_area)
+        if self.verbose:
+            print(f"✅ {len(manifest.partitions)} partitions ({' / '.join(manifest.partition_by)}) "
+                  f"for {manifest.rows():,} records")
+        report.rows = manifest.rows()
+        report.outputs.append(self.path(PARTITIONS_DIR))
+
+    def database(self, report):
+        # Same typed schema as the dashboard snapshot
+        df = self.transformed()
+        if self.verbose:
+            print("=" * 80)
+            print("BUILDING THE SQLITE BACKEND")
+            print("=" * 80)
+        report.rows = build_database(df, self.path(DATABASE_FILE))
+        if self.verbose:
+            print(f"✅ {report.rows:,} records indexed in {self.path(DATABASE_FILE)}")
+        report.outputs.append(self.path(DATABASE_FILE))
+
+    def global_view(self, report):
+        # Dashboard schema: the artefact must match the data the dashboard loads
+        df = self.transformed()
+        if self.verbose:
+            print("=" * 80)
+            print("PRECOMPUTING THE DASHBOARD DEFAULT VIEW")
+            print("=" * 80)
+        view = GlobalView.build(df)
+        view.save(self.path(GLOBAL_VIEW_FILE))
+        if self.verbose:
+            print(f"✅ {len(view.entries)} aggregations saved for {len(df):,} records")
+        report.rows = len(df)
+        report.outputs.append(self.path(GLOBAL_VIEW_FILE))
+
+    def run(self, stages=STAGES):
+        """
+        Run the requested stages in pipeline order.
+
+        Returns:
+        --------
+        list of StageReport
+        """
+        unknown = [stage for stage in stages if stage not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(unknown)} (expected {', '.join(STAGES)})")
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        for stage in [s for s in STAGES if s in stages]:
+            report = StageReport(stage)
+            tracemalloc.start()
+            start = time.perf_counter()
+            # The notebook code prints unconditionally: silence it in quiet mode
+            output = contextlib.nullcontext() if self.verbose else contextlib.redirect_stdout(io.StringIO())
+            try:
+                with output:
+                    getattr(self, stage)(report)
+            finally:
+                report.seconds = time.perf_counter() - start
+                report.peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                tracemalloc.stop()
+            self.reports.append(report)
+        return self.reports
+
+
+def run_pipeline(stages=STAGES, data_dir=DATA_DIR, raw_path=None, verbose=True, incremental=False,
+                 chunksize=None, partition_by_area=False):
+    """Run the pipeline and return one report dict per stage"""
+    pipeline = CrimeDataPipeline(data_dir=data_dir, raw_path=raw_path, verbose=verbose,
+                                 incremental=incremental, chunksize=chunksize,
+                                 partition_by_area=partition_by_area)
+    return [report.as_dict() for report in pipeline.run(stages)]
@@ -0,0 +1,386 @@
+"""
+Feature Engineering
+===================
+``CrimeDataTransformer`` from notebooks/data_transformation.ipynb, plus the
+area demographics it merges and the pivot tables exported next to the
+transformed dataset.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Area demographics merged into the transformed data (column names are the
+# ones read by the dashboard)
+AREA_DEMOGRAPHICS = pd.DataFrame({
+    'AREA NAME': ['Central', 'Rampart', 'Southwest', 'Hollenbeck', 'Harbor',
+                  'Hollywood', 'Wilshire', 'West LA', 'Van Nuys', 'West Valley',
+                  'Northeast', '77th Street', 'Newton', 'Pacific', 'N Hollywood',
+                  'Foothill', 'Devonshire', 'Southeast', 'Mission', 'Olympic',
+                  'Topanga'],
+    'population': [54000, 61000, 58000, 52000, 46000,
+                   78000, 72000, 65000, 68000, 70000,
+                   55000, 51000, 49000, 47000, 64000,
+                   60000, 62000, 53000, 59000, 66000, 48000],
+    'median_income': [45000, 38000, 42000, 35000, 52000,
+                      68000, 85000, 95000, 55000, 62000,
+                      48000, 32000, 30000, 75000, 50000,
+                      58000, 72000, 36000, 44000, 52000, 88000],
+    'area_size_sq_miles': [5.2, 6.8, 7.1, 6.3, 8.5,
+                           7.9, 6.4, 5.8, 9.2, 10.1,
+                           6.7, 8.3, 5.9, 7.5, 8.8,
+                           9.5, 11.2, 7.7, 8.9, 6.2, 12.5]
+})
+
+
+def build_aggregations(df):
+    """
+    Pivot tables exported with the transformed data.
+    
+    Returns:
+    --------
+    tuple
+        (crimes per area × time period, crimes per category × year)
+    """
+    pivot_area_time = df.pivot_table(
+        values='DR_NO',
+        index='AREA NAME',
+        columns='time_period',
+        aggfunc='count',
+        fill_value=0
+    )
+    
+    pivot_category_year = df.pivot_table(
+        values='DR_NO',
+        index='crime_category',
+        columns='year',
+        aggfunc='count',
+        fill_value=0
+    )
+    return pivot_area_time, pivot_category_year
+
+
+class CrimeDataTransformer:
+    """
+    Automated pipeline for transforming crime data.
+    Applies all transformation steps in a reproducible manner.
+    """
+    
+    def __init__(self, df, demographics_df=None):
+        """
+        Initialize the transformer with data.
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Raw crime data
+        demographics_df : pd.DataFrame, optional
+            Area demographics data for merging
+        """
+        self.df = df.copy()
+        self.demographics_df = demographics_df
+        self.transformed_df = None
+        
+    def create_temporal_features(self):
+        """Create datetime-based features"""
+        print("[1/6] Creating temporal features...")
+        
+        # Convert dates
+        self.df['Date Rptd'] = pd.to_datetime(self.df['Date Rptd'], errors='coerce')
+        self.df['DATE OCC'] = pd.to_datetime(self.df['DATE OCC'], errors='coerce')
+        
+        # Extract features
+        self.df['year'] = self.df['DATE OCC'].dt.year
+        self.df['month'] = self.df['DATE OCC'].dt.month
+        self.df['month_name'] = self.df['DATE OCC'].dt.month_name()
+        self.df['day_of_week'] = self.df['DATE OCC'].dt.dayofweek
+        self.df['day_name'] = self.df['DATE OCC'].dt.day_name()
+        self.df['quarter'] = self.df['DATE OCC'].dt.quarter
+        
+        # Time period
+        self.df['hour'] = (self.df['TIME OCC'] // 100).astype(int)
+        self.df['time_period'] = self._bucket_time_period(self.df['hour'])
+        
+        # Weekend flag
+        self.df['is_weekend'] = (self.df['day_of_week'] >= 5).astype(int)
+        
+        # Reporting delay
+        self.df['reporting_delay_days'] = (self.df['Date Rptd'] - self.df['DATE OCC']).dt.days
+        
+        print("   ✓ Temporal features created")
+        return self
+    
+    def create_crime_features(self):
+        """Create crime categorization features"""
+        print("[2/6] Creating crime features...")
+        
+        # Crime severity
+        self.df['crime_severity'] = self.df['Part 1-2'].map({
+            1: 'Part 1 - Serious Crime',
+            2: 'Part 2 - Less Serious Crime'
+        })
+        
+        # Crime category
+        self.df['crime_category'] = self._map_distinct(self.df['Crm Cd Desc'], self._categorize_crime)
+        
+        # Weapon features
+        weapon_desc = self.df['Weapon Desc']
+        self.df['weapon_involved'] = (weapon_desc.notna() & (weapon_desc != '')).astype(int)
+        self.df['weapon_category'] = self._map_distinct(weapon_desc, self._categorize_weapon)
+        
+        print("   ✓ Crime features created")
+        return self
+    
+    def create_demographic_features(self, area_counts=None):
+        """
+        Create victim and location features
+        
+        Parameters:
+        -----------
+        area_counts : pd.Series, optional
+            Running number of crimes per area (incremental mode). When given,
+            the area statistics are looked up from it instead of being
+            grouped over the processed rows only.
+        """
+        print("[3/6] Creating demographic features...")
+        
+        # Age groups
+        self.df['victim_age_group'] = self._bucket_age(self.df['Vict Age'])
+        
+        # Location types
+        self.df['location_type'] = self._map_distinct(self.df['Premis Desc'], self._categorize_location)
+        
+        # Area statistics
+        if area_counts is None:
+            self.df['area_crime_frequency'] = self.df.groupby('AREA NAME')['DR_NO'].transform('count')
+            max_freq = self.df['area_crime_frequency'].max()
+        else:
+            self.df['area_crime_frequency'] = self.df['AREA NAME'].map(area_counts)
+            max_freq = area_counts.max()
+        self.df['area_risk_score'] = (self.df['area_crime_frequency'] / max_freq * 100).round(2)
+        
+        print("   ✓ Demographic features created")
+        return self
+    
+    def merge_supplementary_data(self, area_counts=None):
+        """
+        Merge with supplementary datasets
+        
+        Parameters:
+        -----------
+        area_counts : pd.Series, optional
+            Running number of crimes per area (incremental mode), used for
+            ``total_cases`` instead of a groupby over the processed rows
+        """
+        print("[4/6] Merging supplementary data...")
+        
+        if self.demographics_df is not None:
+            self.df = self.df.merge(self.demographics_df, on='AREA NAME', how='left')
+            
+            # Calculate derived metrics
+            if 'population' in self.df.columns and area_counts is not None:
+                self.df['total_cases'] = self.df['AREA NAME'].map(area_counts)
+                self.df['crimes_per_1000'] = (
+                    self.df['total_cases'] / self.df['population'] * 1000
+                ).round(2)
+            elif 'population' in self.df.columns:
+                resolution_stats = self.df.groupby('AREA NAME').agg({
+                    'DR_NO': 'count'
+                }).reset_index()
+                resolution_stats.columns = ['AREA NAME', 'total_cases']
+                
+                self.df = self.df.merge(resolution_stats, on='AREA NAME', how='left')
+                self.df['crimes_per_1000'] = (
+                    self.df['total_cases'] / self.df['population'] * 1000
+                ).round(2)
+            
+            print("   ✓ Supplementary data merged")
+        else:
+            print("   ⚠ No supplementary data provided, skipping merge")
+        
+        return self
+    
+    def apply_filters(self, conditions=None):
+        """Apply custom filters if provided"""
+        print("[5/6] Applying filters...")
+        
+        if conditions is not None:
+            initial_len = len(self.df)
+            for condition_name, condition in conditions.items():
+                self.df = self.df[condition(self.df)]
+            print(f"   ✓ Filters applied: {initial_len:,} → {len(self.df):,} rows")
+        else:
+            print("   ⚠ No filters provided, skipping")
+        
+        return self
+    
+    def create_aggregations(self):
+        """Create useful aggregated views"""
+        print("[6/6] Creating aggregations...")
+        
+        # Store original transformed data
+        self.transformed_df = self.df.copy()
+        
+        # Create pivot tables for analysis
+        self.pivot_area_time, self.pivot_category_year = build_aggregations(self.df)
+        
+        print("   ✓ Aggregations created")
+        return self
+    
+    def transform(self, verbose=True):
+        """Execute full transformation pipeline"""
+        if verbose:
+            print("=" * 80)
+            print("EXECUTING AUTOMATED TRANSFORMATION PIPELINE")
+            print("=" * 80)
+            print(f"Initial shape: {self.df.shape}\n")
+        
+        self.create_temporal_features()
+        self.create_crime_features()
+        self.create_demographic_features()
+        self.merge_supplementary_data()
+        self.create_aggregations()
+        
+        if verbose:
+            print("\n" + "=" * 80)
+            print("TRANSFORMATION COMPLETED")
+            print("=" * 80)
+            print(f"Final shape: {self.df.shape}")
+            print(f"New features added: {len(self.df.columns) - len(self.transformed_df.columns) if self.transformed_df is not None else 'N/A'}")
+        
+        return self.df
+    
+    @staticmethod
+    def _map_distinct(series, categorize):
+        """
+        Apply a row-wise categorizer once per distinct value.
+        
+        Descriptions repeat heavily (a few hundred distinct values for
+        hundreds of thousands of rows), so each one is categorized once and
+        the labels are mapped back through the factorized codes.
+        """
+        codes, uniques = pd.factorize(series)
+        # Code -1 (missing value) picks the last label
+        labels = np.array([categorize(value) for value in uniques] + [categorize(np.nan)], dtype=object)
+        return pd.Series(labels[codes], index=series.index)
+    
+    @staticmethod
+    def _bucket_time_period(hours):
+        """Vectorized equivalent of _get_time_period"""
+        labels = np.select(
+            [hours.isna(),
+             (hours >= 0) & (hours < 6),
+             (hours >= 6) & (hours < 12),
+             (hours >= 12) & (hours < 18)],
+            ['Unknown',
+             'Late Night (00:00-05:59)',
+             'Morning (06:00-11:59)',
+             'Afternoon (12:00-17:59)'],
+            default='Evening (18:00-23:59)'
+        )
+        return pd.Series(labels, index=hours.index, dtype=object)
+    
+    @staticmethod
+    def _bucket_age(ages):
+        """Vectorized equivalent of _categorize_age"""
+        labels = np.select(
+            [ages.isna() | (ages == 0),
+             ages < 13,
+             ages < 18,
+             ages < 25,
+             ages < 35,
+             ages < 50,
+             ages < 65],
+            ['Unknown',
+             'Child (0-12)',
+             'Teen (13-17)',
+             'Young Adult (18-24)',
+             'Adult (25-34)',
+             'Middle Age (35-49)',
+             'Senior (50-64)'],
+            default='Elderly (65+)'
+        )
+        return pd.Series(labels, index=ages.index, dtype=object)
+    
+    @staticmethod
+    def _get_time_period(hour):
+        if pd.isna(hour):
+            return 'Unknown'
+        elif 0 <= hour < 6:
+            return 'Late Night (00:00-05:59)'
+        elif 6 <= hour < 12:
+            return 'Morning (06:00-11:59)'
+        elif 12 <= hour < 18:
+            return 'Afternoon (12:00-17:59)'
+        else:
+            return 'Evening (18:00-23:59)'
+    
+    @staticmethod
+    def _categorize_crime(description):
+        if pd.isna(description):
+            return 'Unknown'
+        desc = str(description).upper()
+        if any(w in desc for w in ['ASSAULT', 'BATTERY', 'HOMICIDE', 'MURDER', 'RAPE']):
+            return 'Violent Crime'
+        elif any(w in desc for w in ['THEFT', 'BURGLARY', 'ROBBERY', 'STOLEN', 'SHOPLIFTING']):
+            return 'Property Crime'
+        elif any(w in desc for w in ['VEHICLE', 'AUTO', 'CAR']):
+            return 'Vehicle-Related'
+        elif any(w in desc for w in ['FRAUD', 'IDENTITY', 'FORGERY']):
+            return 'Fraud/Financial'
+        elif 'VANDALISM' in desc:
+            return 'Vandalism'
+        elif any(w in desc for w in ['DRUG', 'NARCOTIC']):
+            return 'Drug-Related'
+        else:
+            return 'Other'
+    
+    @staticmethod
+    def _categorize_weapon(weapon_desc):
+        if pd.isna(weapon_desc) or weapon_desc == '':
+            return 'No Weapon'
+        weapon_str = str(weapon_desc).upper()
+        if any(w in weapon_str for w in ['GUN', 'FIREARM', 'PISTOL', 'REVOLVER']):
+            return 'Firearm'
+        elif any(w in weapon_str for w in ['KNIFE', 'BLADE']):
+            return 'Blade/Knife'
+        elif 'STRONG-ARM' in weapon_str or 'HANDS' in weapon_str:
+            return 'Physical Force'
+        else:
+            return 'Other Weapon'
+    
+    @staticmethod
+    def _categorize_age(age):
+        if pd.isna(age) or age == 0:
+            return 'Unknown'
+        elif age < 13:
+            return 'Child (0-12)'
+        elif 13 <= age < 18:
+            return 'Teen (13-17)'
+        elif 18 <= age < 25:
+            return 'Young Adult (18-24)'
+        elif 25 <= age < 35:
+            return 'Adult (25-34)'
+        elif 35 <= age < 50:
+            return 'Middle Age (35-49)'
+        elif 50 <= age < 65:
+            return 'Senior (50-64)'
+        else:
+            return 'Elderly (65+)'
+    
+    @staticmethod
+    def _categorize_location(premise_desc):
+        if pd.isna(premise_desc):
+            return 'Unknown'
+        premise_str = str(premise_desc).upper()
+        if any(w in premise_str for w in ['STREET', 'SIDEWALK', 'ALLEY']):
+            return 'Public Street'
+        elif any(w in premise_str for w in ['DWELLING', 'RESIDENCE', 'HOUSE', 'APARTMENT']):
+            return 'Residential'
+        elif any(w in premise_str for w in ['STORE', 'SHOP', 'MARKET', 'MALL']):
+            return 'Commercial'
+        elif any(w in premise_str for w in ['PARKING', 'GARAGE']):
+            return 'Parking Area'
+        elif any(w in premise_str for w in ['SCHOOL', 'UNIVERSITY']):
+            return 'Educational'
+        else:
+            return 'Other'
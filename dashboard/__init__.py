@@ -0,0 +1,6 @@
+"""
+Moteur de données du Tableau de Bord de la Criminalité
+======================================================
+Modules utilisés par ``streamlit_app.py`` pour charger, filtrer et agréger
+les données transformées sans dépendre de Streamlit.
+"""
@@ -0,0 +1,78 @@
+"""
+Calculs des onglets du tableau de bord
+======================================
+Agrégations sur les lignes filtrées utilisées par ``streamlit_app.py``
+(KPIs, statistiques par zone, âge des victimes, armes, corrélations).
+Elles ne dépendent pas de Streamlit : le banc d'essai (``benchmarks``) les
+chronomètre telles que le tableau de bord les exécute. Les taux par groupe
+passent par les noyaux ``bincount`` de ``dashboard.kernels``.
+"""
+
+from dashboard.kernels import grouped_rate
+from dashboard.rollups import MONTH_END
+
+# Granularités de la série temporelle : fréquence pandas et fenêtre de la moyenne mobile
+TIME_GRANULARITIES = {
+    "Quotidien": ('D', 7),
+    "Hebdomadaire": ('W', 4),
+    "Mensuel": (MONTH_END, 3)
+}
+
+# Variables de la matrice de corrélation (onglet 6)
+CORR_VARS = ['Vict Age', 'weapon_involved', 'is_weekend', 'reporting_delay_days',
+             'area_risk_score', 'population', 'median_income', 'crimes_per_1000', 'hour']
+
+
+def by_frequency(counts):
+    """Trie des comptages par fréquence décroissante (comme value_counts)"""
+    return counts.sort_values(ascending=False, kind='stable')
+
+
+def compute_kpis(rows):
+    """Âge moyen, taux d'armes et délai moyen de signalement (KPIs)"""
+    avg_victim_age = rows['Vict Age'].mean()
+    weapon_rate = (rows['weapon_involved'].sum() / len(rows) * 100) if len(rows) > 0 else 0
+    avg_delay = rows['reporting_delay_days'].mean() if 'reporting_delay_days' in rows.columns else 0
+    return avg_victim_age, weapon_rate, avg_delay
+
+
+def compute_area_stats(rows):
+    """Statistiques par zone (onglet 2)"""
+    area_stats = rows.groupby('AREA NAME', observed=True).agg({
+        'DR_NO': 'count',
+        'area_risk_score': 'mean',
+        'population': 'first',
+        'median_income': 'first'
+    })
+    # Score stocké en float32 : arrondi en float64 pour un affichage net
+    area_stats = area_stats.astype({'area_risk_score': 'float64'}).round(2)
+    area_stats.columns = ['Crimes', 'Score Risque', 'Population', 'Revenu']
+    return area_stats.sort_values('Crimes', ascending=False).head(10)
+
+
+def compute_time_series(rollup, criteria, time_agg):
+    """Série temporelle selon la granularité choisie, depuis les comptages quotidiens (onglet 3)"""
+    freq, window = TIME_GRANULARITIES[time_agg]
+    return rollup.series(criteria, freq), window
+
+
+def compute_area_weapon(rows, areas):
+    """Taux d'implication d'armes par zone (onglet 5), limité aux zones ``areas``"""
+    rates = grouped_rate(rows['AREA NAME'], rows['weapon_involved'])
+    return by_frequency(rates[rates.index.isin(areas)])
+
+
+def compute_correlation(rows, corr_vars):
+    """Matrice de corrélation (onglet 6)"""
+    return rows[list(corr_vars)].corr()
+
+
+def compute_area_data(rows):
+    """Crimes, population et revenu par zone (onglet 6)"""
+    area_data = rows.groupby('AREA NAME', observed=True).agg({
+        'DR_NO': 'count',
+        'population': 'first',
+        'median_income': 'first'
+    }).reset_index()
+    area_data['crime_rate'] = area_data['DR_NO'] / area_data['population'] * 1000
+    return area_data
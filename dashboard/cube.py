@@ -0,0 +1,151 @@
+"""
+Cube de comptages dimensionnel
+==============================
+Comptages d'incidents précalculés au chargement, sous forme de tableaux NumPy
+denses : les dimensions de filtre (année, zone, catégorie, moment de la
+journée, armes) croisées avec les axes des graphiques (jour × heure, mois,
+tranche d'âge, âge exact, genre, gravité, type de crime, catégorie d'arme).
+
+Filtrer puis compter revient à découper le cube et sommer les axes inutiles :
+le coût ne dépend plus du nombre d'incidents.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import FILTER_COLUMNS
+
+# Axes des graphiques, regroupés par cube (chaque cube inclut les filtres)
+CUBE_AXES = [
+    ('day_name', 'hour'),
+    ('month',),
+    ('victim_age_group',),
+    # Histogramme de l'âge par cellule de filtre (une case par année d'âge)
+    ('Vict Age',),
+    ('Vict Sex',),
+    ('crime_severity',),
+    ('Crm Cd Desc',),
+    ('weapon_category',),
+]
+
+
+class CountCube:
+    """
+    Cubes de comptages sur les dimensions de filtre et les axes des graphiques.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Données transformées
+    dimensions : list, optional
+        Dimensions de filtre (communes à tous les cubes)
+    axes : list, optional
+        Groupes d'axes de graphiques, un cube par groupe
+    """
+
+    def __init__(self, df, dimensions=FILTER_COLUMNS, axes=CUBE_AXES):
+        self.dimensions = list(dimensions)
+        self._values = {}
+        self._codes = {}
+
+        columns = list(self.dimensions)
+        for group in axes:
+            columns.extend(col for col in group if col in df.columns and col not in columns)
+
+        for col in columns:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            self._codes[col] = codes
+            self._values[col] = pd.Index(uniques).tolist()
+
+        # Cube de base (filtres seuls) puis un cube par groupe d'axes
+        self._cubes = {(): self._build(())}
+        for group in axes:
+            if all(col in self._codes for col in group):
+                self._cubes[tuple(group)] = self._build(tuple(group))
+
+        # Les codes ne servent qu'à la construction
+        del self._codes
+
+    def _build(self, group):
+        """Comptage vectorisé (bincount) sur les dimensions + axes du groupe"""
+        columns = self.dimensions + list(group)
+        shape = tuple(len(self._values[col]) for col in columns)
+        codes = [self._codes[col] for col in columns]
+
+        # Les lignes sans valeur sur l'un des axes ne sont pas comptées
+        valid = np.logical_and.reduce([c >= 0 for c in codes])
+        flat = np.ravel_multi_index([c[valid] for c in codes], shape)
+        counts = np.bincount(flat, minlength=int(np.prod(shape)))
+
+        dtype = np.int32 if counts.max(initial=0) < np.iinfo(np.int32).max else np.int64
+        cube = counts.astype(dtype).reshape(shape)
+        cube.flags.writeable = False
+        return cube
+
+    def values(self, column):
+        """Valeurs triées d'un axe du cube"""
+        return list(self._values[column])
+
+    def counts(self, criteria, by, drop_empty=True):
+        """
+        Comptages pour une sélection, ventilés selon un ou deux axes.
+
+        Parameters:
+        -----------
+        criteria : dict
+            {dimension de filtre: valeurs acceptées}
+        by : str or tuple
+            Axe(s) de ventilation (dimension de filtre ou axe de graphique)
+        drop_empty : bool
+            Retire les modalités sans incident (comme value_counts / crosstab)
+
+        Returns:
+        --------
+        pd.Series (un axe) ou pd.DataFrame (deux axes : index × colonnes)
+        """
+        by = (by,) if isinstance(by, str) else tuple(by)
+        extra = tuple(col for col in by if col not in self.dimensions)
+        cube, group = self._cube_for(extra)
+        columns = self.dimensions + list(group)
+
+        # Découpage : on ne garde que les valeurs sélectionnées de chaque filtre
+        for axis, col in enumerate(self.dimensions):
+            if col not in criteria:
+                continue
+            lookup = {value: code for code, value in enumerate(self._values[col])}
+            wanted = sorted({lookup[v] for v in criteria[col] if v in lookup})
+            if len(wanted) < len(lookup):
+                cube = np.take(cube, wanted, axis=axis)
+
+        # Somme sur tous les axes hors ventilation, puis ordre demandé
+        keep = [columns.index(col) for col in by]
+        summed = cube.sum(axis=tuple(i for i in range(cube.ndim) if i not in keep), dtype=np.int64)
+        summed = np.transpose(summed, [sorted(keep).index(i) for i in keep])
+
+        labels = []
+        for col in by:
+            values = self._values[col]
+            if col in criteria and col in self.dimensions:
+                accepted = set(criteria[col])
+                values = [v for v in values if v in accepted]
+            labels.append(pd.Index(values, name=col))
+
+        if len(by) == 1:
+            result = pd.Series(summed, index=labels[0], name='count')
+            return result[result > 0] if drop_empty else result
+
+        result = pd.DataFrame(summed, index=labels[0], columns=labels[1])
+        if drop_empty:
+            result = result.loc[result.sum(axis=1) > 0, result.sum(axis=0) > 0]
+        return result
+
+    def total(self, criteria):
+        """Nombre total d'incidents d'une sélection"""
+        return int(self.counts(criteria, self.dimensions[0]).sum())
+
+    def _cube_for(self, extra):
+        """Premier cube contenant les axes de graphique demandés"""
+        for group, cube in self._cubes.items():
+            if set(extra) <= set(group):
+                return cube, group
+        raise KeyError(f"Aucun cube ne couvre les axes {extra}")
@@ -0,0 +1,170 @@
+"""
+Export des données filtrées
+===========================
+Le fichier n'est produit que lorsqu'un téléchargement est demandé, jamais à
+chaque exécution du script. Les lignes retenues sont lues par blocs et
+écrites directement dans le format choisi :
+
+  - CSV compressé (gzip) : chaque bloc est sérialisé puis compressé, seul
+    le fichier compressé est gardé en mémoire ;
+  - Parquet : un groupe de lignes par bloc (``pyarrow``) ;
+  - Excel : classeur ``openpyxl`` en écriture seule, ligne à ligne.
+
+Le résultat est mémorisé par l'appelant sous l'empreinte des filtres (voir
+``AggregateCache``) : retélécharger la même vue ne coûte rien.
+"""
+
+import io
+import gzip
+
+CHUNK_ROWS = 50_000
+
+# Niveau de compression gzip : celui de l'outil gzip, nettement plus rapide que
+# le maximum (9) pour un fichier à peine plus gros
+GZIP_LEVEL = 6
+
+# Budget du cache des fichiers exportés (Mo)
+DEFAULT_EXPORT_BUDGET_MB = 128
+
+# Limite d'une feuille Excel (en-tête compris)
+EXCEL_MAX_ROWS = 1_048_576
+
+EXPORT_FORMATS = {
+    'CSV (gzip)': {
+        'extension': 'csv.gz',
+        'mime': 'application/gzip'
+    },
+    'Parquet': {
+        'extension': 'parquet',
+        'mime': 'application/vnd.apache.parquet'
+    },
+    'Excel': {
+        'extension': 'xlsx',
+        'mime': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    }
+}
+
+
+def iter_chunks(df, positions=None, chunk_rows=CHUNK_ROWS):
+    """
+    Parcourt les lignes retenues par blocs, sans copier toute la sélection.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Données complètes
+    positions : np.ndarray, optional
+        Positions des lignes retenues (toutes si None)
+    chunk_rows : int
+        Nombre de lignes par bloc
+    """
+    n_rows = len(df) if positions is None else len(positions)
+    for start in range(0, n_rows, chunk_rows):
+        if positions is None:
+            yield df.iloc[start:start + chunk_rows]
+        else:
+            yield df.take(positions[start:start + chunk_rows])
+
+
+def write_csv_gzip(chunks, buffer):
+    """CSV compressé, bloc par bloc"""
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=GZIP_LEVEL) as archive:
+        text = io.TextIOWrapper(archive, encoding='utf-8', newline='')
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(text, index=False, header=(i == 0))
+        # Rend l'archive sans la fermer : GzipFile écrit lui-même sa fin
+        text.flush()
+        text.detach()
+
+
+def parquet_schema(df):
+    """
+    Schéma Arrow commun à tous les blocs.
+
+    Le type d'une colonne texte ne peut pas être déduit d'un bloc où elle est
+    entièrement vide : les colonnes ``object`` sont déclarées en chaînes.
+    """
+    import pyarrow as pa
+
+    schema = pa.Schema.from_pandas(df.head(0), preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+    return schema
+
+
+def write_parquet(chunks, buffer, schema):
+    """Parquet, un groupe de lignes par bloc"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    with pq.ParquetWriter(buffer, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def excel_values(chunk):
+    """Lignes d'un bloc en valeurs Python (cellules vides pour les manquants)"""
+    # Un float32 converti tel quel donne 34.01409912109375 : on repasse par
+    # sa représentation décimale la plus courte (34.0141)
+    shortest = {col: chunk[col].astype(str).astype('float64') for col in chunk.columns if chunk[col].dtype == 'float32'}
+    values = chunk.assign(**shortest).astype(object) if shortest else chunk.astype(object)
+    values = values.where(values.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def write_excel(chunks, buffer, columns):
+    """Classeur Excel en écriture seule (les lignes ne sont pas gardées en mémoire)"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Crimes')
+    sheet.append(list(columns))
+    for chunk in chunks:
+        for row in excel_values(chunk):
+            sheet.append(row)
+    workbook.save(buffer)
+
+
+def export_rows(df, fmt, positions=None, chunk_rows=CHUNK_ROWS):
+    """
+    Produit le fichier d'export des lignes retenues.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Données complètes
+    fmt : str
+        Clé de ``EXPORT_FORMATS``
+    positions : np.ndarray, optional
+        Positions des lignes retenues (toutes si None)
+    chunk_rows : int
+        Nombre de lignes lues et écrites à la fois
+
+    Returns:
+    --------
+    bytes
+        Contenu du fichier
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu : {fmt}")
+
+    if fmt == 'Excel':
+        n_rows = len(df) if positions is None else len(positions)
+        if n_rows > EXCEL_MAX_ROWS - 1:
+            raise ValueError(f"Excel est limité à {EXCEL_MAX_ROWS - 1:,} lignes ({n_rows:,} demandées)")
+
+    buffer = io.BytesIO()
+    chunks = iter_chunks(df, positions, chunk_rows)
+    if fmt == 'CSV (gzip)':
+        write_csv_gzip(chunks, buffer)
+    elif fmt == 'Parquet':
+        write_parquet(chunks, buffer, parquet_schema(df))
+    else:
+        write_excel(chunks, buffer, df.columns)
+    return buffer.getvalue()
+
+
+def export_file_name(fmt, timestamp):
+    """Nom du fichier téléchargé"""
+    return f"crimes_LA_filtres_{timestamp}.{EXPORT_FORMATS[fmt]['extension']}"
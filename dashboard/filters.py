@@ -0,0 +1,173 @@
+"""
+Index bitmap des filtres de la barre latérale
+=============================================
+Construit une seule fois par version des données : pour chaque dimension de
+filtre (année, zone, catégorie, moment de la journée, armes), un bitmap
+compressé (``np.packbits``) par valeur distincte.
+
+Une sélection devient alors quelques OU/ET bit à bit sur des tableaux
+précalculés, et les lignes ne sont extraites qu'une fois, à la demande.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ['year', 'AREA NAME', 'crime_category', 'time_period', 'weapon_involved']
+
+# Nombre de bits à 1 pour chaque octet possible
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def filter_state_key(criteria, *extra):
+    """
+    Empreinte canonique d'un état des filtres.
+
+    L'ordre des valeurs sélectionnées et leur type (int NumPy ou Python)
+    n'influent pas sur la clé ; ``extra`` ajoute des éléments de contexte
+    (version des données, options d'affichage...).
+    """
+    canonical = {
+        'criteria': {col: sorted(str(v) for v in values) for col, values in criteria.items()},
+        'extra': [str(item) for item in extra]
+    }
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def popcount(bits):
+    """Nombre de bits à 1 dans un bitmap compressé"""
+    return int(_POPCOUNT[bits].sum(dtype=np.int64))
+
+
+class FilterIndex:
+    """
+    Index bitmap des dimensions de filtre d'un DataFrame.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Données transformées (non modifiées par l'index)
+    columns : list, optional
+        Dimensions de filtre à indexer
+    """
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.df = df
+        self.n_rows = len(df)
+        self._bitmaps = {}
+        self._values = {}
+        self._counts = {}
+        self._valid = {}
+
+        for col in columns:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            values = pd.Index(uniques).tolist()
+            bitmaps = [self._freeze(np.packbits(codes == k)) for k in range(len(values))]
+
+            self._values[col] = values
+            self._bitmaps[col] = dict(zip(values, bitmaps))
+            self._counts[col] = pd.Series([popcount(b) for b in bitmaps], index=values, name='count')
+
+            # Lignes sans valeur : exclues par isin(), donc exclues ici aussi
+            self._valid[col] = self._freeze(np.packbits(codes >= 0)) if (codes < 0).any() else None
+
+    @staticmethod
+    def _freeze(bits):
+        bits.flags.writeable = False
+        return bits
+
+    def values(self, column):
+        """Valeurs distinctes triées d'une dimension"""
+        return list(self._values[column])
+
+    def value_counts(self, column):
+        """Nombre de lignes par valeur d'une dimension (précalculé)"""
+        return self._counts[column].copy()
+
+    def select(self, criteria):
+        """
+        Combine les bitmaps pour une sélection.
+
+        Parameters:
+        -----------
+        criteria : dict
+            {dimension: valeurs acceptées}
+
+        Returns:
+        --------
+        Selection
+        """
+        bits = None
+        for col, selected in criteria.items():
+            col_bits = self._column_bits(col, selected)
+            if col_bits is None:
+                continue
+            bits = col_bits if bits is None else np.bitwise_and(bits, col_bits)
+        return Selection(self, bits)
+
+    def _column_bits(self, col, selected):
+        """OU des bitmaps des valeurs retenues (None si aucune restriction)"""
+        bitmaps = self._bitmaps[col]
+        wanted = {value for value in selected if value in bitmaps}
+
+        # Toutes les valeurs retenues : seules les lignes sans valeur sont exclues
+        if len(wanted) == len(bitmaps):
+            return self._valid[col]
+
+        bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in wanted:
+            np.bitwise_or(bits, bitmaps[value], out=bits)
+        return bits
+
+
+class Selection:
+    """
+    Résultat d'un filtrage : bitmap des lignes retenues.
+
+    ``bits`` vaut None lorsque le filtre ne restreint rien (sélection identité) ;
+    les lignes sont alors servies sans copie.
+    """
+
+    def __init__(self, index, bits):
+        self._index = index
+        self.bits = bits
+        self._count = None
+        self._rows = None
+
+    @property
+    def is_identity(self):
+        return self.bits is None
+
+    @property
+    def count(self):
+        """Nombre de lignes retenues, sans extraire les lignes"""
+        if self._count is None:
+            self._count = self._index.n_rows if self.is_identity else popcount(self.bits)
+        return self._count
+
+    @property
+    def mask(self):
+        """Masque booléen des lignes retenues"""
+        if self.is_identity:
+            return np.ones(self._index.n_rows, dtype=bool)
+        return np.unpackbits(self.bits, count=self._index.n_rows).view(bool)
+
+    @property
+    def positions(self):
+        """Positions des lignes retenues"""
+        if self.is_identity:
+            return np.arange(self._index.n_rows)
+        return np.flatnonzero(np.unpackbits(self.bits, count=self._index.n_rows))
+
+    @property
+    def rows(self):
+        """Lignes retenues, extraites une seule fois au premier accès"""
+        if self._rows is None:
+            if self.is_identity:
+                self._rows = self._index.df
+            else:
+                self._rows = self._index.df.take(self.positions)
+        return self._rows
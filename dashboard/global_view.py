@@ -0,0 +1,161 @@
+"""
+Vue globale précalculée
+=======================
+La vue par défaut (tous les filtres à « tout sélectionné », armes « Tous »)
+est celle que chaque analyste ouvre en premier. Le pipeline
+(``python -m crime_pipeline --stages global_view``) calcule une fois pour
+toutes ses agrégations ligne à ligne (KPIs, statistiques par zone, âge des
+victimes, armes, corrélations, tendances, mailles de la carte, séries
+temporelles) et les enregistre dans ``Crime_Global_View.pkl``.
+
+Le tableau de bord les sert telles quelles lorsque la sélection est
+l'identité : la page d'accueil ne dépend plus de la taille des données.
+L'artefact porte l'empreinte des données dont il est issu et est ignoré
+s'il ne correspond pas aux données chargées.
+"""
+
+import os
+import hashlib
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import FilterIndex, FILTER_COLUMNS
+from dashboard.cube import CountCube
+from dashboard.spatial import SpatialGrid, ZOOM_LEVELS
+from dashboard.rollups import DailyRollup
+from dashboard.regression import fit_ols
+from dashboard.histograms import histogram_stats, histogram_quantiles
+from dashboard.aggregations import (CORR_VARS, TIME_GRANULARITIES, by_frequency, compute_kpis,
+                                    compute_area_stats, compute_time_series, compute_area_weapon,
+                                    compute_correlation, compute_area_data)
+
+GLOBAL_VIEW_PATH = os.path.join('data', 'Crime_Global_View.pkl')
+
+# À incrémenter quand les calculs de l'artefact changent : les anciens sont ignorés
+GLOBAL_VIEW_FORMAT = 3
+
+
+def dataset_fingerprint(df):
+    """Empreinte des données : colonnes, nombre de lignes et numéros de dossier (DR_NO)"""
+    digest = hashlib.sha1()
+    digest.update('|'.join(map(str, df.columns)).encode('utf-8'))
+    digest.update(str(len(df)).encode('utf-8'))
+    if 'DR_NO' in df.columns:
+        digest.update(np.ascontiguousarray(df['DR_NO'].to_numpy(dtype=np.int64)).tobytes())
+    return digest.hexdigest()
+
+
+def default_view_computations(df):
+    """
+    Calculs de la vue par défaut, sous les clés demandées par le tableau de bord.
+
+    Returns:
+    --------
+    list of (tuple, callable)
+        ((nom, *options), calcul) : ``nom`` et ``options`` sont ceux passés à
+        ``memoize`` dans ``streamlit_app.py``
+    """
+    filter_index = FilterIndex(df)
+    criteria = {col: filter_index.values(col) for col in FILTER_COLUMNS if col in df.columns}
+    count_cube = CountCube(df)
+    area_counts = by_frequency(count_cube.counts(criteria, 'AREA NAME'))
+    top_10_areas = area_counts.head(10).index
+    corr_vars = [var for var in CORR_VARS if var in df.columns]
+    spatial_grid = SpatialGrid(df)
+    daily_rollup = DailyRollup(df)
+
+    # Histogramme de l'âge, source du graphique et des statistiques de l'onglet 4
+    @lru_cache(maxsize=None)
+    def vict_age_counts():
+        return count_cube.counts(criteria, 'Vict Age')
+
+    # Partagé par les nuages de points et leurs tendances, comme dans l'onglet 6
+    @lru_cache(maxsize=None)
+    def area_data():
+        return compute_area_data(df)
+
+    computations = [
+        (('kpis',), lambda: compute_kpis(df)),
+        (('tab2.area_stats',), lambda: compute_area_stats(df)),
+        (('tab4.age_counts',), vict_age_counts),
+        (('tab4.age_stats',), lambda: histogram_stats(vict_age_counts())),
+        (('tab4.age_quartiles',), lambda: histogram_quantiles(vict_age_counts(), [0.25, 0.75])),
+        (('tab5.area_weapon', tuple(top_10_areas)), lambda: compute_area_weapon(df, top_10_areas)),
+        (('tab6.correlation', tuple(corr_vars)), lambda: compute_correlation(df, corr_vars)),
+        (('tab6.area_data',), area_data),
+        (('tab6.trendlines',), lambda: fit_ols(
+            [area_data()['population'], area_data()['median_income']],
+            [area_data()['crime_rate'], area_data()['DR_NO']]
+        )),
+    ]
+    computations += [
+        (('tab2.map_cells', zoom), lambda zoom=zoom: spatial_grid.aggregate(zoom, None))
+        for zoom in ZOOM_LEVELS
+    ]
+    computations += [
+        (('tab3.time_series', label), lambda label=label: compute_time_series(daily_rollup, criteria, label))
+        for label in TIME_GRANULARITIES
+    ]
+    return computations
+
+
+class GlobalView:
+    """
+    Agrégations précalculées de la vue par défaut.
+
+    Parameters:
+    -----------
+    fingerprint : str
+        Empreinte des données sources (voir ``dataset_fingerprint``)
+    entries : dict
+        {(nom, *options): résultat}
+    """
+
+    def __init__(self, fingerprint, entries):
+        self.fingerprint = fingerprint
+        self.entries = entries
+
+    @classmethod
+    def build(cls, df):
+        """Calcule toutes les agrégations de la vue par défaut"""
+        entries = {key: compute() for key, compute in default_view_computations(df)}
+        return cls(dataset_fingerprint(df), entries)
+
+    def has(self, name, *options):
+        return (name, *options) in self.entries
+
+    def get(self, name, *options):
+        """Résultat précalculé (KeyError si la vue ne le contient pas)"""
+        return self.entries[(name, *options)]
+
+    def save(self, path=GLOBAL_VIEW_PATH):
+        """Enregistre l'artefact (écriture atomique, comme l'instantané)"""
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        pd.to_pickle({'format': GLOBAL_VIEW_FORMAT, 'fingerprint': self.fingerprint, 'entries': self.entries},
+                     tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, df, path=GLOBAL_VIEW_PATH):
+        """
+        Charge l'artefact s'il correspond aux données ``df``.
+
+        Returns:
+        --------
+        GlobalView or None
+            None si l'artefact est absent, illisible, d'un format antérieur
+            ou calculé sur d'autres données
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            payload = pd.read_pickle(path)
+        except Exception:
+            return None
+        if not isinstance(payload, dict) or payload.get('format') != GLOBAL_VIEW_FORMAT:
+            return None
+        if payload.get('fingerprint') != dataset_fingerprint(df):
+            return None
+        return cls(payload['fingerprint'], payload['entries'])
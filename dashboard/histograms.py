@@ -0,0 +1,107 @@
+"""
+Statistiques exactes sur histogramme entier
+===========================================
+Une variable à petit domaine entier (l'âge des victimes, de 0 à 120) est
+entièrement décrite par son nombre d'occurrences par valeur. Le cube de
+comptages garde cet histogramme par cellule de filtre (axe ``Vict Age``) :
+l'histogramme d'une sélection est la somme de ses cellules.
+
+Moyenne, médiane, écart-type et quantiles en sont déduits exactement (mêmes
+conventions que pandas : écart-type à n - 1 degrés de liberté, quantiles par
+interpolation linéaire), et le graphique reçoit des classes déjà comptées
+plutôt que chaque valeur brute.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Nombre de classes visé par l'histogramme de l'âge
+DEFAULT_BINS = 50
+
+
+def histogram_arrays(counts):
+    """Valeurs (croissantes) et effectifs non nuls d'un histogramme"""
+    counts = counts.sort_index()
+    values = counts.index.to_numpy(dtype=np.float64)
+    weights = counts.to_numpy(dtype=np.int64)
+    present = weights > 0
+    return values[present], weights[present]
+
+
+def histogram_quantiles(counts, q):
+    """
+    Quantiles exacts, comme ``Series.quantile`` sur les valeurs brutes.
+
+    Parameters:
+    -----------
+    counts : pd.Series
+        Effectif par valeur (index : valeurs)
+    q : float or array-like
+        Ordre(s) des quantiles, entre 0 et 1
+
+    Returns:
+    --------
+    float or np.ndarray
+        NaN si l'histogramme est vide
+    """
+    values, weights = histogram_arrays(counts)
+    q = np.asarray(q, dtype=np.float64)
+    n = weights.sum()
+    if n == 0:
+        return np.full(q.shape, np.nan)[()]
+
+    # Rang (0..n-1) de chaque quantile dans les valeurs triées, puis valeur de ce rang
+    cumulative = np.cumsum(weights)
+    position = (n - 1) * q
+    below = np.floor(position)
+    lower = values[np.searchsorted(cumulative, below, side='right')]
+    upper = values[np.searchsorted(cumulative, np.minimum(below + 1, n - 1), side='right')]
+    return (lower + (position - below) * (upper - lower))[()]
+
+
+def histogram_stats(counts):
+    """
+    Moyenne, médiane et écart-type exacts d'un histogramme.
+
+    Returns:
+    --------
+    tuple
+        (moyenne, médiane, écart-type), comme ``mean``, ``median`` et ``std``
+        de pandas sur les valeurs brutes (NaN si l'effectif est insuffisant)
+    """
+    values, weights = histogram_arrays(counts)
+    n = weights.sum()
+    if n == 0:
+        return np.nan, np.nan, np.nan
+    mean = (values * weights).sum() / n
+    std = np.sqrt((weights * (values - mean) ** 2).sum() / (n - 1)) if n > 1 else np.nan
+    return mean, histogram_quantiles(counts, 0.5), std
+
+
+def bin_histogram(counts, bins=DEFAULT_BINS):
+    """
+    Regroupe un histogramme entier en classes de largeur entière fixe.
+
+    Parameters:
+    -----------
+    counts : pd.Series
+        Effectif par valeur entière
+    bins : int
+        Nombre de classes visé (largeur arrondie à l'entier supérieur)
+
+    Returns:
+    --------
+    pd.DataFrame
+        Une ligne par classe : ``start``, ``end`` (bornes incluses) et ``count``
+    """
+    values, weights = histogram_arrays(counts)
+    if len(values) == 0:
+        return pd.DataFrame({'start': [], 'end': [], 'count': []}, dtype=np.int64)
+    low, high = int(values[0]), int(values[-1])
+    width = max(1, -(-(high - low + 1) // bins))
+    # Bornes alignées sur les multiples de la largeur (0-4, 5-9...)
+    first = low // width * width
+    codes = ((values - first) // width).astype(np.int64)
+    binned = np.bincount(codes, weights=weights).astype(np.int64)
+    starts = first + width * np.arange(len(binned))
+    return pd.DataFrame({'start': starts, 'end': starts + width - 1, 'count': binned})
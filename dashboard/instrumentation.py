@@ -0,0 +1,208 @@
+"""
+Instrumentation du rendu
+========================
+Chronométrage des sections logiques de ``streamlit_app.py`` (chargement,
+filtres, KPIs, onglet actif, export) à chaque exécution du script : temps
+écoulé, lignes traitées et variation de la mémoire résidente du processus.
+
+Les mesures sont affichées dans le panneau « ⚙️ Performance » de la barre
+latérale et ajoutées à un journal JSON Lines à rotation, que
+``summarize_log`` agrège sur toutes les sessions.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import contextlib
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+import pandas as pd
+
+PERF_LOG_PATH = os.path.join('logs', 'dashboard_perf.jsonl')
+
+# Rotation du journal : 5 Mo par fichier, 3 fichiers archivés
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+
+
+def resident_memory_bytes():
+    """
+    Mémoire résidente actuelle du processus, en octets.
+
+    Lue dans /proc sous Linux ; ailleurs, à défaut, le pic de mémoire du
+    processus (None si aucune mesure n'est disponible).
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets ailleurs
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def open_perf_log(path=PERF_LOG_PATH, max_bytes=LOG_MAX_BYTES, backups=LOG_BACKUPS):
+    """
+    Journal à rotation des mesures (None si le répertoire n'est pas accessible).
+
+    Un logger par fichier : appeler plusieurs fois la fonction n'ajoute pas
+    de gestionnaire en double.
+    """
+    logger = logging.getLogger(f"dashboard.perf.{os.path.abspath(path)}")
+    if not logger.handlers:
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        except OSError:
+            return None
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                      encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class SectionTiming:
+    """Mesure d'une section : temps écoulé, lignes traitées, variation mémoire"""
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.seconds = None
+        self.memory_delta_mb = None
+        self._start = time.perf_counter()
+        self._memory_start = resident_memory_bytes()
+
+    def stop(self):
+        self.seconds = time.perf_counter() - self._start
+        memory_end = resident_memory_bytes()
+        if memory_end is not None and self._memory_start is not None:
+            self.memory_delta_mb = (memory_end - self._memory_start) / 1024 / 1024
+        return self
+
+    def as_dict(self):
+        return {
+            'section': self.name,
+            'seconds': round(self.seconds, 6) if self.seconds is not None else None,
+            'rows': int(self.rows) if self.rows is not None else None,
+            'memory_delta_mb': round(self.memory_delta_mb, 3) if self.memory_delta_mb is not None else None
+        }
+
+
+class RenderProfiler:
+    """
+    Mesures des sections d'une exécution du script.
+
+    Parameters:
+    -----------
+    session_id : str
+        Identifiant de la session Streamlit (regroupe les exécutions)
+    logger : logging.Logger, optional
+        Journal des mesures (voir ``open_perf_log`` ; aucun si None)
+    """
+
+    def __init__(self, session_id, logger=None):
+        self.session_id = session_id
+        self.logger = logger
+        self.run_at = datetime.now().isoformat(timespec='seconds')
+        self.timings = []
+        self._open = {}
+        self._start = time.perf_counter()
+
+    def start(self, name, rows=None):
+        """Démarre la mesure d'une section"""
+        self._open[name] = SectionTiming(name, rows)
+        return self._open[name]
+
+    def stop(self, name, rows=None):
+        """Termine la mesure d'une section ; ``rows`` : lignes traitées"""
+        timing = self._open.pop(name).stop()
+        if rows is not None:
+            timing.rows = rows
+        self.timings.append(timing)
+        return timing
+
+    @contextlib.contextmanager
+    def section(self, name, rows=None):
+        """
+        Mesure le bloc ``with`` ; la mesure est retournée par ``as`` pour
+        renseigner les lignes traitées une fois connues.
+        """
+        timing = self.start(name, rows)
+        try:
+            yield timing
+        finally:
+            self.stop(name)
+
+    @property
+    def total_seconds(self):
+        """Temps écoulé depuis le début de l'exécution"""
+        return time.perf_counter() - self._start
+
+    def summary(self):
+        """Mesures de l'exécution, pour le panneau de performance"""
+        return pd.DataFrame([timing.as_dict() for timing in self.timings],
+                            columns=['section', 'seconds', 'rows', 'memory_delta_mb'])
+
+    def flush(self):
+        """Ajoute les mesures de l'exécution au journal (une ligne JSON par section)"""
+        if self.logger is None:
+            return
+        for timing in self.timings:
+            record = {'run_at': self.run_at, 'session': self.session_id, **timing.as_dict()}
+            self.logger.info(json.dumps(record, ensure_ascii=False))
+        for handler in self.logger.handlers:
+            handler.flush()
+
+
+def read_perf_log(path=PERF_LOG_PATH):
+    """Mesures du journal et de ses archives de rotation, de la plus ancienne à la plus récente"""
+    paths = [f"{path}.{i}" for i in range(LOG_BACKUPS, 0, -1)] + [path]
+    records = []
+    for log_path in paths:
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Ligne tronquée par un arrêt brutal
+                    continue
+    return pd.DataFrame(records, columns=['run_at', 'session', 'section', 'seconds', 'rows', 'memory_delta_mb'])
+
+
+def summarize_log(path=PERF_LOG_PATH):
+    """
+    Agrégation du journal sur toutes les sessions.
+
+    Returns:
+    --------
+    pd.DataFrame
+        Par section : exécutions, sessions, temps moyen / p95 / max (ms),
+        lignes moyennes et variation mémoire moyenne (Mo), par temps moyen
+        décroissant
+    """
+    log = read_perf_log(path)
+    if log.empty:
+        return pd.DataFrame()
+    log['ms'] = log['seconds'] * 1000
+    summary = log.groupby('section').agg(
+        executions=('ms', 'size'),
+        sessions=('session', 'nunique'),
+        moyenne_ms=('ms', 'mean'),
+        p95_ms=('ms', lambda ms: ms.quantile(0.95)),
+        max_ms=('ms', 'max'),
+        lignes=('rows', 'mean'),
+        memoire_mo=('memory_delta_mb', 'mean')
+    )
+    return summary.sort_values('moyenne_ms', ascending=False).round(2)
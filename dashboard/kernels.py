@@ -0,0 +1,164 @@
+"""
+Noyaux d'agrégation par groupe
+==============================
+Taux et modalité dominante par groupe, calculés sur les codes entiers des
+groupes avec ``np.bincount`` : aucune fonction Python n'est appelée par
+groupe, le coût ne dépend que du nombre de lignes.
+
+Ils remplacent les ``groupby(...).apply(lambda ...)`` du tableau de bord
+(taux d'armes par zone, catégorie dominante des mailles de la carte) et des
+notebooks (catégorie la plus fréquente par trimestre). Les groupes suivent
+l'ordre de ``groupby(..., observed=True)``.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Au-delà de ce nombre de cases (groupes × modalités), la modalité dominante
+# est calculée sur les seules paires observées plutôt que sur une table dense
+DENSE_MAX_CELLS = 2 ** 24
+
+
+def group_codes(keys):
+    """
+    Code entier du groupe de chaque ligne.
+
+    Parameters:
+    -----------
+    keys : pd.Series or list of pd.Series
+        Clé(s) de regroupement, de même longueur
+
+    Returns:
+    --------
+    tuple
+        (codes, groups) : codes ``np.ndarray`` (0..n-1, -1 si une clé est
+        manquante) et ``groups`` l'index des n groupes observés, trié comme
+        ``groupby`` (MultiIndex pour plusieurs clés)
+    """
+    if isinstance(keys, pd.Series):
+        keys = [keys]
+    factorized = [pd.factorize(key, sort=True) for key in keys]
+    if len(factorized) == 1:
+        codes, uniques = factorized[0]
+        return codes.astype(np.int64), uniques.rename(keys[0].name)
+
+    sizes = [len(uniques) for _, uniques in factorized]
+    valid = np.logical_and.reduce([codes >= 0 for codes, _ in factorized])
+    combined = np.full(len(valid), -1, dtype=np.int64)
+    combined[valid] = np.ravel_multi_index([codes[valid] for codes, _ in factorized], sizes)
+
+    # Renumérotation compacte des seules combinaisons observées (dans l'ordre trié)
+    n_cells = int(np.prod(sizes, dtype=np.int64))
+    if n_cells <= DENSE_MAX_CELLS:
+        observed = np.flatnonzero(np.bincount(combined[valid], minlength=n_cells))
+        renumber = np.full(n_cells, -1, dtype=np.int64)
+        renumber[observed] = np.arange(len(observed))
+        combined[valid] = renumber[combined[valid]]
+    else:
+        observed, combined[valid] = np.unique(combined[valid], return_inverse=True)
+
+    level_codes = np.unravel_index(observed, sizes)
+    groups = pd.MultiIndex.from_arrays(
+        [uniques.take(codes) for codes, (_, uniques) in zip(level_codes, factorized)],
+        names=[key.name for key in keys]
+    )
+    return combined, groups
+
+
+def grouped_rate(keys, flags, scale=100):
+    """
+    Part des lignes de chaque groupe où ``flags`` vaut 1.
+
+    Équivaut à ``groupby(keys)[flags].apply(lambda x: (x == 1).sum() / len(x) * scale)``.
+
+    Parameters:
+    -----------
+    keys : pd.Series or list of pd.Series
+        Clé(s) de regroupement
+    flags : pd.Series
+        Indicateur 0/1 (les valeurs manquantes comptent comme 0)
+    scale : float
+        Échelle du taux (100 : pourcentage)
+
+    Returns:
+    --------
+    pd.Series
+        Taux par groupe observé
+    """
+    codes, groups = group_codes(keys)
+    hits = np.asarray(flags == 1)
+    valid = codes >= 0
+    totals = np.bincount(codes[valid], minlength=len(groups))
+    positives = np.bincount(codes[valid & hits], minlength=len(groups))
+    return pd.Series(positives / totals * scale, index=groups, name=flags.name)
+
+
+def dominant_codes(codes, value_codes, n_groups, n_values):
+    """
+    Modalité la plus fréquente de chaque groupe, sur des codes entiers.
+
+    Parameters:
+    -----------
+    codes, value_codes : np.ndarray
+        Code du groupe (0..n_groups-1) et de la modalité (0..n_values-1) de
+        chaque ligne, sans valeur manquante
+    n_groups, n_values : int
+        Nombre de groupes et de modalités
+
+    Returns:
+    --------
+    tuple of np.ndarray
+        (totaux, modalité dominante, effectif de la modalité dominante) par
+        groupe ; à égalité, le plus petit code l'emporte ; -1 pour un groupe vide
+    """
+    codes = codes.astype(np.int64)
+    totals = np.bincount(codes, minlength=n_groups)
+    if n_values == 0:
+        return totals, np.full(n_groups, -1), np.zeros(n_groups, dtype=np.int64)
+    if n_groups * n_values <= DENSE_MAX_CELLS:
+        counts = np.bincount(codes * n_values + value_codes,
+                             minlength=n_groups * n_values).reshape(n_groups, n_values)
+        dominant = counts.argmax(axis=1)
+        dominant_counts = counts[np.arange(n_groups), dominant]
+    else:
+        # Paires (groupe, modalité) observées, triées par groupe puis effectif décroissant
+        pairs, pair_counts = np.unique(codes * n_values + value_codes, return_counts=True)
+        pair_groups, pair_values = np.divmod(pairs, n_values)
+        order = np.lexsort((pair_values, -pair_counts, pair_groups))
+        first = order[np.r_[True, pair_groups[order][1:] != pair_groups[order][:-1]]]
+        dominant = np.zeros(n_groups, dtype=np.int64)
+        dominant_counts = np.zeros(n_groups, dtype=np.int64)
+        dominant[pair_groups[first]] = pair_values[first]
+        dominant_counts[pair_groups[first]] = pair_counts[first]
+    dominant = np.where(totals > 0, dominant, -1)
+    return totals, dominant, dominant_counts
+
+
+def grouped_mode(keys, values):
+    """
+    Modalité la plus fréquente de ``values`` dans chaque groupe.
+
+    Équivaut à ``groupby(keys)[values].agg(lambda x: x.value_counts().index[0])`` ;
+    à égalité, la première modalité dans l'ordre trié l'emporte.
+
+    Parameters:
+    -----------
+    keys : pd.Series or list of pd.Series
+        Clé(s) de regroupement
+    values : pd.Series
+        Modalités (les valeurs manquantes sont ignorées)
+
+    Returns:
+    --------
+    pd.Series
+        Modalité dominante par groupe observé (NaN si le groupe n'a que des
+        valeurs manquantes)
+    """
+    codes, groups = group_codes(keys)
+    value_codes, uniques = pd.factorize(values, sort=True)
+    valid = (codes >= 0) & (value_codes >= 0)
+    _, dominant, _ = dominant_codes(codes[valid], value_codes[valid], len(groups), len(uniques))
+    modes = np.full(len(groups), np.nan, dtype=object)
+    found = dominant >= 0
+    modes[found] = np.asarray(uniques, dtype=object)[dominant[found]]
+    return pd.Series(modes, index=groups, name=values.name)
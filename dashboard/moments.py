@@ -0,0 +1,234 @@
+"""
+Statistiques suffisantes par cellule de filtre
+==============================================
+Pour chaque cellule des dimensions de filtre (année × zone × catégorie ×
+moment de la journée × armes), le cube garde le nombre de lignes et, pour
+les variables numériques de la matrice de corrélation (qui incluent celles
+des KPIs), les effectifs, sommes, sommes des carrés et sommes des produits
+croisés.
+
+Les moments d'une sélection sont la somme des cellules retenues : moyennes,
+variances, matrice de corrélation et KPIs s'en déduisent exactement, sans
+relire les lignes. Comme ``DataFrame.corr``, chaque paire de variables
+n'utilise que les lignes où les deux sont renseignées.
+
+Les carrés et produits sont accumulés après décalage par la moyenne globale
+de chaque variable, ce qui évite la perte de précision des grandes valeurs
+(population, revenu).
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import FILTER_COLUMNS
+from dashboard.aggregations import CORR_VARS
+
+
+class MomentCube:
+    """
+    Moments des variables numériques par cellule de filtre.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Données transformées
+    variables : list, optional
+        Variables numériques suivies (celles de la matrice de corrélation)
+    dimensions : list, optional
+        Dimensions de filtre
+    """
+
+    def __init__(self, df, variables=CORR_VARS, dimensions=FILTER_COLUMNS):
+        self.dimensions = list(dimensions)
+        self.variables = [var for var in variables if var in df.columns]
+        self._values = {}
+
+        codes = []
+        for col in self.dimensions:
+            col_codes, uniques = pd.factorize(df[col], sort=True)
+            codes.append(col_codes)
+            self._values[col] = pd.Index(uniques).tolist()
+        shape = tuple(len(self._values[col]) for col in self.dimensions)
+        n_cells = int(np.prod(shape))
+
+        # Comme le cube de comptages : les lignes sans valeur sur une dimension sont ignorées
+        valid = np.logical_and.reduce([c >= 0 for c in codes])
+        # Sans ligne ignorée, la sélection identité (aucun filtre) est couverte aussi
+        self.complete = bool(valid.all())
+        cells = np.ravel_multi_index([c[valid] for c in codes], shape)
+
+        def by_cell(weights=None):
+            return np.bincount(cells, weights=weights, minlength=n_cells)
+
+        # Une colonne contiguë par variable (ordre Fortran) : les produits lisent des colonnes
+        values = np.empty((len(cells), len(self.variables)), order='F')
+        for i, var in enumerate(self.variables):
+            values[:, i] = df[var].to_numpy(dtype=np.float64, na_value=np.nan)[valid]
+        present = ~np.isnan(values)
+        self.shift = np.array([values[present[:, i], i].mean() if present[:, i].any() else 0.0
+                               for i in range(len(self.variables))])
+        raw = np.where(present, values, 0.0)
+        shifted = np.where(present, values - self.shift, 0.0)
+        complete = present.all(axis=0)
+
+        n_vars = len(self.variables)
+        self.rows = by_cell().reshape(shape)
+        counts = np.empty((n_cells, n_vars, n_vars))
+        sums = np.empty((n_cells, n_vars, n_vars))
+        squares = np.empty((n_cells, n_vars, n_vars))
+        products = np.empty((n_cells, n_vars, n_vars))
+        mins = np.empty((n_cells, n_vars))
+        maxs = np.empty((n_cells, n_vars))
+
+        # Sommes sur les lignes où la variable i est renseignée, puis restreintes
+        # aux lignes où j l'est aussi (calcul évité quand j n'a aucun manque)
+        own_count = [by_cell(present[:, i].astype(np.float64)) for i in range(n_vars)]
+        own_sum = [by_cell(raw[:, i]) for i in range(n_vars)]
+        own_square = [by_cell(shifted[:, i] ** 2) for i in range(n_vars)]
+        for i in range(n_vars):
+            for j in range(n_vars):
+                if complete[j] or i == j:
+                    counts[:, i, j], sums[:, i, j], squares[:, i, j] = own_count[i], own_sum[i], own_square[i]
+                else:
+                    mask = present[:, j]
+                    counts[:, i, j] = by_cell((present[:, i] & mask).astype(np.float64))
+                    sums[:, i, j] = by_cell(np.where(mask, raw[:, i], 0.0))
+                    squares[:, i, j] = by_cell(np.where(mask, shifted[:, i] ** 2, 0.0))
+            for j in range(i, n_vars):
+                products[:, i, j] = products[:, j, i] = by_cell(shifted[:, i] * shifted[:, j])
+
+            # Extrema par cellule : une variable constante sur la sélection a une variance nulle exacte
+            mins[:, i] = np.full(n_cells, np.inf)
+            maxs[:, i] = np.full(n_cells, -np.inf)
+            rows_i = present[:, i]
+            np.minimum.at(mins[:, i], cells[rows_i], values[rows_i, i])
+            np.maximum.at(maxs[:, i], cells[rows_i], values[rows_i, i])
+
+        self._counts = counts.reshape(shape + (n_vars, n_vars))
+        self._sums = sums.reshape(shape + (n_vars, n_vars))
+        self._squares = squares.reshape(shape + (n_vars, n_vars))
+        self._products = products.reshape(shape + (n_vars, n_vars))
+        self._mins = mins.reshape(shape + (n_vars,))
+        self._maxs = maxs.reshape(shape + (n_vars,))
+        for array in (self.rows, self._counts, self._sums, self._squares, self._products, self._mins, self._maxs):
+            array.flags.writeable = False
+
+    def values(self, column):
+        """Valeurs triées d'une dimension"""
+        return list(self._values[column])
+
+    def _slice(self, array, criteria):
+        """Cellules retenues par la sélection, sur les premiers axes (dimensions)"""
+        for axis, col in enumerate(self.dimensions):
+            if col not in criteria:
+                continue
+            lookup = {value: code for code, value in enumerate(self._values[col])}
+            wanted = sorted({lookup[v] for v in criteria[col] if v in lookup})
+            if len(wanted) < len(lookup):
+                array = np.take(array, wanted, axis=axis)
+        return array
+
+    def moments(self, criteria):
+        """
+        Moments d'une sélection, par fusion des cellules retenues.
+
+        Parameters:
+        -----------
+        criteria : dict
+            {dimension de filtre: valeurs acceptées}
+
+        Returns:
+        --------
+        Moments
+        """
+        axes = tuple(range(len(self.dimensions)))
+
+        def merge(array, reduce=np.sum, **kwargs):
+            return reduce(self._slice(array, criteria), axis=axes, **kwargs)
+
+        return Moments(
+            self.variables, self.shift,
+            rows=int(merge(self.rows)),
+            counts=merge(self._counts),
+            sums=merge(self._sums),
+            squares=merge(self._squares),
+            products=merge(self._products),
+            # Sélection vide : extrema infinis, comme une cellule sans valeur
+            mins=merge(self._mins, np.min, initial=np.inf),
+            maxs=merge(self._maxs, np.max, initial=-np.inf)
+        )
+
+
+class Moments:
+    """
+    Moments fusionnés d'une sélection.
+
+    ``counts[i, j]``, ``sums[i, j]`` et ``squares[i, j]`` portent sur les lignes
+    où i et j sont renseignées (effectif, somme de i, somme des carrés décalés
+    de i) ; ``products[i, j]`` est la somme des produits décalés.
+    """
+
+    def __init__(self, variables, shift, rows, counts, sums, squares, products, mins, maxs):
+        self.variables = list(variables)
+        self.shift = shift
+        self.rows = rows
+        self.counts = counts
+        self.sums = sums
+        self.squares = squares
+        self.products = products
+        self.mins = mins
+        self.maxs = maxs
+
+    def _index(self, var):
+        return self.variables.index(var)
+
+    def sum(self, var):
+        """Somme des valeurs renseignées"""
+        i = self._index(var)
+        return self.sums[i, i]
+
+    def mean(self, var):
+        """Moyenne (NaN sans valeur), comme ``Series.mean``"""
+        i = self._index(var)
+        return self.sums[i, i] / self.counts[i, i] if self.counts[i, i] > 0 else np.nan
+
+    def corr(self, variables=None):
+        """
+        Matrice de corrélation de Pearson, comme ``DataFrame.corr()``.
+
+        Parameters:
+        -----------
+        variables : list, optional
+            Variables de la matrice (toutes si None)
+
+        Returns:
+        --------
+        pd.DataFrame
+        """
+        variables = list(variables) if variables is not None else self.variables
+        idx = [self._index(var) for var in variables]
+        n = self.counts[np.ix_(idx, idx)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Moyennes décalées de i et de j sur les lignes où les deux sont renseignées
+            mean_i = self.sums[np.ix_(idx, idx)] / n - self.shift[idx][:, None]
+            mean_j = mean_i.T
+            cov = self.products[np.ix_(idx, idx)] / n - mean_i * mean_j
+            var_i = np.maximum(self.squares[np.ix_(idx, idx)] / n - mean_i ** 2, 0.0)
+            var_j = var_i.T
+            corr = np.clip(cov / np.sqrt(var_i * var_j), -1.0, 1.0)
+
+        # Variable constante sur la sélection : variance exactement nulle, corrélation indéfinie
+        constant = self.mins[idx] >= self.maxs[idx]
+        corr[constant, :] = np.nan
+        corr[:, constant] = np.nan
+        corr[n < 1] = np.nan
+        diagonal = np.arange(len(idx))
+        corr[diagonal, diagonal] = np.where(np.isnan(corr[diagonal, diagonal]), np.nan, 1.0)
+        return pd.DataFrame(corr, index=variables, columns=variables)
+
+    def kpis(self):
+        """Âge moyen, taux d'armes et délai moyen de signalement, comme ``compute_kpis``"""
+        avg_victim_age = self.mean('Vict Age')
+        weapon_rate = self.sum('weapon_involved') / self.rows * 100 if self.rows > 0 else 0
+        avg_delay = self.mean('reporting_delay_days') if 'reporting_delay_days' in self.variables else 0
+        return avg_victim_age, weapon_rate, avg_delay
@@ -0,0 +1,224 @@
+"""
+Cache des agrégations du tableau de bord
+========================================
+Seul l'onglet actif est calculé à chaque exécution. Ses agrégations et
+figures coûteuses sont mémorisées sous une clé canonique de l'état des
+filtres : changer d'onglet, cocher une option d'affichage ou revenir à une
+sélection déjà vue ne recalcule rien.
+
+Le cache est partagé par toutes les sessions (la plupart des analystes
+partent de la même sélection par défaut) et borné par un budget mémoire,
+avec éviction LRU.
+
+Les figures Plotly ont leur propre cache (``FigureCache``), qui conserve
+les objets ``go.Figure`` eux-mêmes : une figure déjà vue n'est ni
+recalculée ni reconstruite par Plotly (Streamlit la sérialise toutefois
+à chaque affichage, voir ``FigureCache``).
+"""
+
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BUDGET_MB = 256
+
+# Budget du cache des figures (Mo, estimé sur leurs données)
+DEFAULT_FIGURE_BUDGET_MB = 64
+
+# Propriétés des traces qui portent les données (le reste est de taille fixe)
+FIGURE_DATA_PROPERTIES = ('x', 'y', 'z', 'lat', 'lon', 'customdata', 'text', 'hovertext', 'labels', 'values')
+
+# Part fixe d'une figure (mise en page, styles des traces), en octets
+FIGURE_BASE_BYTES = 4 * 1024
+
+
+def estimate_size(value):
+    """
+    Estimation de l'empreinte mémoire d'un résultat, en octets.
+
+    Les structures pandas / NumPy sont mesurées directement ; les autres
+    objets (figures Plotly...) par la taille de leur sérialisation.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_size(item) for item in value)
+    if isinstance(value, (int, float, str, bool, type(None), np.generic)):
+        return 64
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class AggregateCache:
+    """
+    Cache LRU des calculs d'onglets, borné en mémoire.
+
+    Les entrées sont indexées par (état des filtres, nom du calcul, options).
+    Les résultats sont partagés entre sessions : ils ne doivent pas être
+    modifiés par l'appelant.
+
+    Parameters:
+    -----------
+    max_bytes : int, optional
+        Budget mémoire ; les entrées les moins récemment utilisées sont
+        évincées au-delà
+    """
+
+    def __init__(self, max_bytes=DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, state_key, name, compute, *options):
+        """
+        Retourne le résultat mémorisé de ``compute`` ou le calcule.
+
+        Parameters:
+        -----------
+        state_key : str
+            Empreinte de l'état des filtres (voir ``filter_state_key``)
+        name : str
+            Identifiant du calcul (ex. 'tab2.area_stats')
+        compute : callable
+            Fonction sans argument qui produit le résultat
+        options : tuple
+            Options d'affichage dont dépend le résultat (granularité...)
+        """
+        key = (state_key, name) + options
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        # Calcul hors verrou : les autres sessions ne sont pas bloquées
+        value = compute()
+        size = self.size_of(value)
+
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (value, size)
+                self.current_bytes += size
+                self._evict()
+        return value
+
+    def size_of(self, value):
+        """Taille d'un résultat imputée au budget, mesurée une fois à l'insertion"""
+        return estimate_size(value)
+
+    def _evict(self):
+        """Retire les entrées les plus anciennes jusqu'à respecter le budget"""
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Compteurs du cache pour le panneau de diagnostic"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups * 100 if lookups else 0.0,
+                'entries': len(self._entries),
+                'evictions': self.evictions,
+                'size_mb': self.current_bytes / 1024 / 1024,
+                'budget_mb': self.max_bytes / 1024 / 1024
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def array_bytes(value):
+    """Taille des valeurs d'une propriété de trace (tableau, liste, éventuellement imbriquée)"""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], (list, tuple, np.ndarray)):
+            return sum(array_bytes(row) for row in value)
+        return 8 * len(value)
+    if isinstance(value, str):
+        return len(value)
+    return 0
+
+
+def estimate_figure_size(fig):
+    """
+    Estimation de l'empreinte d'une figure Plotly, sans la sérialiser.
+
+    Somme des tableaux de données de chaque trace (``x``, ``y``, ``z``,
+    ``customdata``...) et d'une part fixe pour la mise en page.
+    """
+    size = FIGURE_BASE_BYTES
+    for trace in fig.data:
+        for prop in FIGURE_DATA_PROPERTIES:
+            size += array_bytes(getattr(trace, prop, None))
+        marker = getattr(trace, 'marker', None)
+        if marker is not None:
+            size += array_bytes(getattr(marker, 'size', None)) + array_bytes(getattr(marker, 'color', None))
+    return size
+
+
+class FigureCache(AggregateCache):
+    """
+    Cache LRU des figures Plotly, conservées telles quelles.
+
+    Les entrées sont indexées par (état des filtres, identifiant du
+    graphique, options d'affichage) ; leur taille est estimée à l'insertion
+    d'après les tableaux de données des traces (``estimate_figure_size``),
+    sans sérialisation. Un succès rend l'objet ``go.Figure`` mémorisé, sans
+    analyse JSON ni reconstruction.
+
+    ``st.plotly_chart`` n'accepte pas de JSON déjà sérialisé : il convertit
+    toujours la figure (``to_dict``) puis la sérialise (``plotly.io.to_json``)
+    à chaque affichage. Ce coût reste donc payé en cas de succès ; seuls
+    l'agrégation et la construction de la figure sont évitées.
+    Les figures sont partagées entre sessions : elles ne doivent pas être
+    modifiées par l'appelant.
+    """
+
+    def size_of(self, value):
+        """Taille estimée d'après les données des traces"""
+        return estimate_figure_size(value)
+
+    def figure(self, state_key, chart_id, build, *options):
+        """
+        Retourne la figure mémorisée ou la construit.
+
+        Parameters:
+        -----------
+        state_key : str
+            Empreinte de l'état des filtres (voir ``filter_state_key``)
+        chart_id : str
+            Identifiant du graphique (ex. 'tab1.category')
+        build : callable
+            Fonction sans argument qui agrège les données et construit la
+            figure ; elle n'est pas appelée en cas de succès
+        options : tuple
+            Options d'affichage dont dépend la figure (granularité, zoom...)
+        """
+        return self.get(state_key, chart_id, build, *options)
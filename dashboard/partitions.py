@@ -0,0 +1,247 @@
+"""
+Données transformées partitionnées
+==================================
+Le pipeline (``python -m crime_pipeline --stages partition``) écrit les
+données transformées dans un répertoire découpé par année, et en option par
+zone : ``year=2024/area=Central/part.feather``. Un manifeste JSON décrit
+chaque partition (valeurs des clés, nombre de lignes, dates d'occurrence
+minimale et maximale).
+
+Le tableau de bord lit les années proposées dans le manifeste, puis ne
+charge que les partitions des années sélectionnées : une session limitée à
+une ou deux années ne lit ni ne garde en mémoire les autres. Les fichiers
+ont le schéma typé de l'instantané et sont lus en projection mémoire.
+"""
+
+import os
+import json
+import shutil
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from dashboard.storage import NUMERIC_DTYPES, TRANSFORMED_CSV, apply_schema, read_only
+
+PARTITIONS_DIR = os.path.join('data', 'Crime_Data_Partitioned')
+MANIFEST_FILE = 'manifest.json'
+PARTITION_FILE = 'part.feather'
+
+# Colonnes de partitionnement et nom court utilisé dans les répertoires
+PARTITION_KEYS = {'year': 'year', 'AREA NAME': 'area'}
+
+# À incrémenter quand la disposition change : les anciens répertoires sont ignorés
+PARTITIONS_FORMAT = 1
+
+
+def partition_dir(keys, values):
+    """Chemin relatif d'une partition (``year=2024/area=N%20Hollywood``)"""
+    return os.path.join(*[f"{PARTITION_KEYS[key]}={quote(str(value), safe='')}"
+                          for key, value in zip(keys, values)])
+
+
+def json_value(value):
+    """Valeur de clé sérialisable (entiers NumPy, chaînes)"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def write_partitions(df, path=PARTITIONS_DIR, by_area=False):
+    """
+    Écrit les données dans un répertoire partitionné et son manifeste.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Données transformées, avec le schéma typé (``apply_schema``)
+    path : str
+        Répertoire de sortie (remplacé en bloc)
+    by_area : bool
+        Découper aussi chaque année par zone (``AREA NAME``)
+
+    Returns:
+    --------
+    PartitionManifest
+    """
+    keys = ['year', 'AREA NAME'] if by_area else ['year']
+    # Écriture dans un répertoire temporaire puis bascule : un lecteur ne voit
+    # jamais un répertoire à moitié écrit
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    # Créé d'emblée : un jeu de données vide n'a aucune partition mais un manifeste
+    os.makedirs(tmp_path)
+
+    partitions = []
+    groups = df.groupby(keys, observed=True, sort=True).indices
+    for values, positions in groups.items():
+        values = values if isinstance(values, tuple) else (values,)
+        relative = os.path.join(partition_dir(keys, values), PARTITION_FILE)
+        os.makedirs(os.path.dirname(os.path.join(tmp_path, relative)), exist_ok=True)
+        part = df.take(positions).reset_index(drop=True)
+        part.to_feather(os.path.join(tmp_path, relative), compression='uncompressed')
+        dates = part['DATE OCC'] if 'DATE OCC' in part.columns else pd.Series(dtype='datetime64[ns]')
+        partitions.append({
+            'file': relative,
+            'values': {key: json_value(value) for key, value in zip(keys, values)},
+            'rows': len(part),
+            'date_min': dates.min().isoformat() if dates.notna().any() else None,
+            'date_max': dates.max().isoformat() if dates.notna().any() else None
+        })
+
+    manifest = PartitionManifest(path, keys, partitions, list(df.columns))
+    with open(os.path.join(tmp_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest.as_dict(), f, ensure_ascii=False, indent=1)
+
+    old_path = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return manifest
+
+
+def partitions_are_stale(csv_path=TRANSFORMED_CSV, path=PARTITIONS_DIR):
+    """Indique si le manifeste est absent ou plus ancien que le CSV source"""
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return True
+    if not os.path.exists(csv_path):
+        return False
+    return os.path.getmtime(csv_path) > os.path.getmtime(manifest_path)
+
+
+class PartitionManifest:
+    """
+    Description des partitions et lecture des seules partitions utiles.
+
+    Parameters:
+    -----------
+    path : str
+        Répertoire partitionné
+    partition_by : list of str
+        Colonnes de partitionnement (``year``, puis ``AREA NAME`` en option)
+    partitions : list of dict
+        Par partition : fichier, valeurs des clés, lignes, dates min / max
+    columns : list of str
+        Colonnes des données
+    """
+
+    def __init__(self, path, partition_by, partitions, columns):
+        self.path = path
+        self.partition_by = list(partition_by)
+        self.partitions = partitions
+        self.columns = columns
+
+    def as_dict(self):
+        return {
+            'format': PARTITIONS_FORMAT,
+            'partition_by': self.partition_by,
+            'columns': self.columns,
+            'rows': self.rows(),
+            'partitions': self.partitions
+        }
+
+    @classmethod
+    def load(cls, path=PARTITIONS_DIR):
+        """
+        Lit le manifeste d'un répertoire partitionné.
+
+        Returns:
+        --------
+        PartitionManifest or None
+            None si le manifeste est absent, illisible ou d'un format antérieur
+        """
+        try:
+            with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get('format') != PARTITIONS_FORMAT:
+            return None
+        return cls(path, payload['partition_by'], payload['partitions'], payload['columns'])
+
+    def values(self, key):
+        """Valeurs distinctes triées d'une clé de partitionnement"""
+        return sorted({partition['values'][key] for partition in self.partitions})
+
+    def select(self, criteria=None):
+        """
+        Partitions compatibles avec une sélection.
+
+        Parameters:
+        -----------
+        criteria : dict, optional
+            {colonne: valeurs acceptées} (les filtres de la barre latérale) ;
+            seules les colonnes de partitionnement élaguent, les autres sont
+            ignorées. Toutes les partitions si None.
+
+        Returns:
+        --------
+        list of dict
+        """
+        criteria = criteria or {}
+        accepted = {key: {json_value(v) for v in criteria[key]}
+                    for key in self.partition_by if key in criteria}
+        return [partition for partition in self.partitions
+                if all(partition['values'][key] in values for key, values in accepted.items())]
+
+    def rows(self, criteria=None):
+        """Nombre de lignes des partitions sélectionnées"""
+        return sum(partition['rows'] for partition in self.select(criteria))
+
+    def date_range(self, criteria=None):
+        """Dates d'occurrence minimale et maximale des partitions sélectionnées"""
+        selected = self.select(criteria)
+        starts = [p['date_min'] for p in selected if p['date_min'] is not None]
+        ends = [p['date_max'] for p in selected if p['date_max'] is not None]
+        if not starts:
+            return None, None
+        return pd.Timestamp(min(starts)), pd.Timestamp(max(ends))
+
+    def scope(self, key, selected):
+        """
+        Valeurs de ``key`` à charger pour une sélection de la barre latérale.
+
+        Returns:
+        --------
+        tuple or None
+            None quand la sélection couvre toutes les valeurs (ou aucune) : les
+            données complètes sont alors lues depuis l'instantané
+        """
+        available = self.values(key)
+        chosen = sorted({json_value(v) for v in selected} & set(available))
+        if not chosen or len(chosen) == len(available):
+            return None
+        return tuple(chosen)
+
+    def read(self, criteria=None, columns=None):
+        """
+        Lit les seules partitions compatibles avec ``criteria`` (lecture seule).
+
+        Parameters:
+        -----------
+        criteria : dict, optional
+            {colonne: valeurs acceptées} ; voir ``select``
+        columns : list of str, optional
+            Colonnes à lire (toutes si None)
+
+        Returns:
+        --------
+        pd.DataFrame
+            Lignes des partitions retenues, avec le schéma typé (aucune ligne,
+            mais les mêmes colonnes, si aucune partition ne correspond ou si
+            le jeu de données est vide)
+        """
+        import pyarrow as pa
+        from pyarrow import feather
+
+        if not self.partitions:
+            # Jeu de données vide : aucun fichier à lire, colonnes du manifeste et types déclarés
+            wanted = self.columns if columns is None else list(columns)
+            empty = pd.DataFrame({col: pd.Series(dtype=NUMERIC_DTYPES.get(col, 'object')) for col in wanted})
+            return read_only(apply_schema(empty))
+
+        selected = self.select(criteria)
+        files = [os.path.join(self.path, p['file']) for p in (selected or self.partitions[:1])]
+        tables = [feather.read_table(f, columns=columns, memory_map=True) for f in files]
+        table = pa.concat_tables(tables) if selected else tables[0].slice(0, 0)
+        return read_only(apply_schema(table.to_pandas(split_blocks=True)))
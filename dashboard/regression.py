@@ -0,0 +1,149 @@
+"""
+Régression linéaire en forme close
+==================================
+Moindres carrés simples (y = pente · x + ordonnée) calculés directement à
+partir des sommes pondérées, sans objet de résultats statsmodels : pente,
+ordonnée à l'origine, R² et bandes de confiance (droite ajustée) ou de
+prédiction (nouvelle observation) au niveau choisi.
+
+Plusieurs séries sont ajustées en un seul appel vectorisé (une série par
+ligne d'un tableau 2D) ; les valeurs manquantes sont ignorées série par
+série. Les poids optionnels donnent les mêmes estimations que ``WLS`` de
+statsmodels (par exemple, pondérer un taux par la population de la zone).
+"""
+
+import numpy as np
+
+DEFAULT_LEVEL = 0.95
+
+
+def as_series(values):
+    """Tableau 2D (séries × observations) en flottants"""
+    return np.atleast_2d(np.asarray(values, dtype=np.float64))
+
+
+def t_quantile(dof, level):
+    """Quantile bilatéral de la loi de Student (``scipy.special``, chargé au premier usage)"""
+    from scipy.special import stdtrit
+
+    return stdtrit(dof, 0.5 + level / 2)
+
+
+class LinearFit:
+    """
+    Droites ajustées par moindres carrés, une par série.
+
+    Les attributs sont des tableaux d'une valeur par série (NaN quand la
+    série a moins de deux observations ou un x constant).
+    """
+
+    def __init__(self, slope, intercept, r_squared, n, weight_sum, x_mean, sxx, residual_std):
+        self.slope = slope
+        self.intercept = intercept
+        self.r_squared = r_squared
+        self.n = n
+        self.weight_sum = weight_sum
+        self.x_mean = x_mean
+        self.sxx = sxx
+        self.residual_std = residual_std
+
+    def __len__(self):
+        return len(self.slope)
+
+    def __getitem__(self, i):
+        """Ajustement de la i-ème série seule"""
+        i = slice(i, i + 1) if isinstance(i, (int, np.integer)) else i
+        return LinearFit(self.slope[i], self.intercept[i], self.r_squared[i], self.n[i], self.weight_sum[i],
+                         self.x_mean[i], self.sxx[i], self.residual_std[i])
+
+    def predict(self, x):
+        """
+        Valeurs ajustées.
+
+        Parameters:
+        -----------
+        x : array-like
+            Abscisses, communes (1D) ou propres à chaque série (2D)
+
+        Returns:
+        --------
+        np.ndarray
+            (séries × abscisses)
+        """
+        return self.slope[:, None] * as_series(x) + self.intercept[:, None]
+
+    def bands(self, x, level=DEFAULT_LEVEL, prediction=False):
+        """
+        Bande de confiance de la droite (ou de prédiction d'une nouvelle observation).
+
+        Parameters:
+        -----------
+        x : array-like
+            Abscisses, communes (1D) ou propres à chaque série (2D)
+        level : float
+            Niveau de confiance
+        prediction : bool
+            Bande de prédiction (nouvelle observation de poids 1) plutôt que
+            de confiance sur la droite
+
+        Returns:
+        --------
+        tuple of np.ndarray
+            (borne basse, borne haute), (séries × abscisses) ; NaN sans degré
+            de liberté résiduel (deux observations ou moins)
+        """
+        x = as_series(x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = 1 / self.weight_sum[:, None] + (x - self.x_mean[:, None]) ** 2 / self.sxx[:, None]
+            if prediction:
+                variance = variance + 1
+            dof = np.where(self.n > 2, self.n - 2, np.nan)
+            half_width = t_quantile(dof, level)[:, None] * self.residual_std[:, None] * np.sqrt(variance)
+        fitted = self.predict(x)
+        return fitted - half_width, fitted + half_width
+
+
+def fit_ols(x, y, weights=None):
+    """
+    Ajuste y = pente · x + ordonnée sur une ou plusieurs séries.
+
+    Parameters:
+    -----------
+    x, y : array-like
+        Observations, 1D (une série) ou 2D (séries × observations) ; ``x``
+        1D peut être commun à plusieurs séries de ``y``
+    weights : array-like, optional
+        Poids des observations (moindres carrés pondérés), mêmes formes
+
+    Returns:
+    --------
+    LinearFit
+    """
+    x, y = np.broadcast_arrays(as_series(x), as_series(y))
+    w = np.ones_like(x) if weights is None else np.broadcast_to(as_series(weights), x.shape)
+    # Observations incomplètes ou de poids nul : exclues de leur série
+    valid = ~(np.isnan(x) | np.isnan(y) | np.isnan(w)) & (w > 0)
+    w = np.where(valid, w, 0.0)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    n = valid.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight_sum = w.sum(axis=1)
+        x_mean = (w * x).sum(axis=1) / weight_sum
+        y_mean = (w * y).sum(axis=1) / weight_sum
+        dx = np.where(valid, x - x_mean[:, None], 0.0)
+        dy = np.where(valid, y - y_mean[:, None], 0.0)
+        sxx = (w * dx * dx).sum(axis=1)
+        sxy = (w * dx * dy).sum(axis=1)
+        syy = (w * dy * dy).sum(axis=1)
+
+        defined = (n >= 2) & (sxx > 0)
+        slope = np.where(defined, sxy / sxx, np.nan)
+        intercept = y_mean - slope * x_mean
+        r_squared = np.where(syy > 0, sxy * sxy / (sxx * syy), np.nan)
+        # Somme pondérée des carrés des résidus, sur n - 2 degrés de liberté
+        residual_ss = np.maximum(syy - slope * sxy, 0.0)
+        residual_std = np.where(n > 2, np.sqrt(residual_ss / (n - 2)), np.nan)
+    return LinearFit(slope, intercept, np.where(defined, r_squared, np.nan), n, weight_sum,
+                     x_mean, sxx, residual_std)
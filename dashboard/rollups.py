@@ -0,0 +1,117 @@
+"""
+Agrégats temporels précalculés
+==============================
+Comptages quotidiens d'incidents par combinaison (zone, catégorie, moment de
+la journée, armes), construits une fois au chargement dans un tableau dense
+dont le dernier axe est le jour.
+
+Une série filtrée s'obtient en découpant ce tableau puis en sommant les
+dimensions de filtre ; les séries hebdomadaires et mensuelles sont ensuite
+regroupées à partir de la série quotidienne. Changer de granularité ou de
+filtres ne touche plus aux lignes.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import FILTER_COLUMNS
+
+# L'année est portée par l'axe des jours
+ROLLUP_DIMENSIONS = [col for col in FILTER_COLUMNS if col != 'year']
+
+# Fin de mois : alias 'ME' depuis pandas 2.2, où 'M' est déprécié
+MONTH_END = 'ME' if tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2) else 'M'
+
+# Fréquences pandas des granularités (bornes identiques à resample)
+FREQUENCIES = ['D', 'W', MONTH_END]
+
+
+class DailyRollup:
+    """
+    Comptages quotidiens par combinaison des dimensions de filtre.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Données transformées
+    date_column : str
+        Colonne de date des incidents
+    dimensions : list, optional
+        Dimensions de filtre conservées dans le tableau
+    """
+
+    def __init__(self, df, date_column='DATE OCC', dimensions=ROLLUP_DIMENSIONS):
+        self.dimensions = [col for col in dimensions if col in df.columns]
+        self._values = {}
+
+        dates = pd.to_datetime(df[date_column]).dt.normalize()
+        valid = dates.notna().to_numpy()
+        codes = []
+        for col in self.dimensions:
+            col_codes, uniques = pd.factorize(df[col], sort=True)
+            self._values[col] = pd.Index(uniques).tolist()
+            codes.append(col_codes)
+            valid &= col_codes >= 0
+
+        if valid.any():
+            start, end = dates[valid].min(), dates[valid].max()
+        else:
+            start = end = pd.Timestamp('1970-01-01')
+        self.days = pd.date_range(start, end, freq='D', name=date_column)
+
+        day_codes = ((dates[valid] - start) // pd.Timedelta(days=1)).to_numpy(dtype=np.int64)
+        shape = tuple(len(self._values[col]) for col in self.dimensions) + (len(self.days),)
+        flat = np.ravel_multi_index([c[valid] for c in codes] + [day_codes], shape)
+        counts = np.bincount(flat, minlength=int(np.prod(shape)))
+
+        dtype = np.int32 if counts.max(initial=0) < np.iinfo(np.int32).max else np.int64
+        self._cube = counts.astype(dtype).reshape(shape)
+        self._cube.flags.writeable = False
+        self._years = self.days.year.to_numpy()
+
+    def daily(self, criteria):
+        """
+        Série quotidienne d'une sélection, du premier au dernier jour non vide.
+
+        Parameters:
+        -----------
+        criteria : dict
+            {dimension de filtre: valeurs acceptées} ; 'year' filtre les jours
+        """
+        cube = self._cube
+        for axis, col in enumerate(self.dimensions):
+            if col not in criteria:
+                continue
+            lookup = {value: code for code, value in enumerate(self._values[col])}
+            wanted = sorted({lookup[v] for v in criteria[col] if v in lookup})
+            if len(wanted) < len(lookup):
+                cube = np.take(cube, wanted, axis=axis)
+
+        counts = cube.sum(axis=tuple(range(len(self.dimensions))), dtype=np.int64)
+        if 'year' in criteria:
+            counts = np.where(np.isin(self._years, list(criteria['year'])), counts, 0)
+
+        nonzero = np.flatnonzero(counts)
+        if len(nonzero) == 0:
+            return pd.Series([], index=self.days[:0], dtype=np.int64)
+        first, last = nonzero[0], nonzero[-1] + 1
+        return pd.Series(counts[first:last], index=self.days[first:last])
+
+    def series(self, criteria, freq='D'):
+        """
+        Nombre d'incidents par période (équivalent de ``resample(freq).size()``).
+
+        Parameters:
+        -----------
+        criteria : dict
+            {dimension de filtre: valeurs acceptées}
+        freq : str
+            'D' (jour), 'W' (semaine finissant le dimanche) ou ``MONTH_END`` (mois)
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Fréquence non prise en charge : {freq}")
+        daily = self.daily(criteria)
+        if freq == 'D':
+            return daily.asfreq('D')
+        # Regroupement de la série quotidienne, sans revenir aux lignes
+        return daily.resample(freq).sum()
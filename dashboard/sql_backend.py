@@ -0,0 +1,308 @@
+"""
+Backend SQLite des comptages
+============================
+Base SQLite sur disque (bibliothèque standard, sans serveur) construite par
+le pipeline (``python -m crime_pipeline --stages database``) : une table
+``incidents`` avec un index composite sur les dimensions de filtre (année,
+zone, catégorie, moment de la journée, armes).
+
+``SqlBackend`` traduit la sélection de la barre latérale en requêtes
+``GROUP BY`` indexées. Il expose la même interface que ``CountCube``
+(``counts``, ``total``, ``values``) : avec ``DASHBOARD_BACKEND=sqlite``, les
+graphiques du tableau de bord interrogent la base au lieu du cube en
+mémoire. Les connexions, en lecture seule, sont partagées par toutes les
+sessions via un pool borné.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import contextlib
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+from dashboard.filters import FILTER_COLUMNS
+from dashboard.storage import TRANSFORMED_CSV, apply_schema
+
+SQLITE_PATH = os.path.join('data', 'Crime_Data.sqlite')
+TABLE = 'incidents'
+
+# Index de la table : composite sur les dimensions de filtre (l'année en tête,
+# le filtre le plus souvent restreint). Les séries temporelles viennent des
+# comptages quotidiens en mémoire (``DailyRollup``) : pas d'index sur la date.
+INDEXES = {
+    'idx_incidents_filters': FILTER_COLUMNS,
+}
+
+DEFAULT_POOL_SIZE = 4
+
+# Lignes insérées par transaction lors de la construction
+INSERT_CHUNK_ROWS = 100_000
+
+
+def quote_identifier(name):
+    """Nom de colonne SQL (les colonnes ont des espaces : ``"AREA NAME"``)"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sql_value(value):
+    """Paramètre accepté par sqlite3 (scalaires NumPy convertis)"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def build_database(df, path=SQLITE_PATH, chunk_rows=INSERT_CHUNK_ROWS):
+    """
+    Écrit les données transformées dans une base SQLite indexée.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Données transformées, avec le schéma typé (``apply_schema``)
+    path : str
+        Fichier de la base (remplacé en bloc)
+    chunk_rows : int
+        Lignes insérées par transaction
+
+    Returns:
+    --------
+    int
+        Nombre de lignes écrites
+    """
+    # Écriture dans un fichier temporaire puis bascule, comme l'instantané
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    con = sqlite3.connect(tmp_path)
+    try:
+        # Construction hors ligne : ni journal ni synchronisation disque
+        con.execute('PRAGMA journal_mode = OFF')
+        con.execute('PRAGMA synchronous = OFF')
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            chunk.to_sql(TABLE, con, if_exists='append', index=False)
+        for name, columns in INDEXES.items():
+            present = [col for col in columns if col in df.columns]
+            if present:
+                con.execute(f"CREATE INDEX {name} ON {TABLE} ({', '.join(map(quote_identifier, present))})")
+        # Statistiques pour le planificateur de requêtes
+        con.execute('ANALYZE')
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp_path, path)
+    return len(df)
+
+
+def database_is_stale(csv_path=TRANSFORMED_CSV, path=SQLITE_PATH):
+    """Indique si la base est absente ou plus ancienne que le CSV source"""
+    if not os.path.exists(path):
+        return True
+    if not os.path.exists(csv_path):
+        return False
+    return os.path.getmtime(csv_path) > os.path.getmtime(path)
+
+
+class ConnectionPool:
+    """
+    Pool de connexions SQLite en lecture seule, partagé par les sessions.
+
+    Parameters:
+    -----------
+    path : str
+        Fichier de la base
+    size : int
+        Nombre maximal de connexions ouvertes ; au-delà, une requête attend
+        qu'une connexion se libère
+    """
+
+    def __init__(self, path=SQLITE_PATH, size=DEFAULT_POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        uri = f"file:{quote(os.path.abspath(self.path))}?mode=ro"
+        con = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        con.execute('PRAGMA query_only = ON')
+        return con
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Emprunte une connexion le temps d'un bloc ``with``"""
+        con = self._acquire()
+        try:
+            yield con
+        finally:
+            self._idle.put(con)
+
+    def _acquire(self):
+        """Connexion inactive, sinon nouvelle connexion si le pool n'est pas plein, sinon attente"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            return self._idle.get()
+        try:
+            return self._connect()
+        except sqlite3.Error:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def close(self):
+        """Ferme les connexions inactives"""
+        while True:
+            try:
+                con = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            con.close()
+            with self._lock:
+                self._opened -= 1
+
+
+class SqlBackend:
+    """
+    Requêtes de comptage sur la base SQLite, avec l'interface de ``CountCube``.
+
+    Parameters:
+    -----------
+    path : str
+        Fichier de la base (voir ``build_database``)
+    pool_size : int
+        Connexions simultanées au plus
+    dimensions : list, optional
+        Dimensions de filtre
+    """
+
+    def __init__(self, path=SQLITE_PATH, pool_size=DEFAULT_POOL_SIZE, dimensions=FILTER_COLUMNS):
+        self.path = path
+        self.pool = ConnectionPool(path, pool_size)
+        self.dimensions = list(dimensions)
+        self._values = {}
+
+    def query(self, sql, params=()):
+        """Exécute une requête et retourne toutes les lignes"""
+        with self.pool.connection() as con:
+            return con.execute(sql, [sql_value(p) for p in params]).fetchall()
+
+    def values(self, column):
+        """Valeurs distinctes triées d'une colonne (mémorisées)"""
+        if column not in self._values:
+            col = quote_identifier(column)
+            rows = self.query(f"SELECT DISTINCT {col} FROM {TABLE} WHERE {col} IS NOT NULL ORDER BY {col}")
+            self._values[column] = [row[0] for row in rows]
+        return list(self._values[column])
+
+    def where(self, criteria):
+        """
+        Clause WHERE d'une sélection.
+
+        Comme le cube, seules les lignes renseignées sur toutes les
+        dimensions de filtre sont comptées.
+
+        Returns:
+        --------
+        tuple
+            (clause SQL, paramètres)
+        """
+        clauses, params = [], []
+        for col in self.dimensions:
+            name = quote_identifier(col)
+            accepted = [sql_value(v) for v in criteria.get(col, ())]
+            known = set(self.values(col))
+            wanted = sorted({v for v in accepted if v in known})
+            if col not in criteria or len(wanted) == len(known):
+                clauses.append(f"{name} IS NOT NULL")
+            elif not wanted:
+                clauses.append("0")
+            else:
+                clauses.append(f"{name} IN ({', '.join('?' * len(wanted))})")
+                params.extend(wanted)
+        return ' AND '.join(clauses), params
+
+    def counts(self, criteria, by, drop_empty=True):
+        """
+        Comptages pour une sélection, ventilés selon un ou deux axes (``GROUP BY``).
+
+        Parameters:
+        -----------
+        criteria : dict
+            {dimension de filtre: valeurs acceptées}
+        by : str or tuple
+            Axe(s) de ventilation
+        drop_empty : bool
+            Retire les modalités sans incident (comme value_counts / crosstab)
+
+        Returns:
+        --------
+        pd.Series (un axe) ou pd.DataFrame (deux axes : index × colonnes),
+        avec les mêmes libellés et le même ordre que ``CountCube.counts``
+        """
+        by = (by,) if isinstance(by, str) else tuple(by)
+        clause, params = self.where(criteria)
+        columns = ', '.join(map(quote_identifier, by))
+        not_null = ''.join(f" AND {quote_identifier(col)} IS NOT NULL" for col in by)
+        rows = self.query(f"SELECT {columns}, COUNT(*) FROM {TABLE} WHERE {clause}{not_null} GROUP BY {columns}",
+                          params)
+
+        labels = []
+        for col in by:
+            values = self.values(col)
+            if col in criteria and col in self.dimensions:
+                accepted = {sql_value(v) for v in criteria[col]}
+                values = [v for v in values if v in accepted]
+            labels.append(pd.Index(values, name=col))
+
+        found = pd.DataFrame(rows, columns=list(by) + ['count'])
+        if len(by) == 1:
+            result = found.set_index(by[0])['count'].reindex(labels[0], fill_value=0).astype(np.int64)
+            return result[result > 0] if drop_empty else result
+
+        result = found.pivot_table(index=by[0], columns=by[1], values='count', aggfunc='sum', fill_value=0)
+        result = result.reindex(index=labels[0], columns=labels[1], fill_value=0).astype(np.int64)
+        if drop_empty:
+            result = result.loc[result.sum(axis=1) > 0, result.sum(axis=0) > 0]
+        return result
+
+    def total(self, criteria):
+        """Nombre total d'incidents d'une sélection"""
+        clause, params = self.where(criteria)
+        return int(self.query(f"SELECT COUNT(*) FROM {TABLE} WHERE {clause}", params)[0][0])
+
+    def kpis(self, criteria):
+        """
+        Âge moyen, taux d'armes (%) et délai moyen de signalement (comme ``compute_kpis``).
+
+        Sur une sélection vide, ``AVG`` renvoie NULL : les moyennes valent NaN
+        et le taux 0, comme avec pandas.
+        """
+        clause, params = self.where(criteria)
+        avg_age, weapon_rate, avg_delay = self.query(
+            f"SELECT AVG({quote_identifier('Vict Age')}), "
+            f"100.0 * SUM(weapon_involved = 1) / COUNT(*), "
+            f"AVG(reporting_delay_days) FROM {TABLE} WHERE {clause}",
+            params
+        )[0]
+        return (np.nan if avg_age is None else avg_age,
+                weapon_rate or 0,
+                np.nan if avg_delay is None else avg_delay)
+
+    def rows(self, criteria, columns=None):
+        """Lignes d'une sélection, avec le schéma typé (seules les lignes demandées sont lues)"""
+        clause, params = self.where(criteria)
+        selected = ', '.join(map(quote_identifier, columns)) if columns else '*'
+        with self.pool.connection() as con:
+            df = pd.read_sql_query(f"SELECT {selected} FROM {TABLE} WHERE {clause}", con,
+                                   params=[sql_value(p) for p in params])
+        return apply_schema(df)
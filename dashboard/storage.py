@@ -0,0 +1,229 @@
+"""
+Stockage en colonnes des données transformées
+=============================================
+Instantané Feather (Arrow IPC) de ``Crime_Data_Transformed.csv`` avec un schéma
+typé explicite : dates natives, chaînes peu cardinales encodées en dictionnaire
+(catégories pandas), indicateurs binaires en int8 et colonnes numériques
+compactées selon une table de types déclarée (entiers courts, float32).
+
+``memory_report`` compare l'empreinte mémoire, colonne par colonne, d'un
+DataFrame avant et après compaction.
+
+L'instantané est reconstruit automatiquement dès que le CSV source est plus
+récent que lui. Sans ``pyarrow``, on retombe sur la lecture du CSV.
+
+L'instantané est écrit sans compression et lu en projection mémoire : les
+colonnes numériques sans valeur manquante pointent directement dans le
+fichier, dont les pages sont partagées par tous les processus du serveur.
+Le DataFrame chargé est en lecture seule (``read_only``) : il est partagé
+par toutes les sessions et une écriture en place lève une erreur au lieu
+de le modifier.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+TRANSFORMED_CSV = os.path.join('data', 'Crime_Data_Transformed.csv')
+SNAPSHOT_PATH = os.path.join('data', 'Crime_Data_Transformed.feather')
+
+# Schéma explicite des données transformées
+DATE_COLUMNS = ['Date Rptd', 'DATE OCC']
+
+CATEGORY_COLUMNS = [
+    'AREA NAME', 'crime_category', 'time_period', 'day_name', 'month_name',
+    'crime_severity', 'victim_age_group', 'weapon_category', 'location_type',
+    'Vict Sex', 'Vict Descent', 'Crm Cd Desc', 'Premis Desc', 'Weapon Desc',
+    'Status', 'Status Desc'
+]
+
+FLAG_COLUMNS = ['weapon_involved', 'is_weekend']
+
+# Types compacts des colonnes numériques. Un entier n'est réduit que si la
+# colonne n'a pas de valeur manquante et tient dans le type cible ; les codes
+# avec valeurs manquantes restent flottants (float32 : exact jusqu'à 2**24).
+NUMERIC_DTYPES = {
+    'AREA': 'int8',
+    'Part 1-2': 'int8',
+    'Vict Age': 'int8',
+    'month': 'int8',
+    'day_of_week': 'int8',
+    'quarter': 'int8',
+    'hour': 'int8',
+    'year': 'int16',
+    'TIME OCC': 'int16',
+    'Rpt Dist No': 'int16',
+    'Crm Cd': 'int16',
+    'reporting_delay_days': 'int16',
+    'DR_NO': 'int32',
+    'area_crime_frequency': 'int32',
+    'total_cases': 'int32',
+    'population': 'int32',
+    'median_income': 'int32',
+    'Premis Cd': 'float32',
+    'Weapon Used Cd': 'float32',
+    'Crm Cd 1': 'float32',
+    'LAT': 'float32',
+    'LON': 'float32',
+    'area_risk_score': 'float32',
+    'area_size_sq_miles': 'float32',
+    'crimes_per_1000': 'float32'
+}
+
+
+def compact_numeric(series, dtype):
+    """
+    Convertit une colonne numérique vers son type compact.
+
+    La colonne est retournée inchangée si la conversion perdrait de
+    l'information (valeurs manquantes ou hors bornes pour un entier).
+    """
+    dtype = np.dtype(dtype)
+    if series.dtype == dtype or not pd.api.types.is_numeric_dtype(series.dtype):
+        return series
+    if dtype.kind == 'f':
+        return series.astype(dtype)
+
+    if series.isna().any():
+        return series
+    bounds = np.iinfo(dtype)
+    if len(series) and (series.min() < bounds.min or series.max() > bounds.max):
+        return series
+    if series.dtype.kind == 'f' and not (series % 1 == 0).all():
+        return series
+    return series.astype(dtype)
+
+
+def apply_schema(df):
+    """Applique le schéma typé (dates, catégories, indicateurs int8, types compacts) en place"""
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col])
+
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    for col in FLAG_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna(0).astype('int8')
+
+    for col, dtype in NUMERIC_DTYPES.items():
+        if col in df.columns:
+            df[col] = compact_numeric(df[col], dtype)
+
+    return df
+
+
+def memory_report(before, after):
+    """
+    Empreinte mémoire par colonne avant et après compaction.
+
+    Parameters:
+    -----------
+    before, after : pd.DataFrame
+        Mêmes données, avant et après ``apply_schema``
+
+    Returns:
+    --------
+    pd.DataFrame
+        Par colonne : type et mémoire (Mo) avant / après, gain en Mo, par
+        gain décroissant ; une ligne TOTAL termine le tableau
+    """
+    mb = 1024 * 1024
+    report = pd.DataFrame({
+        'type_avant': before.dtypes.astype(str),
+        'type_apres': after.dtypes.reindex(before.columns).astype(str),
+        'avant_mo': before.memory_usage(index=False, deep=True) / mb,
+        'apres_mo': after.memory_usage(index=False, deep=True).reindex(before.columns) / mb
+    })
+    report['gain_mo'] = report['avant_mo'] - report['apres_mo']
+    report = report.sort_values('gain_mo', ascending=False)
+    report.loc['TOTAL'] = ['', '', report['avant_mo'].sum(), report['apres_mo'].sum(), report['gain_mo'].sum()]
+    return report.round(2)
+
+
+def read_only(df):
+    """
+    Version en lecture seule d'un DataFrame, sans copie des données.
+
+    Chaque colonne repose sur un tableau NumPy non modifiable (les codes pour
+    les catégories) : ``df.loc[...] = ...`` ou une écriture dans ``.values``
+    lèvent ``ValueError``. Les colonnes restent dans des blocs séparés, ce
+    qui conserve le partage avec la projection mémoire de l'instantané.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            codes.flags.writeable = False
+            columns[col] = pd.Categorical.from_codes(codes, dtype=series.dtype)
+        elif isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+            values.flags.writeable = False
+            columns[col] = values
+        else:
+            columns[col] = series.array
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def read_transformed_csv(csv_path=TRANSFORMED_CSV):
+    """Lit le CSV transformé et lui applique le schéma typé"""
+    present = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {col: 'category' for col in CATEGORY_COLUMNS if col in present}
+    df = pd.read_csv(csv_path, dtype=dtypes)
+    return apply_schema(df)
+
+
+def snapshot_is_stale(csv_path=TRANSFORMED_CSV, snapshot_path=SNAPSHOT_PATH):
+    """Indique si l'instantané est absent ou plus ancien que le CSV source"""
+    if not os.path.exists(snapshot_path):
+        return True
+    if not os.path.exists(csv_path):
+        return False
+    return os.path.getmtime(csv_path) > os.path.getmtime(snapshot_path)
+
+
+def build_snapshot(csv_path=TRANSFORMED_CSV, snapshot_path=SNAPSHOT_PATH):
+    """Convertit le CSV transformé en instantané Feather et retourne le DataFrame"""
+    df = read_transformed_csv(csv_path).reset_index(drop=True)
+
+    # Écriture atomique : une session concurrente ne lit jamais un fichier partiel.
+    # Sans compression, pour que la lecture en projection mémoire évite toute copie.
+    tmp_path = f"{snapshot_path}.tmp-{os.getpid()}"
+    try:
+        df.to_feather(tmp_path, compression='uncompressed')
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        # Répertoire en lecture seule : on sert simplement les données du CSV
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return df
+
+
+def read_snapshot(snapshot_path=SNAPSHOT_PATH):
+    """Lit l'instantané en projection mémoire (une colonne par bloc, sans copie si possible)"""
+    from pyarrow import feather
+
+    table = feather.read_table(snapshot_path, memory_map=True)
+    # Sans effet sur un instantané à jour ; compacte un instantané antérieur à la table des types
+    return apply_schema(table.to_pandas(split_blocks=True))
+
+
+def load_transformed(csv_path=TRANSFORMED_CSV, snapshot_path=SNAPSHOT_PATH):
+    """Charge les données transformées (lecture seule) depuis l'instantané, reconstruit si nécessaire"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return read_only(read_transformed_csv(csv_path))
+
+    if snapshot_is_stale(csv_path, snapshot_path):
+        df = build_snapshot(csv_path, snapshot_path)
+        if snapshot_is_stale(csv_path, snapshot_path):
+            # Instantané non écrit (répertoire en lecture seule)
+            return read_only(df)
+
+    return read_only(read_snapshot(snapshot_path))
@@ -9,6 +9,10 @@ Options:
   menu        - Interactive menu
   test        - Test environment
   jupyter     - Open Jupyter notebooks
+  pipeline    - Rebuild the data files (clean → transform → aggregate → partition → database → global_view)
+                extra arguments are passed on, e.g. --stages transform aggregate
+  benchmark   - Time the dashboard computations on synthetic data
+                extra arguments are passed on, e.g. --rows 50k 1M
 """
 
 import sys
@@ -38,6 +42,16 @@ def open_jupyter():
     print("📓 Opening Jupyter Notebooks...")
     subprocess.run(["jupyter", "notebook", "notebooks/"])
 
+def run_pipeline():
+    """Run the data pipeline without Jupyter"""
+    print("⚙️ Running Data Pipeline...")
+    subprocess.run([sys.executable, "-m", "crime_pipeline"] + sys.argv[2:])
+
+def run_benchmarks():
+    """Run the dashboard benchmark suite"""
+    print("⏱️ Running Dashboard Benchmarks...")
+    subprocess.run([sys.executable, "-m", "benchmarks"] + sys.argv[2:])
+
 def show_help():
     """Show help message"""
     print(__doc__)
@@ -58,6 +72,10 @@ def main():
             test_environment()
         elif option in ['jupyter', 'notebook', 'j', 'n']:
             open_jupyter()
+        elif option in ['pipeline', 'p']:
+            run_pipeline()
+        elif option in ['benchmark', 'bench', 'b']:
+            run_benchmarks()
         elif option in ['help', 'h', '-h', '--help']:
             show_help()
         else:
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Cold-Load Benchmark
+===================
+Compares the historical CSV loading path of the dashboard (read_csv + two
+to_datetime passes) with the typed Feather snapshot used by load_data(),
+then reports the memory of each column before and after compaction (see
+``NUMERIC_DTYPES`` and ``CATEGORY_COLUMNS`` in dashboard/storage.py).
+
+Usage: python scripts/benchmark_load.py [--repeat N] [--columns N]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Run from the project root so that relative data paths resolve
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(PROJECT_ROOT)
+sys.path.insert(0, PROJECT_ROOT)
+
+import pandas as pd
+
+from dashboard.storage import TRANSFORMED_CSV, SNAPSHOT_PATH, build_snapshot, load_transformed, memory_report
+
+
+def print_section(title):
+    """Print a formatted section title"""
+    print("\n" + "=" * 70)
+    print(f"  {title}")
+    print("=" * 70)
+
+
+def load_csv_legacy():
+    """Historical load_data() body: full text parse plus two datetime passes"""
+    df = pd.read_csv(TRANSFORMED_CSV)
+    df['Date Rptd'] = pd.to_datetime(df['Date Rptd'])
+    df['DATE OCC'] = pd.to_datetime(df['DATE OCC'])
+    return df
+
+
+def load_snapshot():
+    """Snapshot load path (snapshot assumed up to date)"""
+    return load_transformed()
+
+
+def time_call(func, repeat):
+    """Return the best wall time over `repeat` runs and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    """Run the cold-load comparison"""
+    parser = argparse.ArgumentParser(description="Cold-load benchmark: CSV vs snapshot")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per loader (best time kept)")
+    parser.add_argument('--columns', type=int, default=15, help="Columns listed in the memory report (largest gain first)")
+    args = parser.parse_args()
+
+    if not os.path.exists(TRANSFORMED_CSV):
+        print(f"❌ {TRANSFORMED_CSV} not found - run the transformation step first")
+        return 1
+
+    print_section("COLD-LOAD BENCHMARK")
+    size_mb = os.path.getsize(TRANSFORMED_CSV) / (1024 * 1024)
+    print(f"Source: {TRANSFORMED_CSV} ({size_mb:.1f} MB)")
+
+    build_time, _ = time_call(lambda: build_snapshot(), 1)
+    snap_mb = os.path.getsize(SNAPSHOT_PATH) / (1024 * 1024)
+    print(f"Snapshot: {SNAPSHOT_PATH} ({snap_mb:.1f} MB), built in {build_time:.3f}s")
+
+    csv_time, csv_df = time_call(load_csv_legacy, args.repeat)
+    snap_time, snap_df = time_call(load_snapshot, args.repeat)
+
+    csv_mem = csv_df.memory_usage(deep=True).sum() / (1024 * 1024)
+    snap_mem = snap_df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+    print_section("RESULTS")
+    print(f"{'Loader':20s} {'Time (s)':>10s} {'Memory (MB)':>12s}")
+    print(f"{'CSV (legacy)':20s} {csv_time:10.3f} {csv_mem:12.1f}")
+    print(f"{'Feather snapshot':20s} {snap_time:10.3f} {snap_mem:12.1f}")
+    print(f"\n⚡ Speed-up: x{csv_time / snap_time:.1f}")
+
+    report = memory_report(csv_df, snap_df)
+    print_section("MEMORY BY COLUMN (MB)")
+    print(pd.concat([report.drop(index='TOTAL').head(args.columns), report.loc[['TOTAL']]]).to_string())
+    print(f"\n💾 Memory per loaded copy: {csv_mem:.1f} MB -> {snap_mem:.1f} MB "
+          f"(x{csv_mem / snap_mem:.1f} smaller)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Startup Import Profile
+======================
+Reports the import cost paid by every new dashboard process: the top-level
+imports of streamlit_app.py are replayed in a fresh interpreter under
+``python -X importtime`` and the time is attributed to each package.
+
+Libraries that the dashboard only loads when a chart or an export needs
+them are measured separately, on top of the startup imports.
+
+Usage: python scripts/profile_startup.py [--app streamlit_app.py] [--top N]
+"""
+
+import os
+import re
+import ast
+import sys
+import argparse
+import subprocess
+from collections import defaultdict
+
+# Run from the project root so that the dashboard package resolves
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(PROJECT_ROOT)
+
+# Loaded on first use only (trendlines, Parquet / Excel export)
+DEFERRED_MODULES = ['scipy.special', 'pyarrow.parquet', 'openpyxl']
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def print_section(title):
+    """Print a formatted section title"""
+    print("\n" + "=" * 70)
+    print(f"  {title}")
+    print("=" * 70)
+
+
+def startup_imports(app_path):
+    """Import statements executed at the top level of the app module"""
+    with open(app_path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=app_path)
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def profile_imports(statements, preload=()):
+    """
+    Run the import statements in a fresh interpreter under -X importtime.
+
+    Returns:
+    --------
+    dict
+        {top-level package: cumulative seconds}, for the modules imported by
+        ``statements`` only (``preload`` is imported first and not counted)
+    """
+    code = "\n".join(list(preload) + ["import sys", "sys.stderr.write('@@profile@@\\n')"] + list(statements))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, cwd=PROJECT_ROOT)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    log = result.stderr.split('@@profile@@\n', 1)[-1]
+    per_package = defaultdict(float)
+    for line in log.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Only the outermost imports: their cumulative time includes the nested ones
+        if match and len(match.group(3)) == 1:
+            per_package[match.group(4).split('.')[0]] += int(match.group(2)) / 1e6
+    return dict(per_package)
+
+
+def main():
+    """Print the startup and deferred import costs"""
+    parser = argparse.ArgumentParser(description="Per-module import time of the dashboard startup")
+    parser.add_argument('--app', default='streamlit_app.py', help="Streamlit script to profile")
+    parser.add_argument('--top', type=int, default=15, help="Packages listed (slowest first)")
+    args = parser.parse_args()
+
+    statements = startup_imports(args.app)
+    print_section("STARTUP IMPORTS")
+    for statement in statements:
+        print(f"   {statement}")
+
+    startup = profile_imports(statements)
+    total = sum(startup.values())
+    print_section("IMPORT TIME PER PACKAGE")
+    print(f"{'Package':25s} {'Time (s)':>10s} {'Share':>8s}")
+    for package, seconds in sorted(startup.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:25s} {seconds:10.3f} {seconds / total * 100:7.1f}%")
+    print(f"{'TOTAL':25s} {total:10.3f}")
+
+    print_section("DEFERRED IMPORTS (FIRST USE)")
+    for module in DEFERRED_MODULES:
+        try:
+            deferred = profile_imports([f"import {module}"], preload=statements)
+        except RuntimeError as error:
+            print(f"{module:25s} {'n/a':>10s}   ({error})")
+            continue
+        print(f"{module:25s} {sum(deferred.values()):10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,14 +14,33 @@ Date: Novembre 2025
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
+import os
+import uuid
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+from dashboard.storage import TRANSFORMED_CSV, SNAPSHOT_PATH, load_transformed
+from dashboard.filters import FilterIndex, filter_state_key
+from dashboard.cube import CountCube
+from dashboard.moments import MomentCube
+from dashboard.panels import AggregateCache, FigureCache, DEFAULT_BUDGET_MB, DEFAULT_FIGURE_BUDGET_MB
+from dashboard.spatial import SpatialGrid, ZOOM_LEVELS, DEFAULT_ZOOM
+from dashboard.rollups import DailyRollup
+from dashboard.regression import fit_ols
+from dashboard.histograms import bin_histogram, histogram_quantiles, histogram_stats
+from dashboard.global_view import GLOBAL_VIEW_PATH, GlobalView
+from dashboard.partitions import PARTITIONS_DIR, PartitionManifest, partitions_are_stale
+from dashboard.sql_backend import SQLITE_PATH, DEFAULT_POOL_SIZE, SqlBackend, database_is_stale
+from dashboard.aggregations import (CORR_VARS, by_frequency, compute_kpis, compute_area_stats,
+                                    compute_time_series, compute_area_weapon,
+                                    compute_correlation, compute_area_data)
+from dashboard.instrumentation import PERF_LOG_PATH, RenderProfiler, open_perf_log, summarize_log
+from dashboard.export import (EXPORT_FORMATS, EXCEL_MAX_ROWS, DEFAULT_EXPORT_BUDGET_MB, export_rows,
+                              export_file_name)
+
 # Configuration de la page
 st.set_page_config(
     page_title="Analyse Criminalité LA | Dashboard",
@@ -100,6 +119,27 @@ st.markdown("""
         font-weight: 600;
     }
     
+    /* Sélecteur d'onglet (radio horizontal affiché comme des onglets) */
+    div[role="radiogroup"]:has(> label) {
+        gap: 8px;
+    }
+    
+    .st-key-active_tab label[data-baseweb="radio"] {
+        border-radius: 10px 10px 0 0;
+        padding: 10px 20px;
+        font-weight: 600;
+        background-color: #f0f2f6;
+    }
+    
+    .st-key-active_tab label[data-baseweb="radio"]:has(input:checked) {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+    }
+    
+    .st-key-active_tab label[data-baseweb="radio"] > div:first-child {
+        display: none;
+    }
+    
     /* Footer */
     .footer {
         text-align: center;
@@ -112,15 +152,258 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Chargement des données avec mise en cache
-@st.cache_data
-def load_data():
-    """Charge et prétraite les données de criminalité"""
-    df = pd.read_csv('data/Crime_Data_Transformed.csv')
-    df['Date Rptd'] = pd.to_datetime(df['Date Rptd'])
-    df['DATE OCC'] = pd.to_datetime(df['DATE OCC'])
-    return df
+# Nombre de périmètres d'années (partitions) gardés en mémoire simultanément
+LOADED_SCOPES = 4
+
+# Manifeste des partitions annuelles écrites par le pipeline
+@st.cache_resource
+def get_partition_manifest(data_version):
+    """Manifeste des partitions (None s'il est absent ou plus ancien que le CSV source)"""
+    if partitions_are_stale(TRANSFORMED_CSV, PARTITIONS_DIR):
+        return None
+    return PartitionManifest.load(PARTITIONS_DIR)
+
+# Données chargées une fois par processus et partagées par toutes les sessions
+@st.cache_resource(max_entries=LOADED_SCOPES)
+def load_data(data_version, load_years=None):
+    """Charge les données de criminalité depuis l'instantané typé (Feather)
+
+    ``data_version`` (date de modification de la source) fait partie de la clé
+    de cache : un CSV plus récent invalide le cache et reconstruit l'instantané.
+    Le DataFrame n'est ni copié ni sérialisé à chaque accès : il est en lecture
+    seule et les filtres n'en extraient que des sous-ensembles.
+
+    ``load_years`` : années à lire dans les partitions (toutes, depuis
+    l'instantané, si None).
+    """
+    if load_years is None:
+        return load_transformed()
+    return get_partition_manifest(data_version).read({'year': load_years})
+
+# Index bitmap des filtres, construit une fois par version et périmètre des données
+@st.cache_resource(max_entries=LOADED_SCOPES)
+def get_filter_index(data_version, load_years=None):
+    """Construit l'index bitmap des dimensions de filtre"""
+    return FilterIndex(load_data(data_version, load_years))
+
+# Cube de comptages, construit une fois par version et périmètre des données
+@st.cache_resource(max_entries=LOADED_SCOPES)
+def get_count_cube(data_version, load_years=None):
+    """Précalcule les comptages sur les dimensions de filtre et les axes des graphiques"""
+    return CountCube(get_filter_index(data_version, load_years).df)
+
+# Moments des variables numériques par cellule de filtre (KPIs, corrélations)
+@st.cache_resource(max_entries=LOADED_SCOPES)
+def get_moment_cube(data_version, load_years=None):
+    """Précalcule effectifs, sommes, carrés et produits croisés par cellule de filtre"""
+    return MomentCube(get_filter_index(data_version, load_years).df)
+
+# Grille spatiale de la carte, construite une fois par version et périmètre des données
+@st.cache_resource(max_entries=LOADED_SCOPES)
+def get_spatial_grid(data_version, load_years=None):
+    """Prépare l'agrégation des incidents en mailles pour la carte"""
+    return SpatialGrid(get_filter_index(data_version, load_years).df)
+
+# Comptages quotidiens par combinaison de filtres, construits une fois par version et périmètre des données
+@st.cache_resource(max_entries=LOADED_SCOPES)
+def get_daily_rollup(data_version, load_years=None):
+    """Précalcule les comptages quotidiens pour la série temporelle"""
+    return DailyRollup(get_filter_index(data_version, load_years).df)
+
+# Backend des comptages des graphiques : 'pandas' (cube en mémoire) ou 'sqlite'
+# (base indexée construite par le pipeline, étape database)
+QUERY_BACKEND = os.environ.get('DASHBOARD_BACKEND', 'pandas')
+
+# Base SQLite et son pool de connexions, partagés par toutes les sessions
+@st.cache_resource
+def get_sql_backend(data_version):
+    """Backend SQLite ; taille du pool réglable via DASHBOARD_SQLITE_POOL (None si la base est absente ou périmée)"""
+    if database_is_stale(TRANSFORMED_CSV, SQLITE_PATH):
+        return None
+    pool_size = int(os.environ.get('DASHBOARD_SQLITE_POOL', DEFAULT_POOL_SIZE))
+    return SqlBackend(SQLITE_PATH, pool_size)
+
+# Agrégations de la vue par défaut, précalculées par le pipeline
+@st.cache_resource
+def get_global_view(data_version):
+    """Vue globale précalculée (None si l'artefact est absent ou ne correspond pas aux données)"""
+    return GlobalView.load(get_filter_index(data_version).df, GLOBAL_VIEW_PATH)
+
+# Cache des agrégations, partagé par toutes les sessions
+@st.cache_resource
+def get_aggregate_cache():
+    """Cache LRU des agrégations ; budget mémoire réglable via DASHBOARD_CACHE_MB"""
+    budget_mb = float(os.environ.get('DASHBOARD_CACHE_MB', DEFAULT_BUDGET_MB))
+    return AggregateCache(max_bytes=int(budget_mb * 1024 * 1024))
+
+# Figures Plotly, partagées par toutes les sessions
+@st.cache_resource
+def get_figure_cache():
+    """Cache LRU des figures ; budget mémoire réglable via DASHBOARD_FIGURE_CACHE_MB"""
+    budget_mb = float(os.environ.get('DASHBOARD_FIGURE_CACHE_MB', DEFAULT_FIGURE_BUDGET_MB))
+    return FigureCache(max_bytes=int(budget_mb * 1024 * 1024))
+
+# Fichiers exportés, partagés par toutes les sessions
+@st.cache_resource
+def get_export_cache():
+    """Cache LRU des exports ; budget mémoire réglable via DASHBOARD_EXPORT_CACHE_MB"""
+    budget_mb = float(os.environ.get('DASHBOARD_EXPORT_CACHE_MB', DEFAULT_EXPORT_BUDGET_MB))
+    return AggregateCache(max_bytes=int(budget_mb * 1024 * 1024))
+
+# Journal des mesures de performance, partagé par toutes les sessions
+@st.cache_resource
+def get_perf_log():
+    """Journal à rotation des mesures ; chemin réglable via DASHBOARD_PERF_LOG (vide : désactivé)"""
+    path = os.environ.get('DASHBOARD_PERF_LOG', PERF_LOG_PATH)
+    return open_perf_log(path) if path else None
+
+def get_data_version():
+    """Version des données : date de modification du CSV source ou de l'instantané"""
+    for path in (TRANSFORMED_CSV, SNAPSHOT_PATH):
+        if os.path.exists(path):
+            return os.path.getmtime(path)
+    return None
+
+# =====================================
+# FIGURES DES ONGLETS
+# =====================================
+def build_incident_map(map_cells, zoom):
+    """Carte des incidents agrégés par maille (onglet 2)"""
+    fig = px.scatter_mapbox(
+        map_cells,
+        lat='LAT',
+        lon='LON',
+        color='crime_category',
+        size='incidents',
+        size_max=30,
+        hover_data={'incidents': ':,', 'part_dominante': ':.1f', 'LAT': False, 'LON': False},
+        labels={'incidents': 'Incidents', 'crime_category': 'Catégorie dominante',
+                'part_dominante': 'Part de la catégorie (%)'},
+        zoom=zoom,
+        height=600,
+        title="<b>Localisation des Crimes à Los Angeles</b>",
+        mapbox_style="carto-positron",
+        color_discrete_sequence=px.colors.qualitative.Bold
+    )
+    fig.update_layout(
+        font=dict(size=12),
+        title_font_size=16,
+        margin=dict(l=0, r=0, t=40, b=0)
+    )
+    return fig
+
+def build_age_histogram(age_counts):
+    """Histogramme de l'âge des victimes (onglet 4), à partir des effectifs par âge"""
+    bins = bin_histogram(age_counts)
+    width = int(bins['end'].iloc[0] - bins['start'].iloc[0] + 1) if len(bins) else 1
+    ranges = [f"{start}" if width == 1 else f"{start}–{end}" for start, end in zip(bins['start'], bins['end'])]
+    fig = go.Figure(go.Bar(
+        x=bins['start'] + width / 2 - 0.5,
+        y=bins['count'],
+        width=width,
+        customdata=ranges,
+        marker_color='#667eea',
+        hovertemplate="Âge=%{customdata}<br>Fréquence=%{y}<extra></extra>"
+    ))
+    fig.update_layout(
+        title="<b>Histogramme de l'Âge des Victimes</b>",
+        xaxis_title='Âge',
+        yaxis_title='Fréquence',
+        bargap=0,
+        showlegend=False,
+        font=dict(size=12),
+        title_font_size=16
+    )
+    return fig
 
+def add_ols_trendline(fig, fit, x, x_label, y_label, points=50):
+    """
+    Ajoute la droite des moindres carrés et sa bande de confiance à 95 % à un nuage de points.
+
+    Parameters:
+    -----------
+    fig : go.Figure
+        Nuage de points
+    fit : LinearFit
+        Ajustement d'une seule série (``fit_ols``)
+    x : pd.Series
+        Abscisses du nuage (étendue de la droite)
+    x_label, y_label : str
+        Libellés des axes, pour l'info-bulle
+    points : int
+        Abscisses de la bande (courbe)
+    """
+    if not np.isfinite(fit.slope[0]):
+        return fig
+    grid = np.linspace(x.min(), x.max(), points)
+    lower, upper = fit.bands(grid)
+    if np.isfinite(lower).all():
+        fig.add_trace(go.Scatter(
+            x=np.r_[grid, grid[::-1]],
+            y=np.r_[upper[0], lower[0][::-1]],
+            fill='toself',
+            fillcolor='rgba(99, 110, 250, 0.15)',
+            line=dict(width=0),
+            hoverinfo='skip',
+            showlegend=False
+        ))
+    fig.add_trace(go.Scatter(
+        x=grid,
+        y=fit.predict(grid)[0],
+        mode='lines',
+        line=dict(color='#636efa'),
+        hovertemplate=(f"<b>Tendance OLS</b><br>{y_label} = {fit.slope[0]:g} * {x_label} + {fit.intercept[0]:g}"
+                       f"<br>R<sup>2</sup>={fit.r_squared[0]:.6f}<br><br>{x_label}=%{{x}}<br>{y_label}=%{{y}} "
+                       "<b>(tendance)</b><extra></extra>"),
+        showlegend=False
+    ))
+    return fig
+
+def build_population_scatter(area_data, fit):
+    """Population vs taux de criminalité avec tendance OLS (onglet 6)"""
+    fig = px.scatter(
+        area_data,
+        x='population',
+        y='crime_rate',
+        hover_data=['AREA NAME'],
+        title="<b>Population vs Taux de Criminalité (pour 1000 hab.)</b>",
+        labels={'population': 'Population', 'crime_rate': 'Taux de Criminalité'},
+        color='crime_rate',
+        color_continuous_scale='Reds',
+        size='DR_NO'
+    )
+    add_ols_trendline(fig, fit, area_data['population'], 'Population', 'Taux de Criminalité')
+    fig.update_layout(
+        font=dict(size=11),
+        title_font_size=14,
+        showlegend=False
+    )
+    return fig
+
+def build_income_scatter(area_data, fit):
+    """Revenu médian vs nombre de crimes avec tendance OLS (onglet 6)"""
+    fig = px.scatter(
+        area_data,
+        x='median_income',
+        y='DR_NO',
+        hover_data=['AREA NAME'],
+        title="<b>Revenu vs Total des Crimes</b>",
+        labels={'median_income': 'Revenu Médian', 'DR_NO': 'Total des Crimes'},
+        color='DR_NO',
+        color_continuous_scale='Viridis',
+        size='population'
+    )
+    add_ols_trendline(fig, fit, area_data['median_income'], 'Revenu Médian', 'Total des Crimes')
+    fig.update_layout(
+        font=dict(size=11),
+        title_font_size=14,
+        showlegend=False
+    )
+    return fig
+
+# =====================================
+# ONGLET 1 : VUE D'ENSEMBLE
+# =====================================
 # En-tête principal avec présentation du projet
 st.markdown("""
     <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
@@ -158,7 +441,7 @@ with st.expander("📖 À propos de ce projet - Cliquez pour en savoir plus", ex
     ✅ **Filtres interactifs** pour personnaliser votre analyse  
     ✅ **Visualisations dynamiques** avec graphiques interactifs  
     ✅ **Statistiques en temps réel** basées sur vos sélections  
-    ✅ **Export des données** filtrées au format CSV
+    ✅ **Export des données** filtrées (CSV compressé, Parquet ou Excel)
     
     ### 📝 Comment utiliser ce dashboard :
     
@@ -173,15 +456,7 @@ with st.expander("📖 À propos de ce projet - Cliquez pour en savoir plus", ex
 
 st.markdown("<br>", unsafe_allow_html=True)
 
-# Chargement des données avec animation
-with st.spinner('🔄 Chargement des données criminelles en cours...'):
-    df = load_data()
-
-st.success(f"✅ **{len(df):,} incidents** chargés avec succès !")
-
-# =====================================
-# PANNEAU DE FILTRES (SIDEBAR)
-# =====================================
+# En-tête de la barre latérale affiché avant le chargement des données
 st.sidebar.markdown("""
     <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
                 padding: 20px; border-radius: 15px; margin-bottom: 20px;'>
@@ -192,21 +467,61 @@ st.sidebar.markdown("""
     </div>
     """, unsafe_allow_html=True)
 
+# Instrumentation : temps, lignes et mémoire de chaque section (panneau ⚙️ Performance)
+perf_session = st.session_state.setdefault('perf_session', uuid.uuid4().hex[:8])
+profiler = RenderProfiler(perf_session, get_perf_log())
+profiler.start('total')
+
+# =====================================
+# PANNEAU DE FILTRES (SIDEBAR)
+# =====================================
+# Avec les données partitionnées par le pipeline, les années sont lues dans le
+# manifeste : seules les partitions des années sélectionnées sont chargées
+data_version = get_data_version()
+partition_manifest = get_partition_manifest(data_version)
+
 # Filtre par Année
 st.sidebar.markdown("### 📅 Période d'Analyse")
-years = sorted(df['year'].unique())
+if partition_manifest is not None:
+    years = partition_manifest.values('year')
+else:
+    years = get_filter_index(data_version).values('year')
 selected_years = st.sidebar.multiselect(
     "Sélectionnez la/les année(s) :",
     options=years,
     default=years,
     help="Choisissez une ou plusieurs années pour filtrer les données"
 )
+load_years = partition_manifest.scope('year', selected_years) if partition_manifest is not None else None
+if load_years is not None:
+    first_date, last_date = partition_manifest.date_range({'year': load_years})
+    st.sidebar.caption(
+        f"📦 {len(partition_manifest.select({'year': load_years}))} partition(s) lue(s) sur "
+        f"{len(partition_manifest.partitions)} · {partition_manifest.rows({'year': load_years}):,} incidents "
+        f"du {first_date:%d/%m/%Y} au {last_date:%d/%m/%Y}"
+    )
 
 st.sidebar.markdown("---")
 
+# Chargement des données avec animation
+# (grille de la carte et série temporelle : construites au premier affichage de leur onglet)
+with st.spinner('🔄 Chargement des données criminelles en cours...'), profiler.section('chargement') as timing:
+    filter_index = get_filter_index(data_version, load_years)
+    # Backend SQLite : les comptages sont des GROUP BY indexés, le cube n'est pas construit
+    sql_backend = get_sql_backend(data_version) if QUERY_BACKEND == 'sqlite' else None
+    count_cube = sql_backend if sql_backend is not None else get_count_cube(data_version, load_years)
+    df = filter_index.df
+    timing.rows = len(df)
+# Taille du jeu complet, même quand seules quelques partitions sont chargées
+total_rows = len(df) if load_years is None else partition_manifest.rows()
+
+st.success(f"✅ **{len(df):,} incidents** chargés avec succès !")
+
+profiler.start('filtres')
+
 # Filtre par Zone géographique
 st.sidebar.markdown("### 📍 Zones Géographiques")
-areas = sorted(df['AREA NAME'].unique())
+areas = filter_index.values('AREA NAME')
 area_selection_mode = st.sidebar.radio(
     "Mode de sélection des zones :",
     options=["Toutes les zones", "Sélection personnalisée", "Top zones"],
@@ -217,7 +532,7 @@ if area_selection_mode == "Toutes les zones":
     selected_areas = areas
 elif area_selection_mode == "Top zones":
     top_n = st.sidebar.slider("Nombre de zones à afficher :", 5, 20, 10)
-    top_areas = df['AREA NAME'].value_counts().head(top_n).index.tolist()
+    top_areas = filter_index.value_counts('AREA NAME').sort_values(ascending=False).head(top_n).index.tolist()
     selected_areas = top_areas
 else:
     selected_areas = st.sidebar.multiselect(
@@ -231,7 +546,7 @@ st.sidebar.markdown("---")
 
 # Filtre par Catégorie de Crime
 st.sidebar.markdown("### 🚨 Types de Crimes")
-crime_categories = sorted(df['crime_category'].unique())
+crime_categories = filter_index.values('crime_category')
 selected_categories = st.sidebar.multiselect(
     "Sélectionnez les catégories :",
     options=crime_categories,
@@ -243,7 +558,7 @@ st.sidebar.markdown("---")
 
 # Filtre par Période de la Journée
 st.sidebar.markdown("### ⏰ Moment de la Journée")
-time_periods = sorted(df['time_period'].unique())
+time_periods = filter_index.values('time_period')
 selected_time_periods = st.sidebar.multiselect(
     "Sélectionnez les plages horaires :",
     options=time_periods,
@@ -261,19 +576,52 @@ weapon_filter = st.sidebar.selectbox(
     help="Filtrer selon l'implication d'armes dans les crimes"
 )
 
-# Application des filtres
-filtered_df = df[
-    (df['year'].isin(selected_years)) &
-    (df['AREA NAME'].isin(selected_areas)) &
-    (df['crime_category'].isin(selected_categories)) &
-    (df['time_period'].isin(selected_time_periods))
-]
-
 # Filtre armes
 if weapon_filter == "Avec armes uniquement":
-    filtered_df = filtered_df[filtered_df['weapon_involved'] == 1]
+    selected_weapons = [1]
 elif weapon_filter == "Sans armes uniquement":
-    filtered_df = filtered_df[filtered_df['weapon_involved'] == 0]
+    selected_weapons = [0]
+else:
+    selected_weapons = filter_index.values('weapon_involved')
+
+# Application des filtres : combinaison des bitmaps précalculés
+filter_criteria = {
+    'year': selected_years,
+    'AREA NAME': selected_areas,
+    'crime_category': selected_categories,
+    'time_period': selected_time_periods,
+    'weapon_involved': selected_weapons
+}
+selection = filter_index.select(filter_criteria)
+profiler.stop('filtres', rows=selection.count)
+
+# Agrégations mémorisées sous l'empreinte de la sélection (partagées entre sessions)
+filter_key = filter_state_key(filter_criteria, data_version)
+aggregate_cache = get_aggregate_cache()
+# Aucun filtre actif : les agrégations sont lues dans la vue globale du pipeline
+global_view = get_global_view(data_version) if selection.is_identity and load_years is None else None
+
+def memoize(name, compute, *options):
+    """Résultat mémorisé d'une agrégation pour l'état courant des filtres"""
+    if global_view is not None and global_view.has(name, *options):
+        return global_view.get(name, *options)
+    return aggregate_cache.get(filter_key, name, compute, *options)
+
+# Figures mémorisées sous la même empreinte
+figure_cache = get_figure_cache()
+
+def show_figure(chart_id, build, *options):
+    """Affiche une figure mémorisée ; ``build`` (agrégation et construction) n'est appelé qu'en cas d'absence"""
+    st.plotly_chart(figure_cache.figure(filter_key, chart_id, build, *options), use_container_width=True)
+
+# KPIs et corrélations : fusion des moments par cellule de filtre, sans relire les lignes
+def selection_moments():
+    """Moments de la sélection (None si le cube ne couvre pas la sélection)"""
+    moment_cube = get_moment_cube(data_version, load_years)
+    # Sans filtre, les lignes sans valeur sur une dimension comptent aussi : le cube les ignore
+    if selection.is_identity and not moment_cube.complete:
+        return None
+    return moment_cube.moments(filter_criteria)
 
 st.sidebar.markdown("---")
 
@@ -283,13 +631,13 @@ st.sidebar.markdown(f"""
     <div style='background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); 
                 padding: 15px; border-radius: 10px; color: white;'>
         <p style='margin: 0; font-size: 16px; font-weight: bold;'>
-            📈 {len(filtered_df):,} incidents
+            📈 {selection.count:,} incidents
         </p>
         <p style='margin: 5px 0 0 0; font-size: 14px;'>
-            sur {len(df):,} au total
+            sur {total_rows:,} au total
         </p>
         <p style='margin: 5px 0 0 0; font-size: 14px;'>
-            ({len(filtered_df)/len(df)*100:.1f}% des données)
+            ({selection.count/total_rows*100:.1f}% des données)
         </p>
     </div>
     """, unsafe_allow_html=True)
@@ -302,16 +650,24 @@ if st.sidebar.button("🔄 Réinitialiser tous les filtres", use_container_width
 # =====================================
 # INDICATEURS CLÉS (KPIs)
 # =====================================
+profiler.start('kpis')
 st.markdown("## 📊 Indicateurs Clés en un Coup d'Œil")
 st.markdown("<br>", unsafe_allow_html=True)
 
 # Calcul des métriques
-total_crimes = len(filtered_df)
-total_percentage = (len(filtered_df)/len(df)*100)
-avg_victim_age = filtered_df['Vict Age'].mean()
-weapon_rate = (filtered_df['weapon_involved'].sum() / len(filtered_df) * 100) if len(filtered_df) > 0 else 0
-unique_areas = filtered_df['AREA NAME'].nunique()
-avg_delay = filtered_df['reporting_delay_days'].mean() if 'reporting_delay_days' in filtered_df.columns else 0
+total_crimes = selection.count
+total_percentage = (selection.count/total_rows*100)
+
+def selection_kpis():
+    """Âge moyen, taux d'armes et délai moyen de la sélection"""
+    if sql_backend is not None:
+        return sql_backend.kpis(filter_criteria)
+    moments = selection_moments()
+    return moments.kpis() if moments is not None else compute_kpis(selection.rows)
+
+avg_victim_age, weapon_rate, avg_delay = memoize('kpis', selection_kpis)
+area_counts = by_frequency(count_cube.counts(filter_criteria, 'AREA NAME'))
+unique_areas = len(area_counts)
 
 # Création des cartes KPI
 col1, col2, col3, col4, col5 = st.columns(5)
@@ -368,9 +724,10 @@ with col5:
     """, unsafe_allow_html=True)
 
 st.markdown("<br><br>", unsafe_allow_html=True)
+profiler.stop('kpis', rows=selection.count)
 
 # Message d'alerte si pas de données
-if len(filtered_df) == 0:
+if selection.count == 0:
     st.error("⚠️ Aucune donnée ne correspond aux filtres sélectionnés. Veuillez ajuster vos critères.")
     st.stop()
 
@@ -379,19 +736,26 @@ st.markdown("---")
 # =====================================
 # ONGLETS D'ANALYSE
 # =====================================
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+# Seul l'onglet actif est calculé : les autres ne coûtent rien
+TAB_LABELS = [
     "📊 Vue d'Ensemble", 
     "🗺️ Analyse Géographique", 
     "⏰ Tendances Temporelles", 
     "👥 Profil des Victimes", 
     "🔫 Analyse des Armes",
     "📈 Corrélations & Tendances"
-])
+]
+active_tab = st.radio(
+    "Onglet d'analyse :",
+    options=TAB_LABELS,
+    horizontal=True,
+    key="active_tab",
+    label_visibility="collapsed"
+)
+tab_container = st.container()
 
-# =====================================
-# ONGLET 1 : VUE D'ENSEMBLE
-# =====================================
-with tab1:
+def render_overview():
+    """Onglet 1 : Vue d'Ensemble"""
     st.markdown("## 📊 Distribution Générale des Crimes")
     st.markdown("*Aperçu complet de la répartition des crimes par catégorie et type*")
     st.markdown("<br>", unsafe_allow_html=True)
@@ -400,28 +764,30 @@ with tab1:
     
     with col1:
         st.markdown("### 🎯 Répartition par Catégorie")
-        category_counts = filtered_df['crime_category'].value_counts()
+        category_counts = by_frequency(count_cube.counts(filter_criteria, 'crime_category'))
         
-        fig = px.pie(
-            values=category_counts.values,
-            names=category_counts.index,
-            title="<b>Distribution des Catégories de Crimes</b>",
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        fig.update_traces(
-            textposition='inside', 
-            textinfo='percent+label',
-            textfont_size=12,
-            marker=dict(line=dict(color='white', width=2))
-        )
-        fig.update_layout(
-            font=dict(size=12),
-            title_font_size=16,
-            showlegend=True,
-            legend=dict(orientation="v", yanchor="middle", y=0.5)
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def category_figure():
+            fig = px.pie(
+                values=category_counts.values,
+                names=category_counts.index,
+                title="<b>Distribution des Catégories de Crimes</b>",
+                hole=0.4,
+                color_discrete_sequence=px.colors.qualitative.Set3
+            )
+            fig.update_traces(
+                textposition='inside', 
+                textinfo='percent+label',
+                textfont_size=12,
+                marker=dict(line=dict(color='white', width=2))
+            )
+            fig.update_layout(
+                font=dict(size=12),
+                title_font_size=16,
+                showlegend=True,
+                legend=dict(orientation="v", yanchor="middle", y=0.5)
+            )
+            return fig
+        show_figure('tab1.category', category_figure)
         
         st.info(f"""
         **💡 Insight :** La catégorie la plus fréquente est 
@@ -431,26 +797,29 @@ with tab1:
     
     with col2:
         st.markdown("### 🔝 Top 10 des Types de Crimes")
-        top_crimes = filtered_df['Crm Cd Desc'].value_counts().head(10)
+        crime_type_counts = by_frequency(count_cube.counts(filter_criteria, 'Crm Cd Desc'))
+        top_crimes = crime_type_counts.head(10)
         
-        fig = px.bar(
-            x=top_crimes.values,
-            y=top_crimes.index,
-            orientation='h',
-            title="<b>Les 10 Crimes les Plus Fréquents</b>",
-            labels={'x': 'Nombre de Cas', 'y': 'Type de Crime'},
-            color=top_crimes.values,
-            color_continuous_scale='Reds'
-        )
-        fig.update_layout(
-            showlegend=False, 
-            yaxis={'categoryorder':'total ascending'},
-            font=dict(size=11),
-            title_font_size=16,
-            xaxis_title="Nombre de cas",
-            yaxis_title=""
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def crime_types_figure():
+            fig = px.bar(
+                x=top_crimes.values,
+                y=top_crimes.index,
+                orientation='h',
+                title="<b>Les 10 Crimes les Plus Fréquents</b>",
+                labels={'x': 'Nombre de Cas', 'y': 'Type de Crime'},
+                color=top_crimes.values,
+                color_continuous_scale='Reds'
+            )
+            fig.update_layout(
+                showlegend=False, 
+                yaxis={'categoryorder':'total ascending'},
+                font=dict(size=11),
+                title_font_size=16,
+                xaxis_title="Nombre de cas",
+                yaxis_title=""
+            )
+            return fig
+        show_figure('tab1.crime_types', crime_types_figure)
         
         st.info(f"""
         **💡 Insight :** Le crime le plus commun est 
@@ -467,29 +836,32 @@ with tab1:
     col3, col4 = st.columns([2, 1])
     
     with col3:
-        severity_counts = filtered_df['crime_severity'].value_counts()
+        severity_counts = by_frequency(count_cube.counts(filter_criteria, 'crime_severity'))
         
-        fig = px.bar(
-            x=severity_counts.index,
-            y=severity_counts.values,
-            title="<b>Distribution par Niveau de Gravité</b>",
-            labels={'x': 'Niveau de Gravité', 'y': 'Nombre de Crimes'},
-            color=severity_counts.values,
-            color_continuous_scale='Viridis',
-            text=severity_counts.values
-        )
-        fig.update_traces(texttemplate='%{text:,}', textposition='outside')
-        fig.update_layout(
-            font=dict(size=12),
-            title_font_size=16,
-            xaxis_title="Gravité",
-            yaxis_title="Nombre de crimes"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def severity_figure():
+            fig = px.bar(
+                x=severity_counts.index,
+                y=severity_counts.values,
+                title="<b>Distribution par Niveau de Gravité</b>",
+                labels={'x': 'Niveau de Gravité', 'y': 'Nombre de Crimes'},
+                color=severity_counts.values,
+                color_continuous_scale='Viridis',
+                text=severity_counts.values
+            )
+            fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+            fig.update_layout(
+                font=dict(size=12),
+                title_font_size=16,
+                xaxis_title="Gravité",
+                yaxis_title="Nombre de crimes"
+            )
+            return fig
+        show_figure('tab1.severity', severity_figure)
     
     with col4:
         st.markdown("#### 📋 Tableau Récapitulatif")
-        stats_df = filtered_df[['crime_category', 'crime_severity']].value_counts().head(10).reset_index()
+        category_severity = count_cube.counts(filter_criteria, ('crime_category', 'crime_severity')).stack()
+        stats_df = by_frequency(category_severity[category_severity > 0]).head(10).reset_index()
         stats_df.columns = ['Catégorie', 'Gravité', 'Nombre']
         st.dataframe(
             stats_df,
@@ -501,10 +873,10 @@ with tab1:
         <div style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
                     padding: 15px; border-radius: 10px; color: white; margin-top: 20px;'>
             <p style='margin: 0; font-size: 14px; font-weight: bold;'>
-                📊 Total Catégories : {filtered_df['crime_category'].nunique()}
+                📊 Total Catégories : {len(category_counts)}
             </p>
             <p style='margin: 5px 0 0 0; font-size: 14px;'>
-                🎯 Types Uniques : {filtered_df['Crm Cd Desc'].nunique()}
+                🎯 Types Uniques : {len(crime_type_counts)}
             </p>
         </div>
         """, unsafe_allow_html=True)
@@ -512,7 +884,8 @@ with tab1:
 # =====================================
 # ONGLET 2 : ANALYSE GÉOGRAPHIQUE
 # =====================================
-with tab2:
+def render_geography():
+    """Onglet 2 : Analyse Géographique"""
     st.markdown("## 🗺️ Distribution Géographique des Crimes")
     st.markdown("*Analyse spatiale pour identifier les zones à risque*")
     st.markdown("<br>", unsafe_allow_html=True)
@@ -521,44 +894,39 @@ with tab2:
     
     with col1:
         st.markdown("### 📍 Top 15 des Zones les Plus Touchées")
-        top_areas = filtered_df['AREA NAME'].value_counts().head(15)
+        top_areas = area_counts.head(15)
         
-        fig = px.bar(
-            x=top_areas.values,
-            y=top_areas.index,
-            orientation='h',
-            title="<b>Classement des Quartiers par Nombre de Crimes</b>",
-            labels={'x': 'Nombre de Crimes', 'y': 'Nom du Quartier'},
-            color=top_areas.values,
-            color_continuous_scale='Reds',
-            text=top_areas.values
-        )
-        fig.update_traces(texttemplate='%{text:,}', textposition='outside')
-        fig.update_layout(
-            yaxis={'categoryorder':'total ascending'}, 
-            height=500,
-            font=dict(size=11),
-            title_font_size=16,
-            xaxis_title="Nombre de crimes",
-            yaxis_title=""
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def area_ranking_figure():
+            fig = px.bar(
+                x=top_areas.values,
+                y=top_areas.index,
+                orientation='h',
+                title="<b>Classement des Quartiers par Nombre de Crimes</b>",
+                labels={'x': 'Nombre de Crimes', 'y': 'Nom du Quartier'},
+                color=top_areas.values,
+                color_continuous_scale='Reds',
+                text=top_areas.values
+            )
+            fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+            fig.update_layout(
+                yaxis={'categoryorder':'total ascending'}, 
+                height=500,
+                font=dict(size=11),
+                title_font_size=16,
+                xaxis_title="Nombre de crimes",
+                yaxis_title=""
+            )
+            return fig
+        show_figure('tab2.area_ranking', area_ranking_figure)
         
         st.warning(f"""
         ⚠️ **Zone la plus à risque :** {top_areas.index[0]} avec **{top_areas.values[0]:,} incidents** 
-        ({top_areas.values[0]/len(filtered_df)*100:.1f}% du total des crimes)
+        ({top_areas.values[0]/total_crimes*100:.1f}% du total des crimes)
         """)
     
     with col2:
         st.markdown("### 📊 Statistiques par Zone")
-        area_stats = filtered_df.groupby('AREA NAME').agg({
-            'DR_NO': 'count',
-            'area_risk_score': 'mean',
-            'population': 'first',
-            'median_income': 'first'
-        }).round(2)
-        area_stats.columns = ['Crimes', 'Score Risque', 'Population', 'Revenu']
-        area_stats = area_stats.sort_values('Crimes', ascending=False).head(10)
+        area_stats = memoize('tab2.area_stats', lambda: compute_area_stats(selection.rows))
         st.dataframe(area_stats, use_container_width=True, height=500)
         
         st.success(f"""
@@ -571,29 +939,24 @@ with tab2:
     st.markdown("### 🗺️ Carte Interactive des Incidents")
     st.markdown("*Visualisation géographique des emplacements de crimes*")
     
-    # Échantillonnage pour performance
-    map_data = filtered_df[['LAT', 'LON', 'crime_category']].dropna()
-    if len(map_data) > 5000:
-        map_data = map_data.sample(5000)
-        st.info(f"ℹ️ Pour des performances optimales, affichage d'un échantillon de 5 000 incidents sur {len(filtered_df[['LAT', 'LON']].dropna()):,}")
-    
-    fig = px.scatter_mapbox(
-        map_data,
-        lat='LAT',
-        lon='LON',
-        color='crime_category',
-        zoom=9,
-        height=600,
-        title="<b>Localisation des Crimes à Los Angeles</b>",
-        mapbox_style="carto-positron",
-        color_discrete_sequence=px.colors.qualitative.Bold
+    # Agrégation en mailles : tous les incidents sont comptés, la taille suit le zoom
+    map_zoom = st.select_slider(
+        "Niveau de zoom :",
+        options=ZOOM_LEVELS,
+        value=DEFAULT_ZOOM,
+        help="Plus le zoom est élevé, plus les mailles d'agrégation sont fines"
     )
-    fig.update_layout(
-        font=dict(size=12),
-        title_font_size=16,
-        margin=dict(l=0, r=0, t=40, b=0)
+    spatial_grid = get_spatial_grid(data_version, load_years)
+    map_cells = memoize(
+        'tab2.map_cells',
+        lambda: spatial_grid.aggregate(map_zoom, None if selection.is_identity else selection.mask),
+        map_zoom
     )
-    st.plotly_chart(fig, use_container_width=True)
+    st.info(f"ℹ️ {map_cells['incidents'].sum():,} incidents regroupés en {len(map_cells):,} mailles "
+            f"d'environ {spatial_grid.cell_size_km(map_zoom):.1f} km · "
+            f"couleur : catégorie dominante, taille : nombre d'incidents")
+    
+    show_figure('tab2.incident_map', lambda: build_incident_map(map_cells, map_zoom), map_zoom)
     
     st.markdown("---")
     
@@ -601,33 +964,36 @@ with tab2:
     st.markdown("### 📊 Comparaison des Catégories par Zone")
     st.markdown("*Top 5 des zones avec répartition détaillée par type de crime*")
     
-    top_5_areas = filtered_df['AREA NAME'].value_counts().head(5).index
-    area_category = pd.crosstab(
-        filtered_df[filtered_df['AREA NAME'].isin(top_5_areas)]['AREA NAME'],
-        filtered_df[filtered_df['AREA NAME'].isin(top_5_areas)]['crime_category']
-    )
-    
-    fig = px.bar(
-        area_category,
-        barmode='group',
-        title="<b>Catégories de Crimes dans les 5 Zones les Plus Touchées</b>",
-        labels={'value': 'Nombre de Crimes', 'AREA NAME': 'Quartier'},
-        color_discrete_sequence=px.colors.qualitative.Pastel
-    )
-    fig.update_layout(
-        font=dict(size=12),
-        title_font_size=16,
-        xaxis_title="Quartier",
-        yaxis_title="Nombre de crimes",
-        legend_title="Catégorie",
-        height=500
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def area_category_figure():
+        top_5_areas = area_counts.head(5).index
+        area_category = count_cube.counts(
+            {**filter_criteria, 'AREA NAME': top_5_areas},
+            ('AREA NAME', 'crime_category')
+        )
+        
+        fig = px.bar(
+            area_category,
+            barmode='group',
+            title="<b>Catégories de Crimes dans les 5 Zones les Plus Touchées</b>",
+            labels={'value': 'Nombre de Crimes', 'AREA NAME': 'Quartier'},
+            color_discrete_sequence=px.colors.qualitative.Pastel
+        )
+        fig.update_layout(
+            font=dict(size=12),
+            title_font_size=16,
+            xaxis_title="Quartier",
+            yaxis_title="Nombre de crimes",
+            legend_title="Catégorie",
+            height=500
+        )
+        return fig
+    show_figure('tab2.area_category', area_category_figure)
 
 # =====================================
 # ONGLET 3 : TENDANCES TEMPORELLES
 # =====================================
-with tab3:
+def render_temporal():
+    """Onglet 3 : Tendances Temporelles"""
     st.markdown("## ⏰ Analyse Temporelle des Crimes")
     st.markdown("*Découvrez les patterns et tendances dans le temps*")
     st.markdown("<br>", unsafe_allow_html=True)
@@ -648,50 +1014,46 @@ with tab3:
     with col_agg2:
         show_trend = st.checkbox("Afficher la tendance", value=True)
     
-    df_ts = filtered_df.set_index('DATE OCC').sort_index()
-    
-    if time_agg == "Quotidien":
-        time_series = df_ts.resample('D').size()
-        window = 7
-    elif time_agg == "Hebdomadaire":
-        time_series = df_ts.resample('W').size()
-        window = 4
-    else:
-        time_series = df_ts.resample('M').size()
-        window = 3
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=time_series.index,
-        y=time_series.values,
-        mode='lines',
-        name='Nombre de Crimes',
-        line=dict(color='#667eea', width=2.5),
-        fill='tozeroy',
-        fillcolor='rgba(102, 126, 234, 0.1)'
-    ))
+    time_series, window = memoize(
+        'tab3.time_series',
+        lambda: compute_time_series(get_daily_rollup(data_version, load_years), filter_criteria, time_agg),
+        time_agg
+    )
     
-    if show_trend and time_agg == "Quotidien":
-        rolling_avg = time_series.rolling(window=window).mean()
+    def time_series_figure():
+        fig = go.Figure()
         fig.add_trace(go.Scatter(
-            x=rolling_avg.index,
-            y=rolling_avg.values,
+            x=time_series.index,
+            y=time_series.values,
             mode='lines',
-            name=f'Moyenne Mobile ({window} jours)',
-            line=dict(color='#ff7f0e', width=3, dash='dash')
+            name='Nombre de Crimes',
+            line=dict(color='#667eea', width=2.5),
+            fill='tozeroy',
+            fillcolor='rgba(102, 126, 234, 0.1)'
         ))
     
-    fig.update_layout(
-        title=f"<b>Tendance {time_agg}e des Crimes</b>",
-        xaxis_title="Date",
-        yaxis_title="Nombre de Crimes",
-        hovermode='x unified',
-        height=450,
-        font=dict(size=12),
-        title_font_size=16,
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+        if show_trend and time_agg == "Quotidien":
+            rolling_avg = time_series.rolling(window=window).mean()
+            fig.add_trace(go.Scatter(
+                x=rolling_avg.index,
+                y=rolling_avg.values,
+                mode='lines',
+                name=f'Moyenne Mobile ({window} jours)',
+                line=dict(color='#ff7f0e', width=3, dash='dash')
+            ))
+        
+        fig.update_layout(
+            title=f"<b>Tendance {time_agg}e des Crimes</b>",
+            xaxis_title="Date",
+            yaxis_title="Nombre de Crimes",
+            hovermode='x unified',
+            height=450,
+            font=dict(size=12),
+            title_font_size=16,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+        )
+        return fig
+    show_figure('tab3.time_series', time_series_figure, time_agg, show_trend)
     
     # Stats de la série temporelle
     col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
@@ -714,60 +1076,64 @@ with tab3:
         st.markdown("#### 📆 Par Jour de la Semaine")
         day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         day_names_fr = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
-        day_counts = filtered_df['day_name'].value_counts().reindex(day_order)
+        day_counts = count_cube.counts(filter_criteria, 'day_name').reindex(day_order)
         
-        fig = px.bar(
-            x=day_names_fr,
-            y=day_counts.values,
-            title="<b>Crimes par Jour</b>",
-            labels={'x': 'Jour', 'y': 'Nombre'},
-            color=day_counts.values,
-            color_continuous_scale='Blues',
-            text=day_counts.values
-        )
-        fig.update_traces(texttemplate='%{text:,}', textposition='outside')
-        fig.update_layout(font=dict(size=10), title_font_size=14, xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        def day_figure():
+            fig = px.bar(
+                x=day_names_fr,
+                y=day_counts.values,
+                title="<b>Crimes par Jour</b>",
+                labels={'x': 'Jour', 'y': 'Nombre'},
+                color=day_counts.values,
+                color_continuous_scale='Blues',
+                text=day_counts.values
+            )
+            fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+            fig.update_layout(font=dict(size=10), title_font_size=14, xaxis_tickangle=-45)
+            return fig
+        show_figure('tab3.day', day_figure)
         
         max_day_idx = day_counts.values.argmax()
         st.caption(f"🔝 Jour le plus criminel : **{day_names_fr[max_day_idx]}**")
     
     with col2:
         st.markdown("#### 📅 Par Mois")
-        month_order = ['January', 'February', 'March', 'April', 'May', 'June',
-                       'July', 'August', 'September', 'October', 'November', 'December']
         month_names_fr = ['Jan', 'Fév', 'Mar', 'Avr', 'Mai', 'Jun',
                          'Jul', 'Aoû', 'Sep', 'Oct', 'Nov', 'Déc']
-        month_counts = filtered_df['month_name'].value_counts().reindex(month_order)
+        month_counts = count_cube.counts(filter_criteria, 'month').reindex(range(1, 13))
         
-        fig = px.line(
-            x=month_names_fr,
-            y=month_counts.values,
-            title="<b>Crimes par Mois</b>",
-            labels={'x': 'Mois', 'y': 'Nombre'},
-            markers=True
-        )
-        fig.update_traces(line_color='#f5576c', line_width=3, marker=dict(size=10))
-        fig.update_layout(font=dict(size=10), title_font_size=14)
-        st.plotly_chart(fig, use_container_width=True)
+        def month_figure():
+            fig = px.line(
+                x=month_names_fr,
+                y=month_counts.values,
+                title="<b>Crimes par Mois</b>",
+                labels={'x': 'Mois', 'y': 'Nombre'},
+                markers=True
+            )
+            fig.update_traces(line_color='#f5576c', line_width=3, marker=dict(size=10))
+            fig.update_layout(font=dict(size=10), title_font_size=14)
+            return fig
+        show_figure('tab3.month', month_figure)
         
         max_month_idx = month_counts.values.argmax()
         st.caption(f"🔝 Mois le plus criminel : **{month_names_fr[max_month_idx]}**")
     
     with col3:
         st.markdown("#### 🕐 Par Heure")
-        hour_counts = filtered_df['hour'].value_counts().sort_index()
+        hour_counts = count_cube.counts(filter_criteria, 'hour')
         
-        fig = px.line(
-            x=hour_counts.index,
-            y=hour_counts.values,
-            title="<b>Crimes par Heure</b>",
-            labels={'x': 'Heure', 'y': 'Nombre'},
-            markers=True
-        )
-        fig.update_traces(line_color='#764ba2', line_width=3, marker=dict(size=8))
-        fig.update_layout(font=dict(size=10), title_font_size=14)
-        st.plotly_chart(fig, use_container_width=True)
+        def hour_figure():
+            fig = px.line(
+                x=hour_counts.index,
+                y=hour_counts.values,
+                title="<b>Crimes par Heure</b>",
+                labels={'x': 'Heure', 'y': 'Nombre'},
+                markers=True
+            )
+            fig.update_traces(line_color='#764ba2', line_width=3, marker=dict(size=8))
+            fig.update_layout(font=dict(size=10), title_font_size=14)
+            return fig
+        show_figure('tab3.hour', hour_figure)
         
         max_hour = hour_counts.idxmax()
         st.caption(f"🔝 Heure la plus criminelle : **{max_hour}h**")
@@ -784,20 +1150,22 @@ with tab3:
                              'Afternoon (12:00-17:59)', 'Evening (18:00-23:59)']
         time_names_fr = ['🌙 Nuit\n(00h-06h)', '🌅 Matin\n(06h-12h)', 
                         '☀️ Après-midi\n(12h-18h)', '🌆 Soirée\n(18h-00h)']
-        time_counts = filtered_df['time_period'].value_counts().reindex(time_period_order)
+        time_counts = count_cube.counts(filter_criteria, 'time_period').reindex(time_period_order)
         
-        fig = px.bar(
-            x=time_names_fr,
-            y=time_counts.values,
-            title="<b>Répartition des Crimes selon le Moment de la Journée</b>",
-            labels={'x': 'Période', 'y': 'Nombre de Crimes'},
-            color=time_counts.values,
-            color_continuous_scale='Sunset',
-            text=time_counts.values
-        )
-        fig.update_traces(texttemplate='%{text:,}', textposition='outside')
-        fig.update_layout(font=dict(size=12), title_font_size=16, showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        def time_period_figure():
+            fig = px.bar(
+                x=time_names_fr,
+                y=time_counts.values,
+                title="<b>Répartition des Crimes selon le Moment de la Journée</b>",
+                labels={'x': 'Période', 'y': 'Nombre de Crimes'},
+                color=time_counts.values,
+                color_continuous_scale='Sunset',
+                text=time_counts.values
+            )
+            fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+            fig.update_layout(font=dict(size=12), title_font_size=16, showlegend=False)
+            return fig
+        show_figure('tab3.time_period', time_period_figure)
     
     with col_period2:
         st.markdown("#### 💡 Insights Clés")
@@ -839,27 +1207,29 @@ with tab3:
     st.markdown("### 🔥 Carte de Chaleur : Jour × Heure")
     st.markdown("*Visualisation des périodes les plus criminelles*")
     
-    heatmap_data = pd.crosstab(filtered_df['day_name'], filtered_df['hour'])
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    day_names_fr_full = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
-    heatmap_data = heatmap_data.reindex(day_order)
-    heatmap_data.index = day_names_fr_full
-    
-    fig = px.imshow(
-        heatmap_data,
-        labels=dict(x="Heure de la Journée", y="Jour de la Semaine", color="Nombre de Crimes"),
-        x=heatmap_data.columns,
-        y=heatmap_data.index,
-        color_continuous_scale='YlOrRd',
-        aspect="auto",
-        title="<b>Intensité Criminelle par Jour et Heure</b>"
-    )
-    fig.update_layout(
-        height=450,
-        font=dict(size=12),
-        title_font_size=16
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def day_hour_figure():
+        heatmap_data = count_cube.counts(filter_criteria, ('day_name', 'hour'))
+        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        day_names_fr_full = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
+        heatmap_data = heatmap_data.reindex(day_order)
+        heatmap_data.index = day_names_fr_full
+        
+        fig = px.imshow(
+            heatmap_data,
+            labels=dict(x="Heure de la Journée", y="Jour de la Semaine", color="Nombre de Crimes"),
+            x=heatmap_data.columns,
+            y=heatmap_data.index,
+            color_continuous_scale='YlOrRd',
+            aspect="auto",
+            title="<b>Intensité Criminelle par Jour et Heure</b>"
+        )
+        fig.update_layout(
+            height=450,
+            font=dict(size=12),
+            title_font_size=16
+        )
+        return fig
+    show_figure('tab3.day_hour', day_hour_figure)
     
     st.info("""
     💡 **Comment lire cette carte :** Les zones plus foncées (rouge) indiquent des périodes 
@@ -869,7 +1239,8 @@ with tab3:
 # =====================================
 # ONGLET 4 : PROFIL DES VICTIMES
 # =====================================
-with tab4:
+def render_victims():
+    """Onglet 4 : Profil des Victimes"""
     st.markdown("## 👥 Analyse Démographique des Victimes")
     st.markdown("*Qui sont les victimes de crimes à Los Angeles ?*")
     st.markdown("<br>", unsafe_allow_html=True)
@@ -882,37 +1253,39 @@ with tab4:
                      'Senior (50-64)', 'Elderly (65+)']
         age_names_fr = ['👶 Enfants\n(0-17 ans)', '🧑 Jeunes Adultes\n(18-34 ans)', 
                        '👨 Adultes\n(35-49 ans)', '👴 Seniors\n(50-64 ans)', '🧓 Âgés\n(65+ ans)']
-        age_counts = filtered_df['victim_age_group'].value_counts()
+        age_counts = by_frequency(count_cube.counts(filter_criteria, 'victim_age_group'))
         age_counts = age_counts.reindex([a for a in age_order if a in age_counts.index])
         
         # Mapping pour les labels français
         age_mapping = dict(zip(age_order, age_names_fr))
         age_labels_fr = [age_mapping.get(age, age) for age in age_counts.index]
         
-        fig = px.bar(
-            x=age_labels_fr,
-            y=age_counts.values,
-            title="<b>Victimes par Tranche d'Âge</b>",
-            labels={'x': 'Tranche d\'Âge', 'y': 'Nombre de Victimes'},
-            color=age_counts.values,
-            color_continuous_scale='Teal',
-            text=age_counts.values
-        )
-        fig.update_traces(texttemplate='%{text:,}', textposition='outside')
-        fig.update_layout(
-            font=dict(size=11), 
-            title_font_size=16,
-            showlegend=False,
-            xaxis_tickangle=-45
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def age_group_figure():
+            fig = px.bar(
+                x=age_labels_fr,
+                y=age_counts.values,
+                title="<b>Victimes par Tranche d'Âge</b>",
+                labels={'x': 'Tranche d\'Âge', 'y': 'Nombre de Victimes'},
+                color=age_counts.values,
+                color_continuous_scale='Teal',
+                text=age_counts.values
+            )
+            fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+            fig.update_layout(
+                font=dict(size=11), 
+                title_font_size=16,
+                showlegend=False,
+                xaxis_tickangle=-45
+            )
+            return fig
+        show_figure('tab4.age_group', age_group_figure)
         
         most_affected_age = age_labels_fr[0] if len(age_labels_fr) > 0 else "N/A"
         st.info(f"👥 **Groupe le plus touché :** {most_affected_age} avec {age_counts.values[0]:,} victimes")
     
     with col2:
         st.markdown("### 🚻 Répartition par Genre")
-        sex_counts = filtered_df['Vict Sex'].value_counts().head(5)
+        sex_counts = by_frequency(count_cube.counts(filter_criteria, 'Vict Sex')).head(5)
         
         # Mapping genre en français
         gender_mapping = {
@@ -924,21 +1297,23 @@ with tab4:
         }
         sex_labels_fr = [gender_mapping.get(sex, sex) for sex in sex_counts.index]
         
-        fig = px.pie(
-            values=sex_counts.values,
-            names=sex_labels_fr,
-            title="<b>Victimes par Genre</b>",
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Pastel
-        )
-        fig.update_traces(
-            textposition='inside', 
-            textinfo='percent+label',
-            textfont_size=13,
-            marker=dict(line=dict(color='white', width=2))
-        )
-        fig.update_layout(font=dict(size=12), title_font_size=16)
-        st.plotly_chart(fig, use_container_width=True)
+        def sex_figure():
+            fig = px.pie(
+                values=sex_counts.values,
+                names=sex_labels_fr,
+                title="<b>Victimes par Genre</b>",
+                hole=0.4,
+                color_discrete_sequence=px.colors.qualitative.Pastel
+            )
+            fig.update_traces(
+                textposition='inside', 
+                textinfo='percent+label',
+                textfont_size=13,
+                marker=dict(line=dict(color='white', width=2))
+            )
+            fig.update_layout(font=dict(size=12), title_font_size=16)
+            return fig
+        show_figure('tab4.sex', sex_figure)
         
         if len(sex_counts) > 0:
             top_gender = sex_labels_fr[0]
@@ -952,27 +1327,22 @@ with tab4:
     
     col_hist1, col_hist2 = st.columns([3, 1])
     
+    # Effectifs par année d'âge, fusionnés depuis le cube : l'histogramme et les
+    # statistiques en sont déduits exactement, sans relire les âges
+    def vict_age_counts():
+        return memoize('tab4.age_counts', lambda: count_cube.counts(filter_criteria, 'Vict Age'))
+    
     with col_hist1:
-        fig = px.histogram(
-            filtered_df,
-            x='Vict Age',
-            nbins=50,
-            title="<b>Histogramme de l'Âge des Victimes</b>",
-            labels={'Vict Age': 'Âge', 'count': 'Fréquence'},
-            color_discrete_sequence=['#667eea']
-        )
-        fig.update_layout(
-            showlegend=False,
-            font=dict(size=12),
-            title_font_size=16
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure('tab4.age_histogram', lambda: build_age_histogram(vict_age_counts()))
     
     with col_hist2:
         st.markdown("#### 📊 Statistiques")
-        st.metric("Âge Moyen", f"{filtered_df['Vict Age'].mean():.1f} ans")
-        st.metric("Âge Médian", f"{filtered_df['Vict Age'].median():.0f} ans")
-        st.metric("Écart-type", f"{filtered_df['Vict Age'].std():.1f}")
+        age_mean, age_median, age_std = memoize('tab4.age_stats', lambda: histogram_stats(vict_age_counts()))
+        st.metric("Âge Moyen", f"{age_mean:.1f} ans")
+        st.metric("Âge Médian", f"{age_median:.0f} ans")
+        st.metric("Écart-type", f"{age_std:.1f}")
+        age_q1, age_q3 = memoize('tab4.age_quartiles', lambda: histogram_quantiles(vict_age_counts(), [0.25, 0.75]))
+        st.caption(f"Quartiles : {age_q1:.0f} – {age_q3:.0f} ans")
     
     st.markdown("---")
     
@@ -980,32 +1350,31 @@ with tab4:
     st.markdown("### 🎯 Profil des Victimes par Type de Crime")
     st.markdown("*Analyse croisée : catégories de crimes × tranches d'âge*")
     
-    demo_category = pd.crosstab(
-        filtered_df['crime_category'],
-        filtered_df['victim_age_group']
-    )
-    
-    # Réordonner les colonnes
-    age_order_demo = ['Child (0-17)', 'Young Adult (18-34)', 'Middle Age (35-49)', 
-                      'Senior (50-64)', 'Elderly (65+)']
-    demo_category = demo_category[[col for col in age_order_demo if col in demo_category.columns]]
-    
-    fig = px.bar(
-        demo_category,
-        barmode='stack',
-        title="<b>Répartition des Tranches d'Âge selon les Catégories de Crimes</b>",
-        labels={'value': 'Nombre de Cas', 'crime_category': 'Catégorie de Crime'},
-        color_discrete_sequence=px.colors.qualitative.Set2
-    )
-    fig.update_layout(
-        font=dict(size=12),
-        title_font_size=16,
-        xaxis_title="Catégorie de Crime",
-        yaxis_title="Nombre de victimes",
-        legend_title="Tranche d'Âge",
-        height=500
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def category_age_figure():
+        demo_category = count_cube.counts(filter_criteria, ('crime_category', 'victim_age_group'))
+        
+        # Réordonner les colonnes
+        age_order_demo = ['Child (0-17)', 'Young Adult (18-34)', 'Middle Age (35-49)', 
+                          'Senior (50-64)', 'Elderly (65+)']
+        demo_category = demo_category[[col for col in age_order_demo if col in demo_category.columns]]
+        
+        fig = px.bar(
+            demo_category,
+            barmode='stack',
+            title="<b>Répartition des Tranches d'Âge selon les Catégories de Crimes</b>",
+            labels={'value': 'Nombre de Cas', 'crime_category': 'Catégorie de Crime'},
+            color_discrete_sequence=px.colors.qualitative.Set2
+        )
+        fig.update_layout(
+            font=dict(size=12),
+            title_font_size=16,
+            xaxis_title="Catégorie de Crime",
+            yaxis_title="Nombre de victimes",
+            legend_title="Tranche d'Âge",
+            height=500
+        )
+        return fig
+    show_figure('tab4.category_age', category_age_figure)
     
     st.success("""
     💡 **Analyse :** Ce graphique montre comment les différentes tranches d'âge sont affectées 
@@ -1016,7 +1385,8 @@ with tab4:
 # =====================================
 # ONGLET 5 : ANALYSE DES ARMES
 # =====================================
-with tab5:
+def render_weapons():
+    """Onglet 5 : Analyse des Armes"""
     st.markdown("## 🔫 Analyse de l'Implication des Armes")
     st.markdown("*Étude de l'utilisation d'armes dans les crimes*")
     st.markdown("<br>", unsafe_allow_html=True)
@@ -1025,7 +1395,7 @@ with tab5:
     
     with col1:
         st.markdown("### 📊 Présence d'Armes")
-        weapon_counts = filtered_df['weapon_involved'].value_counts()
+        weapon_counts = count_cube.counts(filter_criteria, 'weapon_involved')
         
         # Créer les labels et valeurs en fonction des données disponibles
         weapon_data = []
@@ -1042,21 +1412,23 @@ with tab5:
             weapon_labels_display.append('🔫 Avec Arme')
             weapon_colors.append('#FF6B6B')
         
-        fig = px.pie(
-            values=weapon_data,
-            names=weapon_labels_display,
-            title="<b>Proportion Globale d'Utilisation d'Armes</b>",
-            color_discrete_sequence=weapon_colors,
-            hole=0.5
-        )
-        fig.update_traces(
-            textposition='inside', 
-            textinfo='percent+label',
-            textfont_size=14,
-            marker=dict(line=dict(color='white', width=3))
-        )
-        fig.update_layout(font=dict(size=12), title_font_size=16)
-        st.plotly_chart(fig, use_container_width=True)
+        def weapon_share_figure():
+            fig = px.pie(
+                values=weapon_data,
+                names=weapon_labels_display,
+                title="<b>Proportion Globale d'Utilisation d'Armes</b>",
+                color_discrete_sequence=weapon_colors,
+                hole=0.5
+            )
+            fig.update_traces(
+                textposition='inside', 
+                textinfo='percent+label',
+                textfont_size=14,
+                marker=dict(line=dict(color='white', width=3))
+            )
+            fig.update_layout(font=dict(size=12), title_font_size=16)
+            return fig
+        show_figure('tab5.weapon_share', weapon_share_figure)
         
         #Calcul du pourcentage d'incidents avec armes
         if 1 in weapon_counts.index:
@@ -1073,25 +1445,28 @@ with tab5:
     
     with col2:
         st.markdown("### 🔪 Catégories d'Armes")
-        weapon_cat = filtered_df[filtered_df['weapon_involved'] == 1]['weapon_category'].value_counts()
+        armed_criteria = {**filter_criteria, 'weapon_involved': [w for w in selected_weapons if w == 1]}
+        weapon_cat = by_frequency(count_cube.counts(armed_criteria, 'weapon_category'))
         
-        fig = px.bar(
-            x=weapon_cat.index,
-            y=weapon_cat.values,
-            title="<b>Types d'Armes Utilisées</b>",
-            labels={'x': 'Catégorie d\'Arme', 'y': 'Nombre de Cas'},
-            color=weapon_cat.values,
-            color_continuous_scale='Reds',
-            text=weapon_cat.values
-        )
-        fig.update_traces(texttemplate='%{text:,}', textposition='outside')
-        fig.update_layout(
-            font=dict(size=11), 
-            title_font_size=16,
-            showlegend=False,
-            xaxis_tickangle=-45
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def weapon_category_figure():
+            fig = px.bar(
+                x=weapon_cat.index,
+                y=weapon_cat.values,
+                title="<b>Types d'Armes Utilisées</b>",
+                labels={'x': 'Catégorie d\'Arme', 'y': 'Nombre de Cas'},
+                color=weapon_cat.values,
+                color_continuous_scale='Reds',
+                text=weapon_cat.values
+            )
+            fig.update_traces(texttemplate='%{text:,}', textposition='outside')
+            fig.update_layout(
+                font=dict(size=11), 
+                title_font_size=16,
+                showlegend=False,
+                xaxis_tickangle=-45
+            )
+            return fig
+        show_figure('tab5.weapon_category', weapon_category_figure)
         
         if len(weapon_cat) > 0:
             st.info(f"🔝 **Arme la plus utilisée :** {weapon_cat.index[0]} ({weapon_cat.values[0]:,} cas)")
@@ -1102,29 +1477,28 @@ with tab5:
     st.markdown("### 📊 Utilisation d'Armes par Catégorie de Crime")
     st.markdown("*Pourcentage de crimes avec armes pour chaque catégorie*")
     
-    weapon_crime = pd.crosstab(
-        filtered_df['crime_category'],
-        filtered_df['weapon_involved'],
-        normalize='index'
-    ) * 100
-    weapon_crime.columns = ['Sans Arme', 'Avec Arme']
-    
-    fig = px.bar(
-        weapon_crime,
-        barmode='group',
-        title="<b>Taux d'Implication d'Armes par Catégorie</b>",
-        labels={'value': 'Pourcentage (%)', 'crime_category': 'Catégorie de Crime'},
-        color_discrete_map={'Sans Arme': '#90EE90', 'Avec Arme': '#FF6B6B'}
-    )
-    fig.update_layout(
-        font=dict(size=12),
-        title_font_size=16,
-        xaxis_title="Catégorie de Crime",
-        yaxis_title="Pourcentage (%)",
-        legend_title="Type",
-        height=450
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def category_weapon_figure():
+        weapon_crime = count_cube.counts(filter_criteria, ('crime_category', 'weapon_involved'))
+        weapon_crime = weapon_crime.div(weapon_crime.sum(axis=1), axis=0) * 100
+        weapon_crime.columns = ['Sans Arme', 'Avec Arme']
+        
+        fig = px.bar(
+            weapon_crime,
+            barmode='group',
+            title="<b>Taux d'Implication d'Armes par Catégorie</b>",
+            labels={'value': 'Pourcentage (%)', 'crime_category': 'Catégorie de Crime'},
+            color_discrete_map={'Sans Arme': '#90EE90', 'Avec Arme': '#FF6B6B'}
+        )
+        fig.update_layout(
+            font=dict(size=12),
+            title_font_size=16,
+            xaxis_title="Catégorie de Crime",
+            yaxis_title="Pourcentage (%)",
+            legend_title="Type",
+            height=450
+        )
+        return fig
+    show_figure('tab5.category_weapon', category_weapon_figure)
     
     st.markdown("---")
     
@@ -1135,28 +1509,30 @@ with tab5:
     col_weapon1, col_weapon2 = st.columns([2, 1])
     
     with col_weapon1:
-        top_10_areas = filtered_df['AREA NAME'].value_counts().head(10).index
-        area_weapon = filtered_df[filtered_df['AREA NAME'].isin(top_10_areas)].groupby('AREA NAME')['weapon_involved'].apply(
-            lambda x: (x == 1).sum() / len(x) * 100
-        ).sort_values(ascending=False)
-        
-        fig = px.bar(
-            x=area_weapon.values,
-            y=area_weapon.index,
-            orientation='h',
-            title="<b>Taux d'Implication d'Armes par Zone</b>",
-            labels={'x': 'Taux d\'Armes (%)', 'y': 'Zone'},
-            color=area_weapon.values,
-            color_continuous_scale='Oranges',
-            text=area_weapon.values
+        top_10_areas = area_counts.head(10).index
+        area_weapon = memoize(
+            'tab5.area_weapon', lambda: compute_area_weapon(selection.rows, top_10_areas), tuple(top_10_areas)
         )
-        fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
-        fig.update_layout(
-            yaxis={'categoryorder':'total ascending'},
-            font=dict(size=11),
-            title_font_size=16
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        
+        def area_weapon_figure():
+            fig = px.bar(
+                x=area_weapon.values,
+                y=area_weapon.index,
+                orientation='h',
+                title="<b>Taux d'Implication d'Armes par Zone</b>",
+                labels={'x': 'Taux d\'Armes (%)', 'y': 'Zone'},
+                color=area_weapon.values,
+                color_continuous_scale='Oranges',
+                text=area_weapon.values
+            )
+            fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+            fig.update_layout(
+                yaxis={'categoryorder':'total ascending'},
+                font=dict(size=11),
+                title_font_size=16
+            )
+            return fig
+        show_figure('tab5.area_weapon', area_weapon_figure)
     
     with col_weapon2:
         st.markdown("#### ⚠️ Zones à Risque")
@@ -1202,7 +1578,8 @@ with tab5:
 # =====================================
 # ONGLET 6 : CORRÉLATIONS & TENDANCES
 # =====================================
-with tab6:
+def render_correlations():
+    """Onglet 6 : Corrélations & Tendances"""
     st.markdown("## 📈 Tendances et Corrélations")
     st.markdown("*Analyse approfondie des relations entre variables*")
     st.markdown("<br>", unsafe_allow_html=True)
@@ -1211,28 +1588,30 @@ with tab6:
     st.markdown("### 📅 Évolution Annuelle par Catégorie")
     st.markdown("*Tendances des crimes au fil des années*")
     
-    year_category = pd.crosstab(filtered_df['year'], filtered_df['crime_category'])
-    
-    fig = px.line(
-        year_category,
-        title="<b>Tendances Annuelles des Crimes par Catégorie</b>",
-        labels={'value': 'Nombre de Crimes', 'year': 'Année'},
-        markers=True
-    )
-    fig.update_layout(
-        font=dict(size=12),
-        title_font_size=16,
-        xaxis_title="Année",
-        yaxis_title="Nombre de crimes",
-        legend_title="Catégorie",
-        height=450,
-        hovermode='x unified'
-    )
-    fig.update_traces(line=dict(width=3), marker=dict(size=8))
-    st.plotly_chart(fig, use_container_width=True)
+    def year_category_figure():
+        year_category = count_cube.counts(filter_criteria, ('year', 'crime_category'))
+        
+        fig = px.line(
+            year_category,
+            title="<b>Tendances Annuelles des Crimes par Catégorie</b>",
+            labels={'value': 'Nombre de Crimes', 'year': 'Année'},
+            markers=True
+        )
+        fig.update_layout(
+            font=dict(size=12),
+            title_font_size=16,
+            xaxis_title="Année",
+            yaxis_title="Nombre de crimes",
+            legend_title="Catégorie",
+            height=450,
+            hovermode='x unified'
+        )
+        fig.update_traces(line=dict(width=3), marker=dict(size=8))
+        return fig
+    show_figure('tab6.year_category', year_category_figure)
     
     # Calcul des variations
-    year_totals = filtered_df['year'].value_counts().sort_index()
+    year_totals = count_cube.counts(filter_criteria, 'year')
     if len(year_totals) > 1:
         first_year = year_totals.index[0]
         last_year = year_totals.index[-1]
@@ -1249,9 +1628,7 @@ with tab6:
     st.markdown("### 🔗 Matrice de Corrélation")
     st.markdown("*Relations entre les différentes variables*")
     
-    corr_vars = ['Vict Age', 'weapon_involved', 'is_weekend', 'reporting_delay_days',
-                 'area_risk_score', 'population', 'median_income', 'crimes_per_1000', 'hour']
-    corr_vars = [var for var in corr_vars if var in filtered_df.columns]
+    corr_vars = [var for var in CORR_VARS if var in df.columns]
     
     # Mapping des noms en français
     var_names_fr = {
@@ -1266,29 +1643,35 @@ with tab6:
         'hour': 'Heure'
     }
     
-    correlation = filtered_df[corr_vars].corr()
-    
-    # Renommer les axes
-    correlation_renamed = correlation.rename(columns=var_names_fr, index=var_names_fr)
-    
-    fig = px.imshow(
-        correlation_renamed,
-        labels=dict(color="Corrélation"),
-        x=correlation_renamed.columns,
-        y=correlation_renamed.columns,
-        color_continuous_scale='RdBu_r',
-        aspect="auto",
-        zmin=-1,
-        zmax=1,
-        title="<b>Matrice de Corrélation entre Variables</b>"
-    )
-    fig.update_layout(
-        height=650,
-        font=dict(size=11),
-        title_font_size=16
-    )
-    fig.update_xaxes(tickangle=-45)
-    st.plotly_chart(fig, use_container_width=True)
+    def correlation_figure():
+        def selection_correlation():
+            moments = selection_moments()
+            return moments.corr(corr_vars) if moments is not None else compute_correlation(selection.rows, corr_vars)
+
+        correlation = memoize('tab6.correlation', selection_correlation, tuple(corr_vars))
+        
+        # Renommer les axes
+        correlation_renamed = correlation.rename(columns=var_names_fr, index=var_names_fr)
+        
+        fig = px.imshow(
+            correlation_renamed,
+            labels=dict(color="Corrélation"),
+            x=correlation_renamed.columns,
+            y=correlation_renamed.columns,
+            color_continuous_scale='RdBu_r',
+            aspect="auto",
+            zmin=-1,
+            zmax=1,
+            title="<b>Matrice de Corrélation entre Variables</b>"
+        )
+        fig.update_layout(
+            height=650,
+            font=dict(size=11),
+            title_font_size=16
+        )
+        fig.update_xaxes(tickangle=-45)
+        return fig
+    show_figure('tab6.correlation', correlation_figure, tuple(corr_vars))
     
     st.info("""
     💡 **Comment lire cette matrice :**
@@ -1306,56 +1689,27 @@ with tab6:
     
     col1, col2 = st.columns(2)
     
+    # Agrégat des deux nuages de points : calculé seulement si l'un d'eux est à construire
+    def area_data():
+        return memoize('tab6.area_data', lambda: compute_area_data(selection.rows))
+    
+    # Tendances des deux nuages, ajustées en un seul appel (une série par nuage)
+    def trendlines():
+        data = area_data()
+        return memoize('tab6.trendlines', lambda: fit_ols(
+            [data['population'], data['median_income']],
+            [data['crime_rate'], data['DR_NO']]
+        ))
+    
     with col1:
         st.markdown("#### 👥 Population vs Taux de Criminalité")
-        area_data = filtered_df.groupby('AREA NAME').agg({
-            'DR_NO': 'count',
-            'population': 'first',
-            'median_income': 'first'
-        }).reset_index()
-        area_data['crime_rate'] = area_data['DR_NO'] / area_data['population'] * 1000
-        
-        fig = px.scatter(
-            area_data,
-            x='population',
-            y='crime_rate',
-            hover_data=['AREA NAME'],
-            title="<b>Population vs Taux de Criminalité (pour 1000 hab.)</b>",
-            labels={'population': 'Population', 'crime_rate': 'Taux de Criminalité'},
-            trendline="ols",
-            color='crime_rate',
-            color_continuous_scale='Reds',
-            size='DR_NO'
-        )
-        fig.update_layout(
-            font=dict(size=11),
-            title_font_size=14,
-            showlegend=False
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure('tab6.population_scatter', lambda: build_population_scatter(area_data(), trendlines()[0]))
         
         st.caption("📊 La taille des points représente le nombre total de crimes")
     
     with col2:
         st.markdown("#### 💰 Revenu Médian vs Nombre de Crimes")
-        fig = px.scatter(
-            area_data,
-            x='median_income',
-            y='DR_NO',
-            hover_data=['AREA NAME'],
-            title="<b>Revenu vs Total des Crimes</b>",
-            labels={'median_income': 'Revenu Médian', 'DR_NO': 'Total des Crimes'},
-            trendline="ols",
-            color='DR_NO',
-            color_continuous_scale='Viridis',
-            size='population'
-        )
-        fig.update_layout(
-            font=dict(size=11),
-            title_font_size=14,
-            showlegend=False
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure('tab6.income_scatter', lambda: build_income_scatter(area_data(), trendlines()[1]))
         
         st.caption("📊 La taille des points représente la population de la zone")
     
@@ -1365,34 +1719,50 @@ with tab6:
     st.markdown("### 📅 Patterns Mensuels Multi-Années")
     st.markdown("*Comparaison des cycles mensuels entre différentes années*")
     
-    monthly_year = filtered_df.groupby(['year', 'month']).size().reset_index(name='count')
-    
-    fig = px.line(
-        monthly_year,
-        x='month',
-        y='count',
-        color='year',
-        title="<b>Cycles Mensuels de Criminalité par Année</b>",
-        labels={'month': 'Mois', 'count': 'Nombre de Crimes', 'year': 'Année'},
-        markers=True
-    )
-    fig.update_layout(
-        font=dict(size=12),
-        title_font_size=16,
-        xaxis_title="Mois",
-        yaxis_title="Nombre de crimes",
-        legend_title="Année",
-        height=450,
-        hovermode='x unified'
-    )
-    fig.update_traces(line=dict(width=3), marker=dict(size=8))
-    st.plotly_chart(fig, use_container_width=True)
+    def year_month_figure():
+        monthly_year = count_cube.counts(filter_criteria, ('year', 'month')).stack()
+        monthly_year = monthly_year[monthly_year > 0].reset_index(name='count')
+        
+        fig = px.line(
+            monthly_year,
+            x='month',
+            y='count',
+            color='year',
+            title="<b>Cycles Mensuels de Criminalité par Année</b>",
+            labels={'month': 'Mois', 'count': 'Nombre de Crimes', 'year': 'Année'},
+            markers=True
+        )
+        fig.update_layout(
+            font=dict(size=12),
+            title_font_size=16,
+            xaxis_title="Mois",
+            yaxis_title="Nombre de crimes",
+            legend_title="Année",
+            height=450,
+            hovermode='x unified'
+        )
+        fig.update_traces(line=dict(width=3), marker=dict(size=8))
+        return fig
+    show_figure('tab6.year_month', year_month_figure)
     
     st.success("""
     💡 **Insights :** Ce graphique permet d'identifier si certains mois sont systématiquement 
     plus criminels d'une année à l'autre, révélant des patterns saisonniers récurrents.
     """)
 
+# Rendu du seul onglet actif
+TAB_PANELS = dict(zip(TAB_LABELS, [
+    render_overview,
+    render_geography,
+    render_temporal,
+    render_victims,
+    render_weapons,
+    render_correlations
+]))
+
+with tab_container, profiler.section(f"onglet : {active_tab}", rows=selection.count):
+    TAB_PANELS[active_tab]()
+
 # =====================================
 # FOOTER
 # =====================================
@@ -1420,6 +1790,7 @@ st.markdown("""
 # =====================================
 # TÉLÉCHARGEMENT DES DONNÉES (SIDEBAR)
 # =====================================
+profiler.start('export')
 st.sidebar.markdown("---")
 st.sidebar.markdown("""
     <div style='background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); 
@@ -1433,28 +1804,55 @@ st.sidebar.markdown("""
 
 st.sidebar.markdown("<br>", unsafe_allow_html=True)
 
+# Format du fichier exporté
+export_format = st.sidebar.selectbox(
+    "Format du fichier :",
+    options=list(EXPORT_FORMATS),
+    help="CSV compressé (gzip), Parquet (colonnes typées) ou classeur Excel"
+)
+
+# Le fichier n'est produit qu'au clic, puis mémorisé pour cette sélection
+export_cache = get_export_cache()
+export_positions = None if selection.is_identity else selection.positions
+
+perf_log = get_perf_log()
+export_rows_count = selection.count
+
+def build_export():
+    """Fichier d'export de la sélection courante (appelé au clic uniquement)"""
+    # Hors exécution du script : mesure et journalisation propres au téléchargement
+    export_profiler = RenderProfiler(perf_session, perf_log)
+    with export_profiler.section(f"export : fichier {export_format}", rows=export_rows_count):
+        data = export_cache.get(
+            filter_key, 'export', lambda: export_rows(df, export_format, export_positions), export_format
+        )
+    export_profiler.flush()
+    return data
+
 # Bouton de téléchargement
-csv = filtered_df.to_csv(index=False).encode('utf-8')
 st.sidebar.download_button(
-    label="📥 Télécharger en CSV",
-    data=csv,
-    file_name=f"crimes_LA_filtres_{datetime.now().strftime('%Y%m%d_%H%M')}.csv",
-    mime="text/csv",
+    label=f"📥 Télécharger ({export_format})",
+    data=build_export,
+    file_name=export_file_name(export_format, datetime.now().strftime('%Y%m%d_%H%M')),
+    mime=EXPORT_FORMATS[export_format]['mime'],
+    on_click='ignore',
+    disabled=(export_format == 'Excel' and selection.count >= EXCEL_MAX_ROWS),
     use_container_width=True,
-    help="Télécharge les données actuellement filtrées au format CSV"
+    help="Télécharge les données actuellement filtrées ; le fichier est généré au moment du clic"
 )
 
 # Statistiques du téléchargement
 st.sidebar.markdown(f"""
 <div style='background: #f0f2f6; padding: 10px; border-radius: 8px; margin-top: 10px;'>
     <p style='margin: 0; font-size: 12px; color: #666;'>
-        📊 Fichier contiendra : <b>{len(filtered_df):,} lignes</b>
+        📊 Fichier contiendra : <b>{selection.count:,} lignes</b>
     </p>
     <p style='margin: 5px 0 0 0; font-size: 12px; color: #666;'>
-        📁 Colonnes : <b>{len(filtered_df.columns)}</b>
+        📁 Colonnes : <b>{len(df.columns)}</b>
     </p>
 </div>
 """, unsafe_allow_html=True)
+profiler.stop('export', rows=selection.count)
 
 # Informations supplémentaires
 st.sidebar.markdown("---")
@@ -1469,3 +1867,45 @@ st.sidebar.info("""
 
 📧 Contact : crime-analysis@example.com
 """)
+
+# Diagnostic du cache des agrégations
+with st.sidebar.expander("🧪 Cache des agrégations", expanded=False):
+    cache_stats = aggregate_cache.stats()
+    col1, col2 = st.columns(2)
+    col1.metric("Hits", f"{cache_stats['hits']:,}")
+    col2.metric("Misses", f"{cache_stats['misses']:,}")
+    col1.metric("Taux de hit", f"{cache_stats['hit_rate']:.1f}%")
+    col2.metric("Entrées", f"{cache_stats['entries']:,}")
+    st.caption(
+        f"Mémoire : {cache_stats['size_mb']:.1f} / {cache_stats['budget_mb']:.0f} Mo · "
+        f"{cache_stats['evictions']:,} évictions · partagé entre sessions"
+    )
+    figure_stats = figure_cache.stats()
+    st.caption(
+        f"Figures : {figure_stats['hit_rate']:.1f}% de hits sur {figure_stats['hits'] + figure_stats['misses']:,} · "
+        f"{figure_stats['entries']:,} entrées · "
+        f"{figure_stats['size_mb']:.1f} / {figure_stats['budget_mb']:.0f} Mo"
+    )
+
+# Panneau de performance : mesures de cette exécution, journalisées pour toutes les sessions
+profiler.stop('total', rows=selection.count)
+profiler.flush()
+with st.sidebar.expander("⚙️ Performance", expanded=False):
+    timings = profiler.summary()
+    timings['seconds'] = timings['seconds'] * 1000
+    st.dataframe(
+        timings.rename(columns={'section': 'Section', 'seconds': 'Temps (ms)', 'rows': 'Lignes',
+                                'memory_delta_mb': 'Δ Mémoire (Mo)'}),
+        hide_index=True,
+        use_container_width=True,
+        column_config={'Temps (ms)': st.column_config.NumberColumn(format="%.1f"),
+                       'Δ Mémoire (Mo)': st.column_config.NumberColumn(format="%.2f")}
+    )
+    st.caption(f"Session {perf_session} · exécution du {profiler.run_at} · "
+               f"comptages : {'SQLite' if sql_backend is not None else 'cube pandas'}")
+    if get_perf_log() is not None and st.checkbox("Agréger le journal (toutes sessions)", key='perf_aggregate'):
+        log_summary = summarize_log(os.environ.get('DASHBOARD_PERF_LOG', PERF_LOG_PATH))
+        if log_summary.empty:
+            st.info("Journal vide pour l'instant")
+        else:
+            st.dataframe(log_summary, use_container_width=True)